@@ -0,0 +1,103 @@
+"""Throughput of the asyncio request engine against the threaded path.
+
+Syncs the numbered page streams (engagements, features and segments) from a local
+mock server whose requests each wait ``--latency`` seconds. The threaded path runs
+the streams on ``max_parallel_streams`` threads with blocking requests; the
+asyncio engine runs them one after another but keeps ``max_concurrent_pages``
+requests in flight on one event loop.
+
+Run from the repository root::
+
+    poetry run python benchmarks/bench_async_engine.py --latency 0.05
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+from singer_sdk.metrics import METRICS_LOGGER_NAME
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from tap_gainsightpx.mock_server import MockGainsightPX  # noqa: E402
+from tap_gainsightpx.tap import TapGainsightPX  # noqa: E402
+
+STREAMS = ["engagements", "features", "segments"]
+START_DATE = "2022-10-26T00:00:00Z"
+END_DATE = "2022-10-27T00:00:00Z"
+
+
+def run(api_url: str, page_size: int, **settings: object) -> dict:
+    """Sync the numbered page streams once and return their throughput."""
+    config = {
+        "api_url": api_url,
+        "api_key": "benchmark",
+        "start_date": START_DATE,
+        "end_date": END_DATE,
+        "page_size": page_size,
+        **settings,
+    }
+    catalog = TapGainsightPX(config=config, parse_env_config=False).catalog_dict
+    for entry in catalog["streams"]:
+        for metadata in entry["metadata"]:
+            if not metadata["breadcrumb"]:
+                metadata["metadata"]["selected"] = entry["tap_stream_id"] in STREAMS
+    tap = TapGainsightPX(config=config, catalog=catalog, parse_env_config=False)
+    logging.getLogger(METRICS_LOGGER_NAME).setLevel(logging.WARNING)
+    output = io.StringIO()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        tap.sync_all_streams()
+    elapsed = time.perf_counter() - started
+    records = output.getvalue().count('"RECORD"')
+    return {
+        **settings,
+        "records": records,
+        "seconds": round(elapsed, 3),
+        "records_per_second": round(records / elapsed),
+    }
+
+
+def main() -> None:
+    """Run the benchmark for the threaded path and the asyncio engine."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=5_000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    args = parser.parse_args()
+
+    with MockGainsightPX(START_DATE, END_DATE, args.items, args.latency) as server:
+        for max_parallel_streams in (1, len(STREAMS)):
+            print(
+                json.dumps(
+                    run(
+                        server.url,
+                        args.page_size,
+                        request_engine="requests",
+                        max_parallel_streams=max_parallel_streams,
+                    )
+                )
+            )
+        for max_concurrent_pages in args.concurrency:
+            print(
+                json.dumps(
+                    run(
+                        server.url,
+                        args.page_size,
+                        request_engine="asyncio",
+                        max_concurrent_pages=max_concurrent_pages,
+                    )
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
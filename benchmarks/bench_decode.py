@@ -0,0 +1,118 @@
+"""Count JSON decodes and CPU time per 10k records over recorded fixture pages.
+
+Replays the pages in ``tap_gainsightpx/tests/fixtures`` through the real
+stream, paginator and record extraction code without touching the network.
+
+Run from the repository root::
+
+    poetry run python benchmarks/bench_decode.py
+"""
+from __future__ import annotations
+
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Iterator, List
+
+import requests
+from singer_sdk.metrics import METRICS_LOGGER_NAME
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from tap_gainsightpx.json_backend import JSONBackend  # noqa: E402
+from tap_gainsightpx.tap import TapGainsightPX  # noqa: E402
+
+FIXTURES = ROOT / "tap_gainsightpx" / "tests" / "fixtures"
+CONFIG = {
+    "api_key": "benchmark",
+    "start_date": "2022-10-26T00:00:00Z",
+    "end_date": "2022-10-27T00:00:00Z",
+}
+TARGET_RECORDS = 10_000
+
+
+def load_pages(stream_name: str) -> List[bytes]:
+    """Return the raw fixture pages for a stream, in request order."""
+    paths = sorted(FIXTURES.glob(f"{stream_name}_page_*.json"))
+    return [path.read_bytes() for path in paths]
+
+
+def make_responses(pages: List[bytes]) -> Callable[..., requests.Response]:
+    """Return a fake `_request` replaying the pages as fresh responses."""
+    cycle: Iterator[bytes] = iter(())
+
+    def _request(prepared_request, context):  # type: ignore[no-untyped-def]
+        nonlocal cycle
+        content = next(cycle, None)
+        if content is None:
+            cycle = iter(pages)
+            content = next(cycle)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = content
+        response.headers["Content-Type"] = "application/json"
+        return response
+
+    return _request
+
+
+class DecodeCounter:
+    """Count the page decodes of a tap's JSON backend while active."""
+
+    def __init__(self, tap: TapGainsightPX) -> None:
+        self.calls = 0
+        self._tap = tap
+        self._original = tap.json_backend
+
+    def __enter__(self) -> DecodeCounter:
+        original = self._original
+
+        def counting_loads(content):  # type: ignore[no-untyped-def]
+            self.calls += 1
+            return original.loads(content)
+
+        self._tap.json_backend = JSONBackend(
+            original.name, counting_loads, original.format_message
+        )
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._tap.json_backend = self._original
+
+
+def run(stream_name: str) -> dict:
+    """Extract at least `TARGET_RECORDS` records and report decode and CPU cost."""
+    tap = TapGainsightPX(config=CONFIG, parse_env_config=False)
+    logging.getLogger(METRICS_LOGGER_NAME).setLevel(logging.WARNING)
+    stream = tap.streams[stream_name]
+    pages = load_pages(stream_name)
+    stream._request = make_responses(pages)  # type: ignore[assignment]
+
+    records = requests_made = 0
+    with DecodeCounter(tap) as counter:
+        started = time.process_time()
+        while records < TARGET_RECORDS:
+            records += sum(1 for _ in stream.get_records(None))
+            requests_made += len(pages)
+        elapsed = time.process_time() - started
+
+    return {
+        "stream": stream_name,
+        "records": records,
+        "pages": requests_made,
+        "decodes_per_page": round(counter.calls / requests_made, 2),
+        "cpu_ms_per_10k_records": round(elapsed * 1000 * TARGET_RECORDS / records, 2),
+    }
+
+
+def main() -> None:
+    """Run the benchmark for every stream with recorded fixtures."""
+    for stream_name in ("page_view_events", "custom_events", "features"):
+        print(json.dumps(run(stream_name)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Records per second of each JSON backend over recorded event pages.
+
+Decodes the pages in ``tap_gainsightpx/tests/fixtures`` and encodes each of
+their records as a Singer RECORD message, once per installed backend.
+
+Run from the repository root::
+
+    poetry run python benchmarks/bench_json_backend.py
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+from singer_sdk._singerlib import RecordMessage
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from tap_gainsightpx.json_backend import BACKENDS, JSONBackend  # noqa: E402
+from tap_gainsightpx.pages import get_records_key  # noqa: E402
+from tap_gainsightpx.tap import TapGainsightPX  # noqa: E402
+
+FIXTURES = ROOT / "tap_gainsightpx" / "tests" / "fixtures"
+STREAMS = ("page_view_events", "custom_events")
+
+
+def load_pages(stream_name: str) -> List[bytes]:
+    """Return the raw fixture pages for a stream, in request order."""
+    paths = sorted(FIXTURES.glob(f"{stream_name}_page_*.json"))
+    return [path.read_bytes() for path in paths]
+
+
+def run(backend: JSONBackend, stream_name: str, rounds: int) -> dict:
+    """Decode the pages and encode their records `rounds` times."""
+    tap = TapGainsightPX(config={"api_key": "benchmark"}, parse_env_config=False)
+    stream = tap.streams[stream_name]
+    records_key = get_records_key(stream.records_jsonpath)
+    pages = load_pages(stream_name)
+
+    records = 0
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for content in pages:
+            for record in backend.loads(content)[records_key]:
+                message = RecordMessage(stream=stream_name, record=record)
+                backend.format_message(message)
+                records += 1
+    elapsed = time.perf_counter() - started
+    return {
+        "backend": backend.name,
+        "stream": stream_name,
+        "records": records,
+        "records_per_second": round(records / elapsed),
+    }
+
+
+def main() -> None:
+    """Run the benchmark for every installed backend."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=100)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    for stream_name in STREAMS:
+        for backend in BACKENDS.values():
+            if backend is not None:
+                print(json.dumps(run(backend, stream_name, args.rounds)))
+
+
+if __name__ == "__main__":
+    main()
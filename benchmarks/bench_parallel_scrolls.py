@@ -0,0 +1,82 @@
+"""Throughput of parallel scroll cursors against a local mock server.
+
+Each request to the mock server waits ``--latency`` seconds, so the benchmark
+shows how much network wait concurrent windows hide.
+
+Run from the repository root::
+
+    poetry run python benchmarks/bench_parallel_scrolls.py --latency 0.05
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+from singer_sdk.metrics import METRICS_LOGGER_NAME
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from tap_gainsightpx.mock_server import MockGainsightPX  # noqa: E402
+from tap_gainsightpx.tap import TapGainsightPX  # noqa: E402
+
+START_DATE = "2022-10-26T00:00:00Z"
+END_DATE = "2022-10-27T00:00:00Z"
+
+
+def run(
+    api_url: str, max_parallel_scrolls: int, page_size: int, prefetch_pages: int
+) -> dict:
+    """Sync `page_view_events` once and return its throughput."""
+    config = {
+        "api_url": api_url,
+        "api_key": "benchmark",
+        "start_date": START_DATE,
+        "end_date": END_DATE,
+        "page_size": page_size,
+        "max_parallel_scrolls": max_parallel_scrolls,
+        "prefetch_pages": prefetch_pages,
+    }
+    tap = TapGainsightPX(config=config, parse_env_config=False)
+    logging.getLogger(METRICS_LOGGER_NAME).setLevel(logging.WARNING)
+    output = io.StringIO()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        tap.streams["page_view_events"].sync()
+    elapsed = time.perf_counter() - started
+    records = output.getvalue().count('"RECORD"')
+    return {
+        "max_parallel_scrolls": max_parallel_scrolls,
+        "prefetch_pages": prefetch_pages,
+        "records": records,
+        "seconds": round(elapsed, 3),
+        "records_per_second": round(records / elapsed),
+    }
+
+
+def main() -> None:
+    """Run the benchmark for increasing numbers of parallel scrolls."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=20_000)
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--parallel", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--prefetch-pages", type=int, default=0)
+    args = parser.parse_args()
+
+    with MockGainsightPX(START_DATE, END_DATE, args.events, args.latency) as server:
+        for max_parallel_scrolls in args.parallel:
+            result = run(
+                server.url, max_parallel_scrolls, args.page_size, args.prefetch_pages
+            )
+            print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""CPU time and memory per record with heavy properties selected or deselected.
+
+Replays the recorded ``page_view_events`` pages through a full stream sync, once
+with every property selected and once with the free-form context properties
+deselected in the catalog.
+
+Run from the repository root::
+
+    poetry run python benchmarks/bench_projection.py
+"""
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import logging
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.bench_decode import load_pages, make_responses  # noqa: E402
+
+from tap_gainsightpx.tap import TapGainsightPX  # noqa: E402
+
+CONFIG = {
+    "api_key": "benchmark",
+    "start_date": "2022-10-26T00:00:00Z",
+    "end_date": "2022-10-27T00:00:00Z",
+}
+STREAM = "page_view_events"
+DESELECTED = ["globalContext", "queryParams", "inferredLocation"]
+ROUNDS = 50
+
+
+def make_tap(deselected: List[str]) -> TapGainsightPX:
+    """Return a tap whose catalog deselects `deselected` from the stream."""
+    tap = TapGainsightPX(config=CONFIG, parse_env_config=False)
+    catalog = tap.catalog_dict
+    for entry in catalog["streams"]:
+        for metadata in entry["metadata"]:
+            breadcrumb = metadata["breadcrumb"]
+            if entry["tap_stream_id"] == STREAM and breadcrumb[1:] in (
+                [name] for name in deselected
+            ):
+                metadata["metadata"]["selected"] = False
+    return TapGainsightPX(config=CONFIG, catalog=catalog, parse_env_config=False)
+
+
+def run(deselected: List[str]) -> dict:
+    """Sync the stream `ROUNDS` times and report its cost per 10k records."""
+    tap = make_tap(deselected)
+    stream = tap.streams[STREAM]
+    stream._request = make_responses(load_pages(STREAM))  # type: ignore[assignment]
+
+    output = io.StringIO()
+    tracemalloc.start()
+    started = time.process_time()
+    with contextlib.redirect_stdout(output):
+        for _ in range(ROUNDS):
+            stream.sync()
+    elapsed = time.process_time() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    records = output.getvalue().count('"RECORD"')
+    return {
+        "deselected": deselected,
+        "records": records,
+        "cpu_ms_per_10k_records": round(elapsed * 1000 * 10_000 / records, 2),
+        "peak_mb": round(peak / 1024 / 1024, 1),
+        "output_bytes_per_record": round(len(output.getvalue()) / records),
+    }
+
+
+def main() -> None:
+    """Run the benchmark with and without the heavy properties."""
+    logging.disable(logging.INFO)
+    for deselected in ([], DESELECTED):
+        print(json.dumps(run(deselected)))
+
+
+if __name__ == "__main__":
+    main()
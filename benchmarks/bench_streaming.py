@@ -0,0 +1,75 @@
+"""Peak memory of buffered and streaming page parsing by page size.
+
+Syncs ``page_view_events`` from a local mock server and reports the peak memory
+traced by ``tracemalloc`` during the sync, with and without ``streaming_parse``.
+
+Run from the repository root::
+
+    poetry run python benchmarks/bench_streaming.py
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from tap_gainsightpx.mock_server import MockGainsightPX  # noqa: E402
+from tap_gainsightpx.tap import TapGainsightPX  # noqa: E402
+
+START_DATE = "2022-10-26T00:00:00Z"
+END_DATE = "2022-10-27T00:00:00Z"
+
+
+def run(api_url: str, page_size: int, streaming_parse: bool) -> dict:
+    """Sync `page_view_events` once and return its peak traced memory."""
+    config = {
+        "api_url": api_url,
+        "api_key": "benchmark",
+        "start_date": START_DATE,
+        "end_date": END_DATE,
+        "page_size": page_size,
+        "streaming_parse": streaming_parse,
+    }
+    tap = TapGainsightPX(config=config, parse_env_config=False)
+    output = io.StringIO()
+    tracemalloc.start()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        tap.streams["page_view_events"].sync()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "page_size": page_size,
+        "streaming_parse": streaming_parse,
+        "records": output.getvalue().count('"RECORD"'),
+        "seconds": round(elapsed, 3),
+        "peak_mb": round(peak / 1024 / 1024, 1),
+    }
+
+
+def main() -> None:
+    """Run the benchmark for each page size, buffered and streamed."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=20_000)
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[100, 500])
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    with MockGainsightPX(START_DATE, END_DATE, args.events) as server:
+        for streaming_parse in (False, True):
+            for page_size in args.page_sizes:
+                print(json.dumps(run(server.url, page_size, streaming_parse)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""Benchmark the hot paths of every stream type over recorded fixture pages.
+
+Replays the pages in ``tap_gainsightpx/tests/fixtures`` through the real stream
+code without touching the network, for a scroll event stream, a scroll stream
+filtered by a stored bookmark (``accounts``) and the page number streams. Each
+stream is measured in three phases:
+
+- ``extract``: requesting, decoding, paginating and parsing pages into records;
+- ``conform``: conforming the extracted records to the stream schema;
+- ``sync``: a full sync writing every Singer message, including the above.
+
+Each phase is repeated and the median kept, so results can be compared across
+commits. Save a run with ``--output`` and compare a later one against it with
+``--compare``.
+
+Run from the repository root::
+
+    poetry run python benchmarks/bench_suite.py --output before.json
+    poetry run python benchmarks/bench_suite.py --compare before.json
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.bench_decode import (  # noqa: E402
+    DecodeCounter,
+    load_pages,
+    make_responses,
+)
+
+from tap_gainsightpx.client import GainsightPXStream  # noqa: E402
+from tap_gainsightpx.tap import TapGainsightPX  # noqa: E402
+
+CONFIG = {
+    "api_key": "benchmark",
+    "start_date": "2022-10-26T00:00:00Z",
+    "end_date": "2022-10-27T00:00:00Z",
+}
+#: The streams benchmarked, the kind of endpoint they cover and their state.
+CASES: List[Tuple[str, str, Optional[dict]]] = [
+    ("page_view_events", "scroll", None),
+    ("custom_events", "scroll", None),
+    (
+        "accounts",
+        "scroll, bookmark filter",
+        {
+            "bookmarks": {
+                "accounts": {
+                    "replication_key": "lastModifiedDate",
+                    "replication_key_value": 1666742400000,
+                }
+            }
+        },
+    ),
+    ("features", "page number", None),
+    ("engagements", "page number, date filter", None),
+]
+TARGET_RECORDS = 10_000
+REPEATS = 5
+#: Metrics compared by `--compare`, and whether higher is better.
+COMPARED = {
+    "records_per_sec": True,
+    "cpu_us_per_record": False,
+    "peak_mb": False,
+    "decodes_per_page": False,
+}
+
+
+def make_stream(stream_name: str, state: Optional[dict]) -> GainsightPXStream:
+    """Return a stream of a new tap replaying the stream's fixture pages."""
+    tap = TapGainsightPX(config=CONFIG, state=state, parse_env_config=False)
+    stream = tap.streams[stream_name]
+    stream._request = make_responses(load_pages(stream_name))  # type: ignore
+    return stream  # type: ignore[return-value]
+
+
+def measure(run: Callable[[], int]) -> Dict[str, float]:
+    """Return the median throughput and CPU cost of `run` over `REPEATS` runs.
+
+    `run` returns the number of records it handled.
+    """
+    wall: List[float] = []
+    cpu: List[float] = []
+    records = 0
+    for _ in range(REPEATS):
+        started, cpu_started = time.perf_counter(), time.process_time()
+        records = run()
+        wall.append((time.perf_counter() - started) / records)
+        cpu.append((time.process_time() - cpu_started) / records)
+    return {
+        "records": records,
+        "records_per_sec": round(1 / statistics.median(wall)),
+        "cpu_us_per_record": round(statistics.median(cpu) * 1e6, 2),
+    }
+
+
+def peak_mb(run: Callable[[], Any]) -> float:
+    """Return the peak traced memory of one run, in megabytes."""
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / 1024 / 1024, 2)
+
+
+def extract(stream: GainsightPXStream) -> List[dict]:
+    """Return at least `TARGET_RECORDS` records, replaying the pages as needed."""
+    records: List[dict] = []
+    while len(records) < TARGET_RECORDS:
+        records.extend(stream.get_records(None))
+    return records
+
+
+class RecordCountingOutput(io.StringIO):
+    """Discard written messages, counting the RECORD messages among them."""
+
+    records = 0
+
+    def write(self, text: str) -> int:
+        self.records += text.count('"RECORD"')
+        return len(text)
+
+
+def sync(stream: GainsightPXStream) -> int:
+    """Sync the stream until `TARGET_RECORDS` records are written."""
+    with contextlib.redirect_stdout(RecordCountingOutput()) as output:
+        while output.records < TARGET_RECORDS:
+            stream.sync()
+    return output.records
+
+
+def count_requests(stream: GainsightPXStream) -> int:
+    """Return the number of pages requested to extract `TARGET_RECORDS` records."""
+    replay = stream._request
+    requests = 0
+
+    def _request(prepared_request, context):  # type: ignore[no-untyped-def]
+        nonlocal requests
+        requests += 1
+        return replay(prepared_request, context)
+
+    stream._request = _request  # type: ignore[assignment]
+    try:
+        extract(stream)
+    finally:
+        stream._request = replay  # type: ignore[assignment]
+    return requests
+
+
+def run_case(stream_name: str, kind: str, state: Optional[dict]) -> List[dict]:
+    """Return the results of every phase for one stream."""
+    stream = make_stream(stream_name, state)
+    case = {"stream": stream_name, "kind": kind}
+
+    with DecodeCounter(stream.tap) as counter:
+        records = extract(stream)
+    pages = count_requests(stream)
+    extracted = {
+        **case,
+        "phase": "extract",
+        **measure(lambda: len(extract(stream))),
+        "peak_mb": peak_mb(lambda: extract(stream)),
+        "decodes_per_page": round(counter.calls / pages, 2),
+    }
+
+    conformer = stream.record_conformer
+    conformed = {
+        **case,
+        "phase": "conform",
+        **measure(lambda: sum(1 for r in records if conformer.conform(r))),
+    }
+
+    stream = make_stream(stream_name, state)
+    synced = {
+        **case,
+        "phase": "sync",
+        **measure(lambda: sync(stream)),
+        "peak_mb": peak_mb(lambda: sync(stream)),
+    }
+    return [extracted, conformed, synced]
+
+
+def environment() -> Dict[str, Any]:
+    """Return what the results depend on besides the code: commit and runtime."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    tap = TapGainsightPX(config=CONFIG, parse_env_config=False)
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "json_backend": tap.json_backend.name,
+        "target_records": TARGET_RECORDS,
+        "repeats": REPEATS,
+    }
+
+
+def compare(results: List[dict], baseline: List[dict]) -> None:
+    """Print the change of each compared metric against a baseline run."""
+    before = {(r["stream"], r["phase"]): r for r in baseline}
+    for result in results:
+        old = before.get((result["stream"], result["phase"]))
+        if old is None:
+            continue
+        changes = []
+        for metric, higher_is_better in COMPARED.items():
+            if metric not in result or not old.get(metric):
+                continue
+            change = (result[metric] - old[metric]) / old[metric] * 100
+            better = change > 0 if higher_is_better else change < 0
+            mark = "+" if better else "-" if abs(change) >= 5 else " "
+            changes.append(f"{metric} {change:+.1f}% {mark}")
+        print(f"{result['stream']:<18} {result['phase']:<8} {', '.join(changes)}")
+
+
+def main() -> None:
+    """Run every phase for every stream, then save or compare the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", type=Path, help="Save the results to a file.")
+    parser.add_argument(
+        "--compare", type=Path, help="Compare with results saved by --output."
+    )
+    parser.add_argument(
+        "--stream", action="append", help="Only benchmark these streams."
+    )
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    results = []
+    for stream_name, kind, state in CASES:
+        if args.stream and stream_name not in args.stream:
+            continue
+        for result in run_case(stream_name, kind, state):
+            print(json.dumps(result))
+            results.append(result)
+
+    if args.output:
+        run = {"environment": environment(), "results": results}
+        args.output.write_text(json.dumps(run, indent=2) + "\n")
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        print(f"Compared with {args.compare} ({baseline['environment']}):")
+        compare(results, baseline["results"])
+
+
+if __name__ == "__main__":
+    main()
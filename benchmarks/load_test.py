@@ -0,0 +1,152 @@
+"""Run the tap end to end against the mock GainsightPX API at scale.
+
+Starts ``tap_gainsightpx.mock_server`` in this process and runs the tap as a
+separate process against it, the way an orchestrator would, reading its Singer
+output as it is written. Reports the records each stream emitted, duplicate and
+missing primary keys, throughput, the requests served and rate limited, and the
+peak memory of the tap process.
+
+Run from the repository root::
+
+    poetry run python benchmarks/load_test.py --events 1000000 --latency 0.02 \\
+        --rate-limit-every 100 --config '{"partition_window": "6h"}'
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from tap_gainsightpx.mock_server import MockGainsightPX  # noqa: E402
+from tap_gainsightpx.tap import TapGainsightPX  # noqa: E402
+
+START_DATE = "2022-10-26T00:00:00Z"
+END_DATE = "2022-10-27T00:00:00Z"
+
+
+def write_catalog(config: dict, streams: Optional[List[str]], path: Path) -> None:
+    """Write a catalog selecting `streams`, or every stream if None."""
+    tap = TapGainsightPX(config=config, parse_env_config=False)
+    catalog = tap.catalog_dict
+    for entry in catalog["streams"]:
+        selected = streams is None or entry["tap_stream_id"] in streams
+        for metadata in entry["metadata"]:
+            if not metadata["breadcrumb"]:
+                metadata["metadata"]["selected"] = selected
+    path.write_text(json.dumps(catalog))
+
+
+def run_tap(config_path: Path, catalog_path: Path, server: MockGainsightPX) -> dict:
+    """Run the tap, checking the primary keys of every record it writes."""
+    key_properties: Dict[str, List[str]] = {}
+    seen: Dict[str, Set[tuple]] = {}
+    records: Counter = Counter()
+    duplicates: Counter = Counter()
+    started = time.perf_counter()
+    with subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "tap_gainsightpx.tap",
+            "--config",
+            str(config_path),
+            "--catalog",
+            str(catalog_path),
+        ],
+        cwd=ROOT,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    ) as tap:
+        assert tap.stdout is not None
+        for line in tap.stdout:
+            message = json.loads(line)
+            stream = message.get("stream")
+            if message["type"] == "SCHEMA":
+                key_properties[stream] = message["key_properties"]
+                seen.setdefault(stream, set())
+            elif message["type"] == "RECORD":
+                record = message["record"]
+                key = tuple(record.get(k) for k in key_properties[stream])
+                records[stream] += 1
+                if key in seen[stream]:
+                    duplicates[stream] += 1
+                seen[stream].add(key)
+    elapsed = time.perf_counter() - started
+    peak_kb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+
+    expected = {endpoint.name: endpoint.count for endpoint in server.endpoints.values()}
+    total = sum(records.values())
+    return {
+        "exit_code": tap.returncode,
+        "seconds": round(elapsed, 2),
+        "records": total,
+        "records_per_second": round(total / elapsed),
+        "peak_rss_mb": round(peak_kb / 1024, 1),
+        "requests": server.request_count,
+        "rate_limited": server.rate_limited_count,
+        "streams": {
+            stream: {
+                "records": records[stream],
+                "duplicates": duplicates[stream],
+                "missing": expected[stream] - len(seen[stream]),
+            }
+            for stream in sorted(seen)
+        },
+    }
+
+
+def main() -> None:
+    """Serve the mock API and run the tap against it once."""
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--entities", type=int, default=1_000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rate-limit-every", type=int, default=0)
+    parser.add_argument("--retry-after", type=float, default=0.1)
+    parser.add_argument("--stream", action="append", help="Only sync these streams.")
+    parser.add_argument(
+        "--config", default="{}", help="More tap settings, as a JSON object."
+    )
+    args = parser.parse_args()
+
+    with MockGainsightPX(
+        START_DATE,
+        END_DATE,
+        args.events,
+        args.latency,
+        entity_count=args.entities,
+        seed=args.seed,
+        rate_limit_every=args.rate_limit_every,
+        retry_after=args.retry_after,
+    ) as server, tempfile.TemporaryDirectory() as directory:
+        config = {
+            "api_url": server.url,
+            "api_key": "load-test",
+            "start_date": START_DATE,
+            "end_date": END_DATE,
+            **json.loads(args.config),
+        }
+        config_path = Path(directory) / "config.json"
+        config_path.write_text(json.dumps(config))
+        catalog_path = Path(directory) / "catalog.json"
+        write_catalog(config, args.stream, catalog_path)
+        print(json.dumps(run_tap(config_path, catalog_path, server), indent=2))
+
+
+if __name__ == "__main__":
+    main()
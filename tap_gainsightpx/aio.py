@@ -0,0 +1,94 @@
+"""Optional asyncio request engine, built on aiohttp."""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from datetime import timedelta
+from typing import Any, Coroutine, TypeVar
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+try:
+    import aiohttp
+    import yarl
+except ImportError:  # pragma: no cover
+    aiohttp = None  # type: ignore[assignment]
+
+T = TypeVar("T")
+
+
+class AsyncEngine:
+    """Send requests on one asyncio event loop shared by every stream.
+
+    The loop runs on its own thread, so the blocking stream code hands requests
+    to it with `send` and waits on the returned future only when it needs the
+    response. Responses are converted to `requests.Response` objects, so the rest
+    of the tap handles them like any other.
+    """
+
+    def __init__(self, pool_size: int = 10) -> None:
+        """Start the event loop and open a session of up to `pool_size` connections."""
+        if aiohttp is None:
+            raise ImportError(
+                "The 'asyncio' request engine requires aiohttp. "
+                "Install it with `pip install tap-gainsightpx[asyncio]`."
+            )
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="gainsightpx-asyncio", daemon=True
+        )
+        self._thread.start()
+        self._session = self._submit(self._open_session(pool_size)).result()
+
+    def send(
+        self, request: requests.PreparedRequest, timeout: float
+    ) -> Future[requests.Response]:
+        """Start sending a prepared request, returning a future of its response."""
+        return self._submit(self._send(request, timeout))
+
+    def close(self) -> None:
+        """Close the session and stop the event loop."""
+        self._submit(self._session.close()).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def _submit(self, coroutine: Coroutine[Any, Any, T]) -> Future[T]:
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+
+    @staticmethod
+    async def _open_session(pool_size: int) -> aiohttp.ClientSession:
+        return aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=pool_size))
+
+    async def _send(
+        self, request: requests.PreparedRequest, timeout: float
+    ) -> requests.Response:
+        started = time.perf_counter()
+        try:
+            async with self._session.request(
+                str(request.method),
+                yarl.URL(str(request.url), encoded=True),
+                headers=dict(request.headers),
+                data=request.body,
+                timeout=aiohttp.ClientTimeout(total=timeout),
+            ) as resp:
+                content = await resp.read()
+        except asyncio.TimeoutError as e:
+            raise requests.exceptions.ReadTimeout(str(e), request=request) from e
+        except aiohttp.ClientError as e:
+            raise requests.exceptions.ConnectionError(str(e), request=request) from e
+
+        response = requests.Response()
+        response.status_code = resp.status
+        response.reason = str(resp.reason)
+        response.headers = CaseInsensitiveDict(resp.headers)
+        response.encoding = resp.charset
+        response.url = str(resp.url)
+        response.request = request
+        response.elapsed = timedelta(seconds=time.perf_counter() - started)
+        response._content = content
+        response._content_consumed = True  # type: ignore[attr-defined]
+        return response
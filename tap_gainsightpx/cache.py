@@ -0,0 +1,137 @@
+"""On-disk cache of the responses of the page number endpoints."""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from typing import Dict, Optional
+
+from requests import PreparedRequest, Response
+from requests.structures import CaseInsensitiveDict
+
+#: The response headers kept with a cached body.
+CACHED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+class CacheEntry:
+    """A cached response body, with its headers and when it was stored."""
+
+    def __init__(self, body: bytes, headers: Dict[str, str], stored_at: float) -> None:
+        """Create an entry for a response body."""
+        self.body = body
+        self.headers = headers
+        self.stored_at = stored_at
+
+    def validators(self) -> Dict[str, str]:
+        """Return the headers asking the API to answer 304 if nothing changed."""
+        validators = {}
+        if self.headers.get("ETag"):
+            validators["If-None-Match"] = self.headers["ETag"]
+        if self.headers.get("Last-Modified"):
+            validators["If-Modified-Since"] = self.headers["Last-Modified"]
+        return validators
+
+    def to_response(self, request: PreparedRequest) -> Response:
+        """Return the cached body as the response to `request`."""
+        response = Response()
+        response.status_code = 200
+        response._content = self.body
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.url = str(request.url)
+        response.request = request
+        response.encoding = "utf-8"
+        response.elapsed = timedelta(0)
+        return response
+
+
+class ResponseCache:
+    """Cache response bodies on disk for `ttl`, in at most `max_bytes`.
+
+    Each response is a file in `directory`: a line of JSON with its headers and
+    the time it was stored, followed by the body. Files are replaced atomically,
+    and the least recently used are removed once the cache grows past
+    `max_bytes`.
+    """
+
+    def __init__(self, directory: str, ttl: timedelta, max_bytes: int) -> None:
+        """Cache responses in `directory`, creating it if needed."""
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def key(self, url: str, credential: str) -> str:
+        """Return the cache key of a request, distinct for every API key."""
+        return hashlib.sha256(f"{credential}\n{url}".encode()).hexdigest()
+
+    def path(self, key: str) -> str:
+        """Return the file of a cache key."""
+        return os.path.join(self.directory, f"{key}.cache")
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Return the cached entry of a key, if any, and mark it as used."""
+        path = self.path(key)
+        try:
+            with open(path, "rb") as f:
+                meta = json.loads(f.readline())
+                body = f.read()
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return CacheEntry(body, meta["headers"], meta["stored_at"])
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """Return True if the entry was stored less than `ttl` ago."""
+        return time.time() - entry.stored_at < self.ttl.total_seconds()
+
+    def put(self, key: str, response: Response) -> None:
+        """Cache a successful response."""
+        if response.status_code != 200:
+            return
+        headers = {
+            name: response.headers[name]
+            for name in CACHED_HEADERS
+            if name in response.headers
+        }
+        self._write(key, CacheEntry(response.content, headers, time.time()))
+
+    def refresh(self, key: str, entry: CacheEntry) -> None:
+        """Restart the `ttl` of an entry the API confirmed is unchanged."""
+        entry.stored_at = time.time()
+        self._write(key, entry)
+
+    def _write(self, key: str, entry: CacheEntry) -> None:
+        meta = {"headers": entry.headers, "stored_at": entry.stored_at}
+        with tempfile.NamedTemporaryFile(
+            "wb", dir=self.directory, suffix=".tmp", delete=False
+        ) as f:
+            f.write(json.dumps(meta).encode() + b"\n")
+            f.write(entry.body)
+        os.replace(f.name, self.path(key))
+        self._evict()
+
+    def _evict(self) -> None:
+        """Remove the least recently used files until the cache fits."""
+        with self._lock:
+            files = []
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(".cache"):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+            total = sum(size for _, size, _ in files)
+            for _, size, path in sorted(files):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                total -= size
@@ -1,15 +1,87 @@
 """REST client handling, including GainsightPXStream base class."""
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+import functools
+import math
+import os
+import time
+from collections import deque
+from concurrent.futures import Future
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    cast,
+)
 
+import requests
+from backoff._typing import Details
+from requests import PreparedRequest, Response
+from singer_sdk import _singerlib as singer
+from singer_sdk import metrics
 from singer_sdk.authenticators import APIKeyAuthenticator
+from singer_sdk.exceptions import RetriableAPIError
+from singer_sdk.helpers._catalog import pop_deselected_record_properties
+from singer_sdk.helpers._state import STARTING_MARKER
+from singer_sdk.helpers._util import utc_now
 from singer_sdk.pagination import BaseAPIPaginator
 from singer_sdk.streams import RESTStream
 
+from tap_gainsightpx.aio import AsyncEngine
+from tap_gainsightpx.cache import ResponseCache
+from tap_gainsightpx.conformers import RecordConformer
+from tap_gainsightpx.dedup import RecordDeduplicator
+from tap_gainsightpx.json_backend import JSONBackend
+from tap_gainsightpx.page_size import PageSizeController
+from tap_gainsightpx.pages import GainsightPage, get_records_key
 from tap_gainsightpx.paginators import (
     GainsightBasePageNumberPaginator,
     GainsightJSONPathPaginator,
+    ScrollBoundary,
+    ScrollExpiredError,
+)
+from tap_gainsightpx.parallel import WindowPrefetcher, context_key
+from tap_gainsightpx.snapshots import SnapshotStore
+from tap_gainsightpx.stats import EndpointStats
+from tap_gainsightpx.streaming import StreamingGainsightPage
+from tap_gainsightpx.windows import (
+    WindowPlanner,
+    format_datetime,
+    parse_datetime,
+    parse_duration,
+    split_date_range,
+)
+from tap_gainsightpx.writer import MessageWriter
+
+if TYPE_CHECKING:
+    from tap_gainsightpx.tap import TapGainsightPX
+
+#: The property marking the rows of full table streams that were deleted.
+DELETED_AT = "_sdc_deleted_at"
+
+#: Statuses of a request whose scroll cursor expired or is no longer valid.
+SCROLL_EXPIRED_STATUSES = (
+    HTTPStatus.BAD_REQUEST,
+    HTTPStatus.NOT_FOUND,
+    HTTPStatus.GONE,
+)
+
+#: Errors the SDK retries requests on.
+RETRIABLE_ERRORS = (
+    RetriableAPIError,
+    requests.exceptions.ReadTimeout,
+    requests.exceptions.ConnectionError,
 )
 
 
@@ -18,20 +90,127 @@ class GainsightPXStream(RESTStream):
 
     current_record_count = 0
 
+    #: Pages served from the response cache, and those the API confirmed.
+    cache_hits = 0
+    cache_revalidations = 0
+
+    #: Whether the endpoint is filtered on the configured `date` range.
+    filter_by_date = True
+
+    #: Whether the endpoint is filtered on records modified since the bookmark.
+    filter_by_bookmark = False
+
+    #: The largest and smallest `pageSize` the endpoint accepts. The API documents
+    #: 500 as the largest page of the scroll endpoints.
+    max_page_size = 500
+    min_page_size = 10
+
+    #: How many times a scroll is reopened after its cursor expired.
+    max_scroll_reopens = 5
+
+    _authenticator: Optional[APIKeyAuthenticator] = None
+    _record_conformer: Optional[RecordConformer] = None
+    _syncing_context: Optional[tuple] = None
+    _partitions: Optional[List[dict]] = None
+    _lookback_start: Optional[datetime] = None
+    _dedup_keys_loaded = False
+    _window_prefetcher: Optional[WindowPrefetcher[GainsightPage]] = None
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the stream, its page size controller and checkpoint timer."""
+        super().__init__(*args, **kwargs)
+        self.page_size_controller = self.get_page_size_controller()
+        interval = self.config.get("checkpoint_interval")
+        #: Seconds between STATE checkpoints while records are emitted, if any.
+        self.checkpoint_seconds = (
+            parse_duration(interval).total_seconds() if interval else None
+        )
+        self._next_checkpoint = time.monotonic() + (self.checkpoint_seconds or 0)
+        #: The sort value each reopened scroll starts from, by partition context.
+        self._reopened_scrolls: Dict[tuple, int] = {}
+        #: Drops event records emitted before, when `deduplicate_events` is set.
+        self.deduplicator = self.get_deduplicator()
+        #: Drops rows unchanged since the last sync, opened by the first sync.
+        self.snapshot_store: Optional[SnapshotStore] = None
+        if self.keeps_snapshot and self.config.get("emit_tombstones"):
+            self.schema = {  # type: ignore[misc]
+                **self.schema,
+                "properties": {
+                    **self.schema["properties"],
+                    DELETED_AT: {"type": ["string", "null"], "format": "date-time"},
+                },
+            }
+
+    @property
+    def tap(self) -> TapGainsightPX:
+        """Return the tap this stream belongs to."""
+        return cast("TapGainsightPX", self._tap)
+
+    @property
+    def message_writer(self) -> MessageWriter:
+        """Return the writer shared by all streams of the tap."""
+        return self.tap.message_writer
+
+    @property
+    def stats(self) -> EndpointStats:
+        """Return the performance statistics of the stream's endpoint."""
+        return self.tap.sync_stats.endpoint(self.name, self.path)
+
+    @property
+    def response_cache(self) -> Optional[ResponseCache]:
+        """Return the response cache of the tap for page number endpoints."""
+        if self.next_page_token_jsonpath:
+            return None
+        return self.tap.response_cache
+
+    @property
+    def json_backend(self) -> JSONBackend:
+        """Return the JSON backend pages are decoded with."""
+        return self.tap.json_backend
+
+    def get_page(self, response: Response) -> GainsightPage:
+        """Return the decoded page of a response, shared with the paginator."""
+        return GainsightPage.from_response(response, self.get_page_loads())
+
+    def get_page_loads(self) -> Callable[[bytes], Any]:
+        """Return the function decoding a page body, dropping deselected properties."""
+        loads = self.json_backend.loads
+        conformer = self.record_conformer
+        records_key = get_records_key(self.records_jsonpath)
+        if not conformer.deselected or records_key is None:
+            return loads
+
+        def loads_projected(content: bytes) -> Any:
+            body = loads(content)
+            records = body.get(records_key) if isinstance(body, dict) else None
+            for record in records if isinstance(records, list) else ():
+                if isinstance(record, dict):
+                    conformer.project(record)
+            return body
+
+        return loads_projected
+
     @property
     def url_base(self) -> str:
         """Return the API URL root, configurable via tap settings."""
         return self.config["api_url"]
 
+    @property
+    def requests_session(self) -> requests.Session:
+        """Return the pooled session shared by all streams of the tap."""
+        return self.tap.http_transport.session
+
     @property
     def authenticator(self) -> APIKeyAuthenticator:
-        """Return a new authenticator object."""
-        return APIKeyAuthenticator.create_for_stream(
-            self,
-            key="X-APTRINSIC-API-KEY",
-            value=self.config["api_key"],
-            location="header",
-        )
+        """Return the authenticator object, created on first use."""
+        if self._authenticator is None:
+            self._authenticator = APIKeyAuthenticator.create_for_stream(
+                self,
+                key="X-APTRINSIC-API-KEY",
+                value=self.config["api_key"],
+                location="header",
+            )
+        return self._authenticator
 
     def get_url_params(
         self, context: Optional[dict], next_page_token: Optional[Any]
@@ -39,28 +218,804 @@ class GainsightPXStream(RESTStream):
         """Return a dictionary of values to be used in URL parameterization."""
         params: dict = {}
 
-        page_size = self.config.get("page_size")
-        if page_size:
-            params["pageSize"] = page_size
+        if self.page_size:
+            params["pageSize"] = self.page_size
         if self.replication_key:
             params["sort"] = self.replication_key
 
-        return self.add_more_url_params(params, next_page_token)
+        return self.add_more_url_params(context, params, next_page_token)
+
+    def get_deduplicator(self) -> Optional[RecordDeduplicator]:
+        """Return a de-duplicator of event records, if `deduplicate_events` is set."""
+        if not (
+            self.config.get("deduplicate_events")
+            and self.filter_by_date
+            and self.replication_key
+            and self.primary_keys
+        ):
+            return None
+        return RecordDeduplicator(
+            list(self.primary_keys),
+            self.replication_key,
+            window=parse_duration(self.config.get("dedup_window") or "1h"),
+            max_keys=int(self.config.get("dedup_max_keys") or 1_000_000),
+        )
+
+    @property
+    def dedup_keys_path(self) -> Optional[str]:
+        """Return the file keeping the event keys of the lookback window, if any."""
+        snapshot_dir = self.config.get("snapshot_dir")
+        if not (snapshot_dir and self.lookback_window):
+            return None
+        return os.path.join(snapshot_dir, f"{self.name}.dedup")
+
+    @property
+    def is_full_table(self) -> bool:
+        """Return True if every sync requests every record of the stream."""
+        # Rows outside of the date range would look deleted.
+        if self.filter_by_date:
+            return False
+        return self.replication_key is None or bool(
+            self.filter_by_bookmark and self.config.get("full_snapshot")
+        )
+
+    @property
+    def keeps_snapshot(self) -> bool:
+        """Return whether `snapshot_dir` is set for a full table stream with keys."""
+        return bool(
+            self.config.get("snapshot_dir") and self.is_full_table and self.primary_keys
+        )
+
+    def get_snapshot_store(self) -> SnapshotStore:
+        """Return the store of the rows last emitted, opening it on first use."""
+        if self.snapshot_store is None:
+            self.snapshot_store = SnapshotStore(
+                os.path.join(self.config["snapshot_dir"], f"{self.name}.sqlite3"),
+                list(self.primary_keys or []),
+            )
+        return self.snapshot_store
+
+    def get_page_size_controller(self) -> Optional[PageSizeController]:
+        """Return a page size controller if adaptive page sizing applies."""
+        # Resizing numbered pages would shift their offsets.
+        if not self.config.get("adaptive_page_size") or not (
+            self.next_page_token_jsonpath
+        ):
+            return None
+        return PageSizeController(
+            self.config.get("page_size") or self.max_page_size,
+            self.min_page_size,
+            self.max_page_size,
+            target_seconds=self.config.get("target_page_millis", 2000) / 1000,
+        )
+
+    @property
+    def is_streaming(self) -> bool:
+        """Return True if records are decoded while the response body is read."""
+        return bool(
+            self.config.get("streaming_parse")
+            and get_records_key(self.records_jsonpath)
+            and self.config.get("request_engine", "requests") == "requests"
+            and self.response_cache is None
+        )
+
+    @property
+    def prefetch_pages(self) -> int:
+        """Return how many pages may be fetched ahead of the one being emitted."""
+        return max(int(self.config.get("prefetch_pages") or 0), 0)
+
+    @property
+    def prefetch_max_bytes(self) -> Optional[int]:
+        """Return the most bytes of pages fetched ahead, per scroll cursor."""
+        prefetch_memory_mb = self.config.get("prefetch_memory_mb")
+        return prefetch_memory_mb * 1024 * 1024 if prefetch_memory_mb else None
+
+    @property
+    def max_concurrent_pages(self) -> int:
+        """Return how many numbered pages the asyncio engine requests at once."""
+        return max(int(self.config.get("max_concurrent_pages") or 1), 1)
+
+    @property
+    def page_size(self) -> Optional[int]:
+        """Return the page size to request next, within the endpoint limits."""
+        if self.page_size_controller:
+            return self.page_size_controller.size
+        page_size = self.config.get("page_size")
+        return min(page_size, self.max_page_size) if page_size else None
 
     def add_more_url_params(
-        self, params: dict, next_page_token: Optional[Any]
+        self, context: Optional[dict], params: dict, next_page_token: Optional[Any]
     ) -> Dict[str, Any]:
         """Add more params specific to the stream."""
-        params["filter"] = ";".join(
-            [
-                f"date>={self.config['start_date']}",
-                f"date<={self.config['end_date']}",
-            ]
-        )
+        params["filter"] = self.get_date_filter(context)
         if next_page_token:
             params["scrollId"] = next_page_token
         return params
 
+    def get_date_filter(self, context: Optional[dict]) -> str:
+        """Return the `date` filter for the configured range or partition window."""
+        return self.format_date_filter(*self.get_date_bounds(context))
+
+    def format_date_filter(self, start: str, end: str) -> str:
+        """Return the `date` filter from `start`, up to `end` unless it is the end."""
+        is_last_window = parse_datetime(end) >= parse_datetime(self.config["end_date"])
+        return ";".join(
+            [f"date>={start}", f"date{'<=' if is_last_window else '<'}{end}"]
+        )
+
+    def get_date_bounds(self, context: Optional[dict]) -> Tuple[str, str]:
+        """Return the date filter bounds, from the bookmark less the lookback window."""
+        if context:
+            start, end = context["window_start"], context["window_end"]
+        else:
+            start, end = self.config["start_date"], self.config["end_date"]
+
+        bookmark = self.get_bookmark_datetime(context)
+        if bookmark and bookmark > parse_datetime(start):
+            start = format_datetime(bookmark)
+        return start, end
+
+    def get_bookmark_filter(self, context: Optional[dict]) -> Optional[str]:
+        """Return a filter for records modified since the stored bookmark."""
+        is_reopened = context_key(context) in self._reopened_scrolls
+        if self.config.get("full_snapshot") and not is_reopened:
+            return None
+        bookmark = self.get_bookmark_datetime(context)
+        if bookmark is None:
+            return None
+        return f"{self.replication_key}>={format_datetime(bookmark)}"
+
+    @property
+    def lookback_window(self) -> timedelta:
+        """Return how far before the bookmark to start, for late events."""
+        lookback_window = self.config.get("lookback_window")
+        return parse_duration(lookback_window) if lookback_window else timedelta(0)
+
+    def get_bookmark_datetime(self, context: Optional[dict]) -> Optional[datetime]:
+        """Return the stored bookmark less the lookback window, if there is one."""
+        key = context_key(context)
+        state = self.get_bookmark_state(context)
+        # The bookmark advances with every record, so every page of a scroll is
+        # filtered from the value the sync started from.
+        if key == self._syncing_context and STARTING_MARKER in state:
+            value = state[STARTING_MARKER]
+        elif state.get("replication_key") == self.replication_key:
+            value = state.get("replication_key_value")
+        else:
+            value = None
+        bookmark = None
+        if isinstance(value, int):
+            bookmark = datetime.fromtimestamp(value / 1000, tz=timezone.utc)
+            bookmark -= self.lookback_window
+
+        reopened = self._reopened_scrolls.get(key)
+        if reopened is not None:
+            resume = datetime.fromtimestamp(reopened // 1000, tz=timezone.utc)
+            if bookmark is None or resume > bookmark:
+                return resume
+        return bookmark
+
+    def get_bookmark_state(self, context: Optional[dict]) -> dict:
+        """Return the bookmark of the stream or partition window, if any."""
+        # Unlike get_context_state, no partition entry is created, so prefetch
+        # threads can call this while the main thread writes STATE messages.
+        if not context:
+            return self.stream_state
+        for partition in self.stream_state.get("partitions", []):
+            if partition["context"] == context:
+                return partition
+        return {}
+
+    @property
+    def max_parallel_scrolls(self) -> int:
+        """Return how many partition windows may be fetched at the same time."""
+        return max(int(self.config.get("max_parallel_scrolls") or 1), 1)
+
+    @property
+    def partition_window(self) -> Optional[timedelta]:
+        """Return the size of the date windows the range is split into, if any."""
+        if not (self.filter_by_date and self.replication_key):
+            return None
+        if self.config.get("partition_window"):
+            return parse_duration(self.config["partition_window"])
+        date_range = parse_datetime(self.config["end_date"]) - parse_datetime(
+            self.config["start_date"]
+        )
+        if self.max_parallel_scrolls > 1:
+            seconds = date_range.total_seconds() / self.max_parallel_scrolls
+            return timedelta(seconds=max(math.ceil(seconds), 1))
+        if self.partition_target_records:
+            return max(date_range, timedelta(seconds=1))
+        return None
+
+    @property
+    def partition_target_records(self) -> Optional[int]:
+        """Return how many records each planned date window should hold, if any."""
+        target = self.config.get("partition_target_records")
+        # Only scroll endpoints report the totalHits windows are planned from.
+        if not (target and self.next_page_token_jsonpath):
+            return None
+        return int(target)
+
+    @property
+    def is_date_partitioned(self) -> bool:
+        """Return True if the stream is split into date windows."""
+        return self.partition_window is not None
+
+    @property
+    def partitions(self) -> Optional[List[dict]]:
+        """Return one context per date window of the configured range."""
+        window = self.partition_window
+        if window is None:
+            return None
+
+        if self._partitions is None:
+            start = parse_datetime(self.config["start_date"])
+            end = parse_datetime(self.config["end_date"])
+            if self.partition_target_records:
+                windows = self.plan_partition_windows(start, end, window)
+            else:
+                windows = split_date_range(start, end, window)
+            self._partitions = [
+                {
+                    "window_start": format_datetime(window_start),
+                    "window_end": format_datetime(window_end),
+                }
+                for window_start, window_end in windows
+            ]
+            self._lookback_start = self.get_lookback_start(self._partitions)
+        contexts = self._partitions
+        stream_state = self.stream_state
+        # Drop windows no longer in the range, so the state does not grow forever.
+        if "partitions" in stream_state:
+            stream_state["partitions"] = [
+                partition
+                for partition in stream_state["partitions"]
+                if partition["context"] in contexts
+            ]
+        return contexts or None
+
+    def get_lookback_start(self, contexts: List[dict]) -> Optional[datetime]:
+        """Return the newest window bookmark less `lookback_window`, if any."""
+        if not self.lookback_window:
+            return None
+        values = [
+            partition.get("replication_key_value")
+            for partition in self.stream_state.get("partitions", [])
+            if partition["context"] in contexts
+            and partition.get("replication_key") == self.replication_key
+        ]
+        bookmarks = [value for value in values if isinstance(value, int)]
+        if not bookmarks:
+            return None
+        newest = datetime.fromtimestamp(max(bookmarks) / 1000, tz=timezone.utc)
+        return newest - self.lookback_window
+
+    def plan_partition_windows(
+        self, start: datetime, end: datetime, window: timedelta
+    ) -> List[Tuple[datetime, datetime]]:
+        """Plan windows of about `partition_target_records` records over a range."""
+        # Windows of a previous run are kept, so their bookmarks carry over.
+        kept = sorted(
+            (parse_datetime(c["window_start"]), parse_datetime(c["window_end"]))
+            for c in (p["context"] for p in self.stream_state.get("partitions", []))
+            if start <= parse_datetime(c["window_start"])
+            and parse_datetime(c["window_end"]) <= end
+        )
+        candidates: List[Tuple[datetime, datetime]] = []
+        cursor = start
+        for kept_start, kept_end in kept + [(end, end)]:
+            if kept_start > cursor:
+                candidates.extend(split_date_range(cursor, kept_start, window))
+            cursor = max(cursor, kept_end)
+
+        planner = WindowPlanner(
+            self.count_window_records,
+            cast(int, self.partition_target_records),
+            parse_duration(self.config.get("partition_min_window") or "1m"),
+        )
+        planned = planner.plan(candidates, self.max_parallel_scrolls)
+        if planned:
+            self.logger.info(
+                f"Planned {len(planned)} date windows of '{self.name}' from "
+                f"{planner.probes} record counts, the largest holding "
+                f"{max(count for _, _, count in planned)} records."
+            )
+        return sorted(kept + [(s, e) for s, e, _ in planned])
+
+    def count_window_records(self, start: datetime, end: datetime) -> int:
+        """Return the number of records in a date window."""
+        window_start, window_end = format_datetime(start), format_datetime(end)
+        context = {"window_start": window_start, "window_end": window_end}
+        response = self.request_count_page(
+            context,
+            {
+                "sort": self.replication_key,
+                "filter": self.format_date_filter(window_start, window_end),
+            },
+        )
+        return int(self.get_page(response).get("totalHits") or 0)
+
+    def request_count_page(self, context: Optional[dict], params: dict) -> Response:
+        """Request the smallest page the endpoint accepts, to count its records."""
+        prepared_request = self.build_prepared_request(
+            method=self.rest_method,
+            url=self.get_url(context),
+            params={**params, "pageSize": self.min_page_size},
+            headers=self.http_headers,
+        )
+
+        def request_count() -> Response:
+            self.tap.rate_limiter.acquire()
+            return RESTStream._request(self, prepared_request, context)
+
+        return self.request_decorator(request_count)()
+
+    @property
+    def is_sorted(self) -> bool:
+        """Return True for incremental streams, as they are sorted on their key."""
+        return self.replication_key is not None
+
+    def _increment_stream_state(
+        self, latest_record: Dict[str, Any], *, context: Optional[dict] = None
+    ) -> None:
+        """Advance the bookmark past an emitted record, checkpointing it when due."""
+        state = self.get_context_state(context)
+        if not self.replication_key:
+            super()._increment_stream_state(latest_record, context=context)
+        else:
+            # Records of the lookback window come before the bookmark, which only
+            # moves forward.
+            value = latest_record.get(self.replication_key)
+            bookmark = state.get("replication_key_value")
+            if (
+                bookmark is None
+                or value is None
+                or state.get("replication_key") != self.replication_key
+                or value >= bookmark
+            ):
+                super()._increment_stream_state(latest_record, context=context)
+            state["record_count"] = state.get("record_count", 0) + 1
+        if self.checkpoint_seconds and time.monotonic() >= self._next_checkpoint:
+            self._write_state_message()
+
+    def is_window_complete(self, context: dict) -> bool:
+        """Return True if a previous run finished syncing the partition window."""
+        if not self.get_bookmark_state(context).get("window_complete"):
+            return False
+        # Finished windows ending within the lookback window are synced again.
+        lookback_start = self._lookback_start
+        return lookback_start is None or (
+            parse_datetime(context["window_end"]) <= lookback_start
+        )
+
+    def get_records(self, context: Optional[dict]) -> Iterable[Dict[str, Any]]:
+        """Return records, skipping partition windows finished by a previous run."""
+        self._syncing_context = context_key(context)
+        if context and self.is_window_complete(context):
+            self.logger.info(f"Skipping completed window {context} of '{self.name}'.")
+            return
+
+        record_count = self.get_bookmark_state(context).get("record_count")
+        if record_count:
+            self.logger.info(
+                f"Resuming '{self.name}' {context or ''} after {record_count} "
+                "records emitted by an interrupted sync."
+            )
+
+        start, end = self.get_date_bounds(context)
+        if self.filter_by_date and parse_datetime(start) > parse_datetime(end):
+            self.logger.info(f"'{self.name}' is already synced up to {end}.")
+        elif self.deduplicator is not None:
+            yield from self.get_unique_records(context, self.deduplicator)
+        elif self.keeps_snapshot:
+            yield from self.get_changed_records(context, self.get_snapshot_store())
+        else:
+            yield from super().get_records(context)
+        self.get_context_state(context).pop("record_count", None)
+
+        if context and self.is_date_partitioned:
+            self.get_context_state(context)["window_complete"] = True
+            self._write_state_message()
+
+    def get_unique_records(
+        self, context: Optional[dict], deduplicator: RecordDeduplicator
+    ) -> Iterator[Dict[str, Any]]:
+        """Return the records not emitted before, by this sync or the last one."""
+        path = self.dedup_keys_path
+        if path and not self._dedup_keys_loaded:
+            deduplicator.load(path)
+            self._dedup_keys_loaded = True
+        yield from deduplicator.filter(super().get_records(context))
+        if path:
+            deduplicator.save(path, self.lookback_window)
+
+    def get_changed_records(
+        self, context: Optional[dict], store: SnapshotStore
+    ) -> Iterator[Dict[str, Any]]:
+        """Return the rows changed since the last sync, then those deleted."""
+        with store.transaction():
+            yield from store.changed(super().get_records(context))
+            deleted_at = utc_now().isoformat()
+            for key in store.deleted():
+                if self.config.get("emit_tombstones"):
+                    yield {**key, DELETED_AT: deleted_at}
+
+    def log_sync_costs(self) -> None:
+        """Log the sync costs and the number of duplicate or unchanged records."""
+        super().log_sync_costs()
+        if self.deduplicator is not None:
+            self.logger.info(
+                f"Suppressed {self.deduplicator.suppressed} duplicate records of "
+                f"'{self.name}'."
+            )
+        if self.snapshot_store is not None:
+            self.logger.info(
+                f"Suppressed {self.snapshot_store.unchanged} unchanged records of "
+                f"'{self.name}', {self.snapshot_store.deleted_count} were deleted."
+            )
+        if self.response_cache is not None:
+            self.logger.info(
+                f"Served {self.cache_hits} pages of '{self.name}' from the response "
+                f"cache, and {self.cache_revalidations} more the API confirmed."
+            )
+
+    def request_records(self, context: Optional[dict]) -> Iterable[dict]:
+        """Request records from the endpoint, one decoded page at a time."""
+        stats = self.stats
+        try:
+            pages = iter(self.get_pages(context))
+            while True:
+                started = time.perf_counter()
+                page = next(pages, None)
+                fetched = time.perf_counter()
+                stats.add_fetch_time(fetched - started)
+                if page is None:
+                    break
+                records = self.parse_response(page.response)
+                if page.record_filter is not None:
+                    records = page.record_filter(records)
+                record_count = 0
+                for record in records:
+                    record_count += 1
+                    yield record
+                stats.add_page(record_count, time.perf_counter() - fetched)
+                self.tap.sync_stats.maybe_write()
+        except BaseException:
+            self._close_window_prefetcher()
+            raise
+
+    def get_pages(self, context: Optional[dict]) -> Iterator[GainsightPage]:
+        """Return the pages of a context, fetched in the background when enabled."""
+        if (
+            self.tap.async_engine
+            and not self.next_page_token_jsonpath
+            and self.response_cache is None
+        ):
+            return self.request_numbered_pages(context)
+        if self.is_streaming:
+            # The next request depends on the end of the body being streamed.
+            return self.request_pages(context)
+        if context and self.max_parallel_scrolls > 1:
+            contexts: List[Optional[dict]] = [
+                partition
+                for partition in self.partitions or []
+                if not self.is_window_complete(partition)
+            ]
+            max_workers = self.max_parallel_scrolls
+        elif self.prefetch_pages:
+            contexts, max_workers = [context], 1
+        else:
+            return self.request_pages(context)
+
+        prefetcher = self._window_prefetcher
+        if prefetcher is None or context not in prefetcher:
+            self._close_window_prefetcher()
+            prefetcher = self._window_prefetcher = WindowPrefetcher(
+                self.request_pages,
+                contexts,
+                max_workers,
+                max_queued_pages=self.prefetch_pages or 2,
+                max_queued_bytes=self.prefetch_max_bytes,
+                size_of=lambda page: len(page.response.content),
+            )
+        return prefetcher.pages(context)
+
+    def request_pages(self, context: Optional[dict]) -> Iterator[GainsightPage]:
+        """Request every page of a context, following pagination."""
+        paginator = self.get_new_paginator()
+        decorated_request = self.request_decorator(self._request_page)
+        boundary = self.get_scroll_boundary()
+        returned: Set[tuple] = set()
+
+        with metrics.http_request_counter(self.name, self.path) as request_counter:
+            request_counter.context = context
+            try:
+                while not paginator.finished:
+                    try:
+                        prepared_request, resp = decorated_request(
+                            context, paginator.current_value
+                        )
+                    except ScrollExpiredError:
+                        if (
+                            boundary is None
+                            or not isinstance(paginator, GainsightJSONPathPaginator)
+                            or paginator.reopen_count >= self.max_scroll_reopens
+                        ):
+                            raise
+                        returned = self._reopen_scroll(paginator, boundary, context)
+                        continue
+                    request_counter.increment()
+                    self.update_sync_costs(prepared_request, resp, context)
+                    page = self.get_page(resp)
+                    if boundary is not None:
+                        self._track_scroll_page(page, boundary, returned)
+                    yield page
+
+                    if boundary is not None and not isinstance(
+                        page, StreamingGainsightPage
+                    ):
+                        boundary.update(page.records(self.records_jsonpath))
+                    paginator.advance(resp)
+            finally:
+                self._reopened_scrolls.pop(context_key(context), None)
+
+    def get_scroll_boundary(self) -> Optional[ScrollBoundary]:
+        """Return a tracker of the last records of a scroll, if it can be reopened."""
+        # Without a filter on the sort key, a new scroll would start over.
+        if not (
+            self.next_page_token_jsonpath
+            and self.replication_key
+            and (self.filter_by_date or self.filter_by_bookmark)
+            and self.primary_keys
+        ):
+            return None
+        return ScrollBoundary(self.replication_key, list(self.primary_keys))
+
+    def _track_scroll_page(
+        self, page: GainsightPage, boundary: ScrollBoundary, returned: Set[tuple]
+    ) -> None:
+        if isinstance(page, StreamingGainsightPage):
+            page.on_record = boundary.add
+        if returned:
+            page.record_filter = functools.partial(
+                boundary.drop_returned, returned=returned
+            )
+
+    def _reopen_scroll(
+        self,
+        paginator: GainsightJSONPathPaginator,
+        boundary: ScrollBoundary,
+        context: Optional[dict],
+    ) -> Set[tuple]:
+        """Reopen an expired scroll and return the keys of the records it repeats."""
+        paginator.reopen()
+        if boundary.value is not None:
+            self._reopened_scrolls[context_key(context)] = boundary.value
+        resume_from = (
+            "the start"
+            if boundary.value is None
+            else format_datetime(
+                datetime.fromtimestamp(boundary.value // 1000, tz=timezone.utc)
+            )
+        )
+        self.logger.warning(
+            f"The scroll cursor of '{self.name}' expired, reopening it from "
+            f"{resume_from}."
+        )
+        return set(boundary.keys)
+
+    def request_numbered_pages(
+        self, context: Optional[dict]
+    ) -> Iterator[GainsightPage]:
+        """Request numbered pages, several at once with the asyncio engine."""
+        engine = cast(AsyncEngine, self.tap.async_engine)
+        paginator = self.get_new_paginator()
+        decorated_request = self.request_decorator(self._request_page)
+        pending: Deque[Tuple[int, PreparedRequest, Future[Response]]] = deque()
+        next_page = paginator.current_value
+
+        with metrics.http_request_counter(self.name, self.path) as request_counter:
+            request_counter.context = context
+            try:
+                while not paginator.finished:
+                    # Pages past the last one may be in flight, and are discarded.
+                    while len(pending) < self.max_concurrent_pages:
+                        prepared_request = self.prepare_request(
+                            context, next_page_token=next_page
+                        )
+                        self.tap.rate_limiter.acquire()
+                        future = engine.send(prepared_request, self.timeout)
+                        pending.append((next_page, prepared_request, future))
+                        next_page += 1
+
+                    page_number, prepared_request, future = pending.popleft()
+                    try:
+                        resp = future.result()
+                        self._check_response(resp, prepared_request, context)
+                    except RETRIABLE_ERRORS:
+                        prepared_request, resp = decorated_request(context, page_number)
+                    request_counter.increment()
+                    self.update_sync_costs(prepared_request, resp, context)
+                    yield self.get_page(resp)
+
+                    paginator.advance(resp)
+            finally:
+                for _, _, future in pending:
+                    future.cancel()
+
+    def _request_page(
+        self, context: Optional[dict], next_page_token: Optional[Any]
+    ) -> Tuple[PreparedRequest, Response]:
+        """Prepare and send the request for one page."""
+        # Prepared on every attempt, so a retry picks up a reduced page size.
+        prepared_request = self.prepare_request(
+            context, next_page_token=next_page_token
+        )
+        cached_response = self.get_cached_response(prepared_request)
+        if cached_response is not None:
+            return prepared_request, cached_response
+        waited = self.tap.rate_limiter.acquire()
+        if waited >= 1:
+            self.logger.info(
+                f"Waited {waited:.1f}s for the rate limit before requesting "
+                f"'{self.name}'."
+            )
+        started = time.perf_counter()
+        resp = self._request(prepared_request, context)
+        if self.page_size_controller:
+            # A streamed body is not read yet, so rely on its declared length.
+            num_bytes = (
+                int(resp.headers.get("Content-Length") or 0)
+                if self.is_streaming
+                else len(resp.content)
+            )
+            self._log_page_size(
+                self.page_size_controller.record_response(
+                    time.perf_counter() - started, num_bytes
+                )
+            )
+        return prepared_request, resp
+
+    def _request(
+        self, prepared_request: PreparedRequest, context: Optional[dict]
+    ) -> Response:
+        """Send a request with the configured request engine and validate it."""
+        engine = self.tap.async_engine
+        if self.response_cache is not None:
+            return self._request_cached(prepared_request, context, self.response_cache)
+        if engine is not None:
+            response = engine.send(prepared_request, self.timeout).result()
+        elif self.is_streaming:
+            response = self.requests_session.send(
+                prepared_request, timeout=self.timeout, stream=True
+            )
+        else:
+            return super()._request(prepared_request, context)
+
+        self._check_response(response, prepared_request, context)
+        if self.is_streaming:
+            conformer = self.record_conformer
+            StreamingGainsightPage.attach(
+                response,
+                self.records_jsonpath,
+                conformer.project if conformer.deselected else None,
+            )
+        return response
+
+    def _request_cached(
+        self,
+        prepared_request: PreparedRequest,
+        context: Optional[dict],
+        cache: ResponseCache,
+    ) -> Response:
+        """Return the cached response to a request, revalidating it when stale."""
+        cached_response = self.get_cached_response(prepared_request)
+        if cached_response is not None:
+            return cached_response
+        key = cache.key(str(prepared_request.url), self.config["api_key"])
+        entry = cache.get(key)
+        if entry is not None:
+            prepared_request.headers.update(entry.validators())
+
+        response = super()._request(prepared_request, context)
+        if entry is not None and response.status_code == HTTPStatus.NOT_MODIFIED:
+            cache.refresh(key, entry)
+            self.cache_revalidations += 1
+            return entry.to_response(prepared_request)
+        cache.put(key, response)
+        return response
+
+    def get_cached_response(
+        self, prepared_request: PreparedRequest
+    ) -> Optional[Response]:
+        """Return the response cached for a request, if it is still fresh."""
+        cache = self.response_cache
+        if cache is None:
+            return None
+        entry = cache.get(cache.key(str(prepared_request.url), self.config["api_key"]))
+        if entry is None or not cache.is_fresh(entry):
+            return None
+        self.cache_hits += 1
+        return entry.to_response(prepared_request)
+
+    def _check_response(
+        self,
+        response: Response,
+        prepared_request: PreparedRequest,
+        context: Optional[dict],
+    ) -> None:
+        """Log the duration of a request and validate its response."""
+        self._write_request_duration_log(
+            endpoint=self.path,
+            response=response,
+            context=context,
+            extra_tags={"url": prepared_request.path_url}
+            if self._LOG_REQUEST_METRIC_URLS
+            else None,
+        )
+        try:
+            self.validate_response(response)
+        except Exception:
+            response.close()
+            raise
+
+    def _write_request_duration_log(
+        self,
+        endpoint: str,
+        response: Response,
+        context: Optional[dict],
+        extra_tags: Optional[dict],
+    ) -> None:
+        """Log the duration of a request and add it to the stream's statistics."""
+        super()._write_request_duration_log(endpoint, response, context, extra_tags)
+        if getattr(response, "_content_consumed", True):
+            num_bytes = len(response.content or b"")
+        else:
+            # A streamed body is not read yet, so count its declared length.
+            num_bytes = int(response.headers.get("Content-Length") or 0)
+        self.stats.add_response(
+            response.elapsed.total_seconds(), num_bytes, response.status_code
+        )
+
+    def validate_response(self, response: Response) -> None:
+        """Pace later requests by the rate limit headers, then validate."""
+        pause = self.tap.rate_limiter.update(response.headers)
+        if pause:
+            self.logger.info(
+                f"Rate limit reached requesting '{self.name}', pausing all "
+                f"requests for {pause:.1f}s."
+            )
+        request_url = response.request.url if response.request is not None else ""
+        if response.status_code in SCROLL_EXPIRED_STATUSES and "scrollId=" in str(
+            request_url
+        ):
+            raise ScrollExpiredError(self.response_error_message(response))
+        super().validate_response(response)
+
+    def backoff_handler(self, details: Details) -> None:
+        """Log and count the retry, and shrink the page size before it."""
+        super().backoff_handler(details)
+        exception = cast(dict, details).get("exception")
+        response = getattr(exception, "response", None)
+        is_rate_limited = (
+            response is not None
+            and response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+        )
+        self.stats.add_retry(rate_limited=is_rate_limited)
+        # A rate limited page is not at fault, so it keeps its size.
+        if self.page_size_controller and not is_rate_limited:
+            self._log_page_size(self.page_size_controller.record_error())
+
+    def _log_page_size(self, page_size: Optional[int]) -> None:
+        if page_size is not None:
+            self.logger.info(f"Page size of '{self.name}' is now {page_size}.")
+
+    def _close_window_prefetcher(self) -> None:
+        if self._window_prefetcher is not None:
+            self._window_prefetcher.close()
+            self._window_prefetcher = None
+
     def get_new_paginator(self) -> BaseAPIPaginator:
         """Get a fresh paginator for this API endpoint."""
         if self.next_page_token_jsonpath:
@@ -69,3 +1024,55 @@ class GainsightPXStream(RESTStream):
             )
         else:
             return GainsightBasePageNumberPaginator(0)
+
+    def parse_response(self, response: Response) -> Iterable[dict]:
+        """Parse the response and return an iterator of result records."""
+        yield from self.get_page(response).records(self.records_jsonpath)
+
+    def _write_schema_message(self) -> None:
+        """Write out a SCHEMA message with the stream schema."""
+        self.message_writer.write_messages(self._generate_schema_messages())
+
+    @property
+    def record_conformer(self) -> RecordConformer:
+        """Return the conformer compiled from the stream schema and selection."""
+        conformer = self._record_conformer
+        mask = self.mask
+        if (
+            conformer is None
+            or conformer.schema is not self.schema
+            or conformer.mask is not mask
+        ):
+            conformer = RecordConformer(self.name, self.schema, self.logger, mask)
+            self._record_conformer = conformer
+        return conformer
+
+    def _generate_record_messages(
+        self, record: dict
+    ) -> Generator[singer.RecordMessage, None, None]:
+        """Yield the RECORD messages of a record, conformed with `record_conformer`."""
+        conformer = self.record_conformer
+        # The conformer drops deselected top level properties itself.
+        if conformer.has_nested_deselection:
+            pop_deselected_record_properties(
+                record, self.schema, self.mask, self.logger
+            )
+        record = conformer.conform(record)
+        for stream_map in self.stream_maps:
+            mapped_record = stream_map.transform(record)
+            if mapped_record is not None:
+                yield singer.RecordMessage(
+                    stream=stream_map.stream_alias,
+                    record=mapped_record,
+                    version=None,
+                    time_extracted=utc_now(),
+                )
+
+    def _write_record_message(self, record: dict) -> None:
+        """Write out the RECORD messages of a single record."""
+        self.message_writer.write_messages(self._generate_record_messages(record))
+
+    def _write_state_message(self) -> None:
+        """Write out a STATE message with the latest state."""
+        self.message_writer.write_state(self.tap_state, self.name)
+        self._next_checkpoint = time.monotonic() + (self.checkpoint_seconds or 0)
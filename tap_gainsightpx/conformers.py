@@ -0,0 +1,95 @@
+"""Record projection and conformance compiled once from a stream schema."""
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from singer_sdk._singerlib import SelectionMask
+from singer_sdk.helpers._typing import conform_record_data_types, is_boolean_type
+
+#: Value types the SDK passes through unchanged for non-boolean properties.
+PLAIN_TYPES = frozenset({str, int, float, bool, list, dict, type(None)})
+
+
+class RecordConformer:
+    """Conform records to a schema like `conform_record_data_types` does.
+
+    The property names, boolean properties and deselected properties are looked
+    up once when the conformer is built instead of for every value of every
+    record. Values of the plain JSON types are copied as they are; boolean
+    properties are coerced like the SDK does, and anything else, such as
+    datetimes or bytes, is handed to the SDK.
+    """
+
+    def __init__(
+        self,
+        stream_name: str,
+        schema: dict,
+        logger: logging.Logger,
+        mask: Optional[SelectionMask] = None,
+    ) -> None:
+        """Build the lookup tables for `schema` and the catalog selection `mask`."""
+        self.stream_name = stream_name
+        self.schema = schema
+        self.logger = logger
+        self.mask = mask
+        self._properties: Dict[str, dict] = schema.get("properties", {})
+        self._booleans = frozenset(
+            name for name, prop in self._properties.items() if is_boolean_type(prop)
+        )
+        #: The top level properties deselected in the catalog.
+        self.deselected: FrozenSet[str] = frozenset(
+            name
+            for name in self._properties
+            if mask is not None and not mask[("properties", name)]
+        )
+        #: Whether properties nested in a record are deselected too.
+        self.has_nested_deselection = mask is not None and any(
+            len(breadcrumb) > 2 and not selected
+            for breadcrumb, selected in mask.items()
+        )
+        self._warned: Set[Tuple[str, ...]] = set()
+
+    def project(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Remove the deselected top level properties from the record and return it."""
+        for name in self.deselected:
+            record.pop(name, None)
+        return record
+
+    def conform(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the record without unknown or deselected keys, values coerced."""
+        properties = self._properties
+        booleans = self._booleans
+        deselected = self.deselected
+        rec: Dict[str, Any] = {}
+        unmapped: List[str] = []
+        for name, value in record.items():
+            if name not in properties:
+                unmapped.append(name)
+            elif name in deselected:
+                continue
+            elif type(value) not in PLAIN_TYPES:
+                rec[name] = self._conform_value(name, value)
+            elif name in booleans:
+                rec[name] = None if value is None else value != 0
+            else:
+                rec[name] = value
+        if unmapped:
+            self._warn_unmapped(tuple(unmapped))
+        return rec
+
+    def _conform_value(self, name: str, value: Any) -> Any:
+        schema = {"properties": {name: self._properties[name]}}
+        conformed = conform_record_data_types(
+            self.stream_name, {name: value}, schema, self.logger
+        )
+        return conformed[name]
+
+    def _warn_unmapped(self, names: Tuple[str, ...]) -> None:
+        if names in self._warned:
+            return
+        self._warned.add(names)
+        self.logger.info(
+            f"Properties {names} were present in the '{self.stream_name}' stream "
+            "but not found in catalog schema. Ignoring."
+        )
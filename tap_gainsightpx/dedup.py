@@ -0,0 +1,138 @@
+"""De-duplication of records by primary key, within a fixed memory budget."""
+from __future__ import annotations
+
+import hashlib
+import os
+from array import array
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Iterable, Iterator, List, Set
+
+#: The number of buckets the de-duplication window is split into.
+BUCKETS_PER_WINDOW = 60
+
+
+class RecordDeduplicator:
+    """Drop records whose primary key was already seen at about the same date.
+
+    Keys are hashed and kept in sets bucketed by the `sort_key` date of their
+    record. Only the buckets within `window` of the latest date seen are kept,
+    and the oldest buckets are dropped early when more than `max_keys` keys are
+    held, so memory stays bounded however long the sync runs. Records dated
+    more than `window` before the latest one are never reported as duplicates.
+
+    The keys of the latest records can be saved and loaded by the next sync, so
+    the records it requests again are dropped too. Two different keys hashing to
+    the same value would drop a record; with 64 bit hashes this is about as
+    likely as one in 10^7 for a million keys.
+    """
+
+    def __init__(
+        self,
+        key_properties: List[str],
+        sort_key: str,
+        window: timedelta,
+        max_keys: int,
+    ) -> None:
+        """Track the keys of records dated up to `window` apart."""
+        self.key_properties = key_properties
+        self.sort_key = sort_key
+        self.max_keys = max(max_keys, 1)
+        window_ms = max(int(window.total_seconds() * 1000), 1)
+        self._bucket_ms = max(window_ms // BUCKETS_PER_WINDOW, 1)
+        self._window_buckets = -(-window_ms // self._bucket_ms)
+        self._buckets: OrderedDict[int, Set[int]] = OrderedDict()
+        self._key_count = 0
+        #: The number of duplicate records dropped so far.
+        self.suppressed = 0
+
+    def __len__(self) -> int:
+        """Return the number of keys held."""
+        return self._key_count
+
+    def filter(self, records: Iterable[dict]) -> Iterator[dict]:
+        """Yield the records not seen before."""
+        for record in records:
+            if self.is_duplicate(record):
+                self.suppressed += 1
+            else:
+                yield record
+
+    def is_duplicate(self, record: dict) -> bool:
+        """Return True if the record was seen before, else remember it."""
+        value = record.get(self.sort_key)
+        if not isinstance(value, int):
+            return False
+        bucket = value // self._bucket_ms
+        if self._buckets and (
+            bucket <= next(reversed(self._buckets)) - self._window_buckets
+        ):
+            # Too old for the window, so it cannot be checked.
+            return False
+        key = self._hash_key(record)
+        keys = self._buckets.get(bucket)
+        if keys is None:
+            keys = self._add_bucket(bucket)
+        elif key in keys:
+            return True
+        keys.add(key)
+        self._key_count += 1
+        while self._key_count > self.max_keys:
+            self._drop_oldest()
+        return False
+
+    def save(self, path: str, window: timedelta) -> None:
+        """Write the keys of the records within `window` of the latest to `path`."""
+        saved = array("q")
+        if self._buckets:
+            window_ms = int(window.total_seconds() * 1000)
+            latest = next(reversed(self._buckets))
+            for bucket, keys in self._buckets.items():
+                if (latest - bucket) * self._bucket_ms <= window_ms:
+                    for key in keys:
+                        saved.extend((bucket * self._bucket_ms, key))
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(f"{path}.tmp", "wb") as file:
+            saved.tofile(file)
+        os.replace(f"{path}.tmp", path)
+
+    def load(self, path: str) -> None:
+        """Remember the keys saved to `path` by an earlier sync, if there are any."""
+        if not os.path.exists(path):
+            return
+        saved = array("q")
+        with open(path, "rb") as file:
+            saved.frombytes(file.read())
+        for index in range(0, len(saved), 2):
+            bucket = saved[index] // self._bucket_ms
+            keys = self._buckets.get(bucket)
+            if keys is None:
+                keys = self._add_bucket(bucket)
+            if saved[index + 1] not in keys:
+                keys.add(saved[index + 1])
+                self._key_count += 1
+        while self._key_count > self.max_keys:
+            self._drop_oldest()
+
+    def _hash_key(self, record: dict) -> int:
+        # The built-in hash of strings changes from one process to the next.
+        key = repr(tuple(record.get(name) for name in self.key_properties))
+        digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "little", signed=True)
+
+    def _add_bucket(self, bucket: int) -> Set[int]:
+        is_latest = not self._buckets or bucket > next(reversed(self._buckets))
+        keys: Set[int] = set()
+        self._buckets[bucket] = keys
+        if not is_latest:
+            # Keep the buckets in date order for eviction.
+            for other in sorted(self._buckets):
+                self._buckets.move_to_end(other)
+        latest = next(reversed(self._buckets))
+        while next(iter(self._buckets)) <= latest - self._window_buckets:
+            self._drop_oldest()
+        return keys
+
+    def _drop_oldest(self) -> None:
+        _, keys = self._buckets.popitem(last=False)
+        self._key_count -= len(keys)
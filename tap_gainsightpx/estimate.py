@@ -0,0 +1,174 @@
+"""Estimates of the records, requests and time a sync would take."""
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from tap_gainsightpx.pages import GainsightPage
+from tap_gainsightpx.windows import parse_datetime
+
+if TYPE_CHECKING:
+    from tap_gainsightpx.client import GainsightPXStream
+
+
+class StreamEstimate:
+    """The records and requests of one stream, timed by the latency of probes."""
+
+    def __init__(
+        self,
+        stream: str,
+        page_size: int,
+        parallelism: int = 1,
+        max_requests_per_second: Optional[float] = None,
+    ) -> None:
+        """Create an empty estimate of a stream fetched `page_size` records a page."""
+        self.stream = stream
+        self.page_size = max(page_size, 1)
+        #: How many requests of the stream are in flight at the same time.
+        self.parallelism = max(parallelism, 1)
+        self.max_requests_per_second = max_requests_per_second
+        self.records = 0
+        self.requests = 0
+        self.windows = 0
+        #: The count requests sent to estimate the stream, and their latency.
+        self.probes = 0
+        self.probe_seconds = 0.0
+
+    def add_window(self, records: int) -> None:
+        """Add the records of a date window, or of the whole stream."""
+        self.windows += 1
+        self.records += records
+        # Even a window without records takes a request to find out.
+        self.requests += max(math.ceil(records / self.page_size), 1)
+
+    def add_probe(self, seconds: float) -> None:
+        """Count a request sent for the estimate, and its latency."""
+        self.probes += 1
+        self.probe_seconds += seconds
+
+    @property
+    def latency(self) -> float:
+        """Return the average latency of the count requests, in seconds."""
+        return self.probe_seconds / self.probes if self.probes else 0.0
+
+    @property
+    def seconds(self) -> float:
+        """Return how long the requests take, at the rate limit if it is lower.
+
+        Full pages take longer than the small pages counted, so this is a lower
+        bound.
+        """
+        seconds = self.requests * self.latency / self.parallelism
+        if self.max_requests_per_second:
+            seconds = max(seconds, self.requests / self.max_requests_per_second)
+        return seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the estimate."""
+        return {
+            "stream": self.stream,
+            "records": self.records,
+            "requests": self.requests,
+            "page_size": self.page_size,
+            "windows": self.windows,
+            "latency_seconds": round(self.latency, 3),
+            "seconds": round(self.seconds, 1),
+        }
+
+
+def estimate_stream(stream: GainsightPXStream) -> StreamEstimate:
+    """Estimate the records and requests a sync of the stream would take."""
+    if stream.tap.async_engine and not stream.next_page_token_jsonpath:
+        parallelism = stream.max_concurrent_pages
+    elif stream.is_date_partitioned and not stream.is_streaming:
+        parallelism = stream.max_parallel_scrolls
+    else:
+        parallelism = 1
+    estimate = StreamEstimate(
+        stream.name,
+        stream.page_size or stream.max_page_size,
+        parallelism,
+        stream.tap.max_requests_per_second,
+    )
+    contexts: List[Optional[dict]] = [None]
+    if stream.partitions:
+        contexts = list(stream.partitions)
+    for context in contexts:
+        if context and stream.is_window_complete(context):
+            continue
+        start, end = stream.get_date_bounds(context)
+        if stream.filter_by_date and parse_datetime(start) > parse_datetime(end):
+            continue
+        estimate.add_window(count_records(stream, context, estimate))
+    return estimate
+
+
+def count_records(
+    stream: GainsightPXStream, context: Optional[dict], estimate: StreamEstimate
+) -> int:
+    """Return the number of records a sync of the context would return."""
+    if stream.next_page_token_jsonpath:
+        page = _request_count_page(stream, context, None, estimate)
+        return int(page.get("totalHits") or 0)
+
+    # Page number endpoints only tell the last page apart, so find it by doubling
+    # the page number until past the end, then bisecting.
+    page_size = stream.min_page_size
+    counts: Dict[int, int] = {}
+    low, high = -1, 0
+    while True:
+        page = _request_count_page(stream, context, high, estimate)
+        counts[high] = page.record_count(stream.records_jsonpath)
+        if counts[high] and (page.get("isLastPage") or counts[high] < page_size):
+            return high * page_size + counts[high]
+        if not counts[high]:
+            break
+        low, high = high, max(high * 2, 1)
+    while high - low > 1:
+        middle = (low + high) // 2
+        page = _request_count_page(stream, context, middle, estimate)
+        counts[middle] = page.record_count(stream.records_jsonpath)
+        if counts[middle] and (page.get("isLastPage") or counts[middle] < page_size):
+            return middle * page_size + counts[middle]
+        if counts[middle]:
+            low = middle
+        else:
+            high = middle
+    return low * page_size + counts[low] if low >= 0 else 0
+
+
+def _request_count_page(
+    stream: GainsightPXStream,
+    context: Optional[dict],
+    next_page_token: Optional[Any],
+    estimate: StreamEstimate,
+) -> GainsightPage:
+    response = stream.request_count_page(
+        context, stream.get_url_params(context, next_page_token)
+    )
+    estimate.add_probe(response.elapsed.total_seconds())
+    return stream.get_page(response)
+
+
+def summarize(
+    estimates: List[StreamEstimate],
+    parallel_streams: int = 1,
+    max_requests_per_second: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Return the estimate of every stream and of the whole sync.
+
+    Streams synced at the same time share the tap's rate limit.
+    """
+    requests = sum(estimate.requests for estimate in estimates)
+    seconds = sum(estimate.seconds for estimate in estimates) / max(parallel_streams, 1)
+    if max_requests_per_second:
+        seconds = max(seconds, requests / max_requests_per_second)
+    return {
+        "streams": [estimate.to_dict() for estimate in estimates],
+        "total": {
+            "records": sum(estimate.records for estimate in estimates),
+            "requests": requests,
+            "probes": sum(estimate.probes for estimate in estimates),
+            "seconds": round(seconds, 1),
+        },
+    }
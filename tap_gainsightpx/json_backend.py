@@ -0,0 +1,104 @@
+"""JSON backends for decoding API pages and encoding Singer messages."""
+from __future__ import annotations
+
+import dataclasses
+import decimal
+import json
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from singer_sdk._singerlib import Message
+from singer_sdk._singerlib.messages import format_message
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+#: Names accepted by the `json_backend` setting.
+BACKEND_NAMES = ["auto", "orjson", "json"]
+
+
+class JSONBackend:
+    """Decode and encode JSON with one library."""
+
+    def __init__(
+        self,
+        name: str,
+        loads: Callable[[Union[bytes, str]], Any],
+        format_message: Callable[[Message], str],
+    ) -> None:
+        """Create a backend from its decode and message encode functions."""
+        self.name = name
+        self.loads = loads
+        self.format_message = format_message
+
+    def __repr__(self) -> str:
+        """Return the backend name."""
+        return f"JSONBackend({self.name!r})"
+
+
+def _orjson_default(value: Any) -> Any:
+    """Encode values orjson leaves to us the way the SDK's `default=str` does."""
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    return str(value)
+
+
+_FIELD_NAMES: Dict[type, Tuple[str, ...]] = {}
+
+
+def _field_names(message_class: type) -> Tuple[str, ...]:
+    names = _FIELD_NAMES.get(message_class)
+    if names is None:
+        names = tuple(field.name for field in dataclasses.fields(message_class))
+        _FIELD_NAMES[message_class] = names
+    return names
+
+
+def message_to_dict(message: Message) -> Dict[str, Any]:
+    """Return the non-null fields of a message like `Message.to_dict` does.
+
+    Unlike `Message.to_dict`, the record and state values are not deep copied,
+    which is most of the cost of encoding a message.
+    """
+    values = ((name, getattr(message, name)) for name in _field_names(type(message)))
+    return {name: value for name, value in values if value is not None}
+
+
+def _orjson_format_message(message: Message) -> str:
+    """Format a message like the SDK does, falling back to it for odd values."""
+    try:
+        return orjson.dumps(
+            message_to_dict(message),
+            default=_orjson_default,
+            option=orjson.OPT_PASSTHROUGH_DATETIME,
+        ).decode()
+    except TypeError:
+        # Non-string keys and integers above 64 bits are left to the SDK.
+        return format_message(message)
+
+
+STDLIB = JSONBackend("json", json.loads, format_message)
+BACKENDS: Dict[str, Optional[JSONBackend]] = {
+    "orjson": JSONBackend("orjson", orjson.loads, _orjson_format_message)
+    if orjson is not None
+    else None,
+    "json": STDLIB,
+}
+
+
+def get_json_backend(name: Optional[str] = "auto") -> JSONBackend:
+    """Return the named backend, or the fastest installed one for `auto`."""
+    if not name or name == "auto":
+        return BACKENDS["orjson"] or STDLIB
+    if name not in BACKENDS:
+        raise ValueError(
+            f"Unknown JSON backend '{name}'. Expected one of {BACKEND_NAMES}."
+        )
+    backend = BACKENDS[name]
+    if backend is None:
+        raise ImportError(
+            f"The '{name}' JSON backend is not installed. "
+            f"Install it with `pip install tap-gainsightpx[{name}]`."
+        )
+    return backend
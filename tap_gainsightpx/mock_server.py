@@ -0,0 +1,353 @@
+"""A local stand-in for the GainsightPX API, serving seeded synthetic data.
+
+Every endpoint of the tap's streams is served, with records generated from the
+stream schema. Scroll endpoints page with `scrollId` and report `totalHits`,
+numbered endpoints page with `pageNumber` and report `isLastPage`. Records are
+sorted on the stream's replication key, spread evenly between two dates, and
+filtered by the `>=`, `>`, `<=` and `<` clauses of the `filter` parameter.
+Requests can be slowed by a fixed latency, and every n-th request answered with
+a 429 to exercise the tap's rate limit handling.
+
+The same seed always produces the same records, so runs can be compared. Start
+a server from the command line with::
+
+    python -m tap_gainsightpx.mock_server --events 1000000 --latency 0.05
+"""
+from __future__ import annotations
+
+import argparse
+import base64
+import bisect
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from tap_gainsightpx.pages import get_records_key
+from tap_gainsightpx.tap import STREAM_TYPES
+
+#: Builds a value of a property from a random generator.
+ValueFactory = Callable[[random.Random], Any]
+
+#: The number of distinct values generated for each property, a prime.
+POOL_SIZE = 251
+#: How far before the record date other date properties fall, in milliseconds.
+MAX_DATE_OFFSET = 86_400_000
+
+FILTER_CLAUSE = re.compile(r"^(\w+)(>=|<=|>|<)(.+)$")
+WORDS = ["alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel"]
+
+
+def to_millis(value: str) -> int:
+    """Convert an ISO datetime from a filter to epoch milliseconds."""
+    return int(datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp() * 1000)
+
+
+def value_factory(name: str, schema: dict) -> ValueFactory:
+    """Return a function generating plausible values for a JSON schema."""
+    types = schema.get("type", "string")
+    if isinstance(types, list):
+        types = next((t for t in types if t != "null"), "string")
+    if types == "integer":
+        return lambda rng: rng.randrange(10_000)
+    if types == "number":
+        return lambda rng: round(rng.uniform(0, 1000), 3)
+    if types == "boolean":
+        return lambda rng: rng.random() < 0.5
+    if types == "array":
+        item = value_factory(name, schema.get("items", {}))
+        return lambda rng: [item(rng) for _ in range(rng.randint(1, 3))]
+    if types == "object":
+        properties = schema.get("properties")
+        if not properties:
+            return lambda rng: {"tier": rng.choice(WORDS), "count": rng.randrange(100)}
+        factories = [(key, value_factory(key, p)) for key, p in properties.items()]
+        return lambda rng: {key: make(rng) for key, make in factories}
+    return lambda rng: f"{name}-{rng.choice(WORDS)}-{rng.randrange(1000)}"
+
+
+def is_date_property(name: str, schema: dict) -> bool:
+    """Return True for the integer properties holding an epoch millis date."""
+    types = schema.get("type")
+    return name.endswith("Date") and "integer" in (
+        types if isinstance(types, list) else [types]
+    )
+
+
+class Endpoint:
+    """The seeded records of one endpoint, sorted on their date."""
+
+    def __init__(
+        self,
+        stream_class: Any,
+        count: int,
+        start_ms: int,
+        end_ms: int,
+        seed: int,
+    ) -> None:
+        """Describe the records served for a stream class of the tap."""
+        self.name: str = stream_class.name
+        self.path: str = stream_class.path
+        self.records_key = get_records_key(stream_class.records_jsonpath)
+        self.is_scroll = bool(stream_class.next_page_token_jsonpath)
+        self.sort_key: Optional[str] = stream_class.replication_key
+        self.primary_keys: List[str] = list(stream_class.primary_keys or [])
+        self.count = count
+        self.start_ms = start_ms
+        self.step_ms = (end_ms - start_ms) / max(count, 1)
+        # Each property takes one of a pool of seeded values, picked by the record
+        # index with a stride of its own, which is much cheaper than generating
+        # every value of every record.
+        self._columns: List[Tuple[str, List[Any], int, bool]] = []
+        for name, schema in stream_class.schema["properties"].items():
+            rng = random.Random(f"{seed}:{self.name}:{name}")
+            if is_date_property(name, schema):
+                pool: List[Any] = [
+                    -rng.randrange(MAX_DATE_OFFSET) for _ in range(POOL_SIZE)
+                ]
+            else:
+                make = value_factory(name, schema)
+                pool = [make(rng) for _ in range(POOL_SIZE)]
+            stride = rng.randrange(1, POOL_SIZE)
+            self._columns.append((name, pool, stride, is_date_property(name, schema)))
+
+    def date(self, index: int) -> int:
+        """Return the date of the record at `index`, in epoch milliseconds."""
+        return int(self.start_ms + index * self.step_ms)
+
+    def record(self, index: int) -> dict:
+        """Return the record at `index`, the same for the same seed."""
+        date = self.date(index)
+        record = {}
+        for name, pool, stride, is_date in self._columns:
+            value = pool[index * stride % POOL_SIZE]
+            record[name] = value + date if is_date else value
+        for key in self.primary_keys:
+            record[key] = f"{self.name}-{index}"
+        if self.sort_key:
+            record[self.sort_key] = date
+        return record
+
+    def index_range(self, record_filter: Optional[str]) -> Tuple[int, int]:
+        """Return the first and past the last record index matching a filter."""
+        dates = _Dates(self)
+        # Records without a replication key, such as engagements, are still spread
+        # over the date range by index, and filtered on the `date` the tap sends.
+        field = self.sort_key or "date"
+        first, last = 0, self.count
+        for clause in (record_filter or "").split(";"):
+            match = FILTER_CLAUSE.match(clause)
+            if not match or match.group(1) != field:
+                continue
+            _, operator, value = match.groups()
+            millis = to_millis(value)
+            if operator == ">=":
+                first = max(first, bisect.bisect_left(dates, millis))
+            elif operator == ">":
+                first = max(first, bisect.bisect_right(dates, millis))
+            elif operator == "<=":
+                last = min(last, bisect.bisect_right(dates, millis))
+            else:
+                last = min(last, bisect.bisect_left(dates, millis))
+        return first, max(first, last)
+
+    def scroll_page(self, query: Dict[str, List[str]]) -> dict:
+        """Return the scroll page of records for the query."""
+        first, last = self.index_range(query.get("filter", [""])[0])
+        scroll_id = query.get("scrollId", [""])[0]
+        offset = first + (int(base64.b64decode(scroll_id)) if scroll_id else 0)
+        page_end = min(offset + int(query.get("pageSize", ["500"])[0]), last)
+        return {
+            self.records_key: [self.record(i) for i in range(offset, page_end)],
+            "scrollId": base64.b64encode(str(page_end - first).encode()).decode(),
+            "totalHits": max(last - first, 0),
+        }
+
+    def numbered_page(self, query: Dict[str, List[str]]) -> dict:
+        """Return a numbered page of records for the query."""
+        first, last = self.index_range(query.get("filter", [""])[0])
+        page_size = int(query.get("pageSize", ["500"])[0])
+        offset = first + int(query.get("pageNumber", ["0"])[0]) * page_size
+        page_end = min(offset + page_size, last)
+        return {
+            self.records_key: [self.record(i) for i in range(offset, page_end)],
+            "isLastPage": page_end >= last,
+        }
+
+
+class _Dates(Sequence[int]):
+    """The record dates of an endpoint, in index order, for bisecting."""
+
+    def __init__(self, endpoint: Endpoint) -> None:
+        self._endpoint = endpoint
+
+    def __len__(self) -> int:
+        return self._endpoint.count
+
+    def __getitem__(self, index: Any) -> Any:
+        return self._endpoint.date(index)
+
+
+class MockGainsightPX(ThreadingHTTPServer):
+    """Serve every endpoint of the tap over seeded synthetic records.
+
+    The event endpoints serve `event_count` events between `start` and `end`;
+    the accounts, users, features, engagements and segments endpoints serve
+    `entity_count` records, or `event_count` if not given.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        start: str,
+        end: str,
+        event_count: int,
+        latency: float = 0.0,
+        *,
+        entity_count: Optional[int] = None,
+        seed: int = 0,
+        rate_limit_every: int = 0,
+        retry_after: float = 0.0,
+        port: int = 0,
+    ) -> None:
+        """Create the server on `port` of the loopback interface, any if 0."""
+        super().__init__(("127.0.0.1", port), MockHandler)
+        self.event_count = event_count
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.request_count = 0
+        self.rate_limited_count = 0
+        self._lock = threading.Lock()
+        self.endpoints: Dict[str, Endpoint] = {}
+        for stream_class in STREAM_TYPES:
+            is_event = stream_class.replication_key == "date"
+            count = event_count if is_event or entity_count is None else entity_count
+            endpoint = Endpoint(
+                stream_class, count, to_millis(start), to_millis(end), seed
+            )
+            self.endpoints[endpoint.path] = endpoint
+
+    @property
+    def url(self) -> str:
+        """Return the base URL to use as the tap `api_url`."""
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def __enter__(self) -> MockGainsightPX:
+        """Serve requests on a background thread."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        """Stop serving and close the socket."""
+        self.shutdown()
+        self.server_close()
+
+    def next_request_is_rate_limited(self) -> bool:
+        """Count a request, returning True if it gets a 429."""
+        with self._lock:
+            self.request_count += 1
+            limited = bool(
+                self.rate_limit_every
+                and self.request_count % self.rate_limit_every == 0
+            )
+            self.rate_limited_count += limited
+            return limited
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    """Request handler for `MockGainsightPX`."""
+
+    server: MockGainsightPX
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, which would otherwise wait for
+    # the delayed ACK of the headers on kept alive connections.
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Serve one scroll or numbered page."""
+        time.sleep(self.server.latency)
+        url = urlparse(self.path)
+        endpoint = self.server.endpoints.get(url.path)
+        if endpoint is None:
+            self.send_json(HTTPStatus.NOT_FOUND, {"message": "Not found"})
+        elif self.server.next_request_is_rate_limited():
+            headers = {"Retry-After": f"{self.server.retry_after:g}"}
+            self.send_json(HTTPStatus.TOO_MANY_REQUESTS, {}, headers)
+        else:
+            query = parse_qs(url.query)
+            if endpoint.is_scroll:
+                body = endpoint.scroll_page(query)
+            else:
+                body = endpoint.numbered_page(query)
+            self.send_json(HTTPStatus.OK, body)
+
+    def send_json(
+        self, status: int, body: dict, headers: Optional[Dict[str, str]] = None
+    ) -> None:
+        """Send a JSON response."""
+        content = json.dumps(body).encode()
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(content)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(content)
+        except (BrokenPipeError, ConnectionResetError):
+            # The tap cancelled a prefetched page past the last one.
+            pass
+
+    def log_message(self, format: str, *args: object) -> None:
+        """Keep request logs out of the output."""
+
+
+def main() -> None:
+    """Serve the mock API until interrupted."""
+    parser = argparse.ArgumentParser(description="Serve a mock GainsightPX API.")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--start-date", default="2022-01-01T00:00:00Z")
+    parser.add_argument("--end-date", default="2022-01-02T00:00:00Z")
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--entities", type=int, default=1_000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--rate-limit-every",
+        type=int,
+        default=0,
+        help="Answer every n-th request with a 429.",
+    )
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    args = parser.parse_args()
+
+    server = MockGainsightPX(
+        args.start_date,
+        args.end_date,
+        args.events,
+        args.latency,
+        entity_count=args.entities,
+        seed=args.seed,
+        rate_limit_every=args.rate_limit_every,
+        retry_after=args.retry_after,
+        port=args.port,
+    )
+    print(f"Serving the mock GainsightPX API at {server.url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Adaptive page sizing from observed response latency, size and errors."""
+from __future__ import annotations
+
+import threading
+from typing import Callable, Optional
+
+#: Pages above this size are shrunk even when they arrive quickly.
+TARGET_PAGE_BYTES = 8 * 1024 * 1024
+
+
+class PageSizeController:
+    """Grow or shrink a page size between the limits of an endpoint.
+
+    Uses additive increase and multiplicative decrease: fast, small pages grow the
+    size by a tenth of the endpoint maximum, while slow or large pages and failed
+    requests halve it. Responses in between keep the current size.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        minimum: int,
+        maximum: int,
+        target_seconds: float,
+        target_bytes: int = TARGET_PAGE_BYTES,
+    ) -> None:
+        """Create a controller starting at `size`."""
+        self.minimum = max(min(minimum, maximum), 1)
+        self.maximum = maximum
+        self.target_seconds = target_seconds
+        self.target_bytes = target_bytes
+        self.step = max(maximum // 10, 1)
+        self._size = self._clamp(size)
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        """Return the page size to request next."""
+        return self._size
+
+    def record_response(self, seconds: float, num_bytes: int) -> Optional[int]:
+        """Adapt to a successful response, returning the new size if it changed."""
+        if seconds > self.target_seconds or num_bytes > self.target_bytes:
+            return self._resize(lambda size: size // 2)
+        if seconds < self.target_seconds / 2 and num_bytes < self.target_bytes / 2:
+            return self._resize(lambda size: size + self.step)
+        return None
+
+    def record_error(self) -> Optional[int]:
+        """Adapt to a failed request, returning the new size if it changed."""
+        return self._resize(lambda size: size // 2)
+
+    def _resize(self, resize: Callable[[int], int]) -> Optional[int]:
+        with self._lock:
+            size = self._clamp(resize(self._size))
+            if size == self._size:
+                return None
+            self._size = size
+            return size
+
+    def _clamp(self, size: int) -> int:
+        return min(max(size, self.minimum), self.maximum)
@@ -0,0 +1,79 @@
+"""Decoded API pages, shared by the stream, its paginator and record extraction."""
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Optional
+
+from requests import Response
+from singer_sdk.helpers.jsonpath import extract_jsonpath
+
+RECORDS_JSONPATH_PATTERN = re.compile(r"^\$\.(\w+)\[\*\]$")
+MEMBER_JSONPATH_PATTERN = re.compile(r"^\$\.(\w+)$")
+
+
+@lru_cache(maxsize=None)
+def get_records_key(records_jsonpath: str) -> Optional[str]:
+    """Return the top level key of a simple `$.key[*]` records JSONPath."""
+    match = RECORDS_JSONPATH_PATTERN.match(records_jsonpath)
+    return match.group(1) if match else None
+
+
+class GainsightPage:
+    """A single API response page whose body is decoded at most once."""
+
+    def __init__(
+        self, response: Response, loads: Optional[Callable[[bytes], Any]] = None
+    ) -> None:
+        """Wrap a response without decoding it yet.
+
+        The body is decoded with `loads` if given, else with `response.json()`.
+        """
+        self.response = response
+        self._loads = loads
+        self._body: Optional[dict] = None
+        #: Applied to the records of the page before they are emitted, if set.
+        self.record_filter: Optional[Callable[[Iterable[dict]], Iterable[dict]]] = None
+
+    @classmethod
+    def from_response(
+        cls, response: Response, loads: Optional[Callable[[bytes], Any]] = None
+    ) -> GainsightPage:
+        """Return the page attached to the response, creating it if needed."""
+        page = getattr(response, "_gainsight_page", None)
+        if page is None:
+            page = cls(response, loads)
+            setattr(response, "_gainsight_page", page)
+        return page
+
+    @property
+    def body(self) -> dict:
+        """Return the decoded response body."""
+        if self._body is None:
+            if self._loads is None:
+                self._body = self.response.json()
+            else:
+                self._body = self._loads(self.response.content)
+        return self._body
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a top level value from the response body."""
+        return self.body.get(key, default)
+
+    def find(self, jsonpath: str) -> Any:
+        """Return the first value found at `jsonpath`, reading `$.key` directly."""
+        match = MEMBER_JSONPATH_PATTERN.match(jsonpath)
+        if match:
+            return self.get(match.group(1))
+        return next(extract_jsonpath(jsonpath, input=self.body), None)
+
+    def records(self, records_jsonpath: str) -> Iterable[dict]:
+        """Return the records found at `records_jsonpath`."""
+        records_key = get_records_key(records_jsonpath)
+        if records_key is None:
+            return list(extract_jsonpath(records_jsonpath, input=self.body))
+        return self.body.get(records_key) or []
+
+    def record_count(self, records_jsonpath: str) -> int:
+        """Return the number of records on the page."""
+        return len(list(self.records(records_jsonpath)))
@@ -1,12 +1,64 @@
 """Pagination handling. Modifies base classes."""
 from __future__ import annotations
 
-import re
-from typing import Any
+from typing import Any, Iterable, Iterator, List, Optional, Set
 
 from requests import Response
+from singer_sdk.exceptions import FatalAPIError
 from singer_sdk.pagination import BasePageNumberPaginator, JSONPathPaginator
 
+from tap_gainsightpx.pages import GainsightPage
+
+
+class ScrollExpiredError(FatalAPIError):
+    """Raised when the API no longer accepts a scroll cursor."""
+
+
+class ScrollBoundary:
+    """The last sort value a scroll returned, and the records returned at it.
+
+    A scroll reopened after its cursor expired filters on the second of this
+    value, as the API filters whole seconds, so the records already returned from
+    that second are identified by their primary keys and skipped.
+    """
+
+    def __init__(self, sort_key: str, key_properties: List[str]) -> None:
+        """Track the records of a scroll sorted on `sort_key`."""
+        self.sort_key = sort_key
+        self.key_properties = key_properties
+        #: The largest sort value returned so far, in epoch milliseconds.
+        self.value: Optional[int] = None
+        #: The keys of the records returned within the second of `value`.
+        self.keys: Set[tuple] = set()
+
+    def update(self, records: Iterable[dict]) -> None:
+        """Track the records of a page, in the order the scroll returned them."""
+        for record in records:
+            self.add(record)
+
+    def add(self, record: dict) -> None:
+        """Track a record returned by the scroll."""
+        value = record.get(self.sort_key)
+        if not isinstance(value, int):
+            return
+        if self.value is None or value // 1000 > self.value // 1000:
+            self.keys = set()
+        if self.value is None or value > self.value:
+            self.value = value
+        self.keys.add(self.key(record))
+
+    def key(self, record: dict) -> tuple:
+        """Return the primary key of a record."""
+        return tuple(record.get(name) for name in self.key_properties)
+
+    def drop_returned(
+        self, records: Iterable[dict], returned: Set[tuple]
+    ) -> Iterator[dict]:
+        """Yield the records whose keys are not among the `returned` ones."""
+        for record in records:
+            if self.key(record) not in returned:
+                yield record
+
 
 class GainsightJSONPathPaginator(JSONPathPaginator):
     """An API paginator object for Gainsight."""
@@ -23,15 +75,23 @@ class GainsightJSONPathPaginator(JSONPathPaginator):
         """Create a new paginator."""
         super().__init__(jsonpath, *args, **kwargs)
         self._records_jsonpath = records_jsonpath
+        #: How many times the scroll was reopened after its cursor expired.
+        self.reopen_count = 0
+
+    def reopen(self) -> None:
+        """Start a new scroll after the cursor expired."""
+        self._value = None
+        self._finished = False
+        self.current_record_count = 0
+        self.reopen_count += 1
 
     def has_more(self, response: Response) -> bool:
         """Override this method to check if the endpoint has any pages left."""
-        res = response.json()
-        scroll_id = res.get("scrollId")
-        total_hits = res.get("totalHits")
-        records_key = re.findall(r"\$\.(.*)\[\*\]", self._records_jsonpath)[0]
+        page = GainsightPage.from_response(response)
+        scroll_id = page.get("scrollId")
+        total_hits = page.get("totalHits")
 
-        response_record_count = len(res[records_key])
+        response_record_count = page.record_count(self._records_jsonpath)
         self.current_record_count += response_record_count
         if response_record_count == 0 or scroll_id is None:
             return False
@@ -40,6 +100,10 @@ class GainsightJSONPathPaginator(JSONPathPaginator):
 
         return False
 
+    def get_next(self, response: Response) -> Optional[str]:
+        """Get the next page token from the already decoded page."""
+        return GainsightPage.from_response(response).find(self._jsonpath)
+
     def advance(self, response: Response) -> None:
         """Get a new page value and advance the current one."""
         self._page_count += 1
@@ -62,4 +126,4 @@ class GainsightBasePageNumberPaginator(BasePageNumberPaginator):
 
     def has_more(self, response: Response) -> bool:
         """Indicate if the endpoint has more pages."""
-        return not response.json().get("isLastPage")
+        return not GainsightPage.from_response(response).get("isLastPage")
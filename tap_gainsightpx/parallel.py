@@ -0,0 +1,153 @@
+"""Background fetching of pages, for one or several partition windows."""
+from __future__ import annotations
+
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+T = TypeVar("T")
+
+_DONE = object()
+_PUT_TIMEOUT = 0.1
+
+
+class _Failure:
+    """Wraps an exception raised while fetching a window."""
+
+    def __init__(self, exception: BaseException) -> None:
+        self.exception = exception
+
+
+def context_key(context: Optional[dict]) -> tuple:
+    """Return a hashable key for a partition context."""
+    return tuple(sorted((context or {}).items()))
+
+
+class PageQueue:
+    """A queue bounded by both its number of pages and their total size.
+
+    An empty queue always accepts a page, so a page larger than `max_bytes` is
+    still handed over, just never together with others.
+    """
+
+    def __init__(self, max_pages: int, max_bytes: Optional[int] = None) -> None:
+        """Create an empty queue."""
+        self.max_pages = max(max_pages, 1)
+        self.max_bytes = max_bytes
+        self._items: Deque[Tuple[Any, int]] = deque()
+        self._bytes = 0
+        self._changed = threading.Condition()
+
+    def put(self, item: Any, size: int, stopped: threading.Event) -> bool:
+        """Add an item once there is room, or return False if `stopped` is set."""
+        with self._changed:
+            while self._is_full(size):
+                if stopped.is_set():
+                    return False
+                self._changed.wait(_PUT_TIMEOUT)
+            if stopped.is_set():
+                return False
+            self._items.append((item, size))
+            self._bytes += size
+            self._changed.notify_all()
+            return True
+
+    def get(self) -> Any:
+        """Remove and return the oldest item, waiting for one if needed."""
+        with self._changed:
+            while not self._items:
+                self._changed.wait()
+            item, size = self._items.popleft()
+            self._bytes -= size
+            self._changed.notify_all()
+            return item
+
+    def _is_full(self, size: int) -> bool:
+        if not self._items:
+            return False
+        if len(self._items) >= self.max_pages:
+            return True
+        return self.max_bytes is not None and self._bytes + size > self.max_bytes
+
+
+class WindowPrefetcher(Generic[T]):
+    """Fetch the pages of one or several partition windows in the background.
+
+    At most `max_workers` windows are fetched at once, each with its own scroll
+    cursor, and each keeps at most `max_queued_pages` pages, of at most
+    `max_queued_bytes` together, waiting to be consumed. Pages are handed back
+    per window so the caller can still emit one window after the other, which
+    keeps record order and per-window bookmarks exactly as in a serial sync.
+    """
+
+    def __init__(
+        self,
+        fetch_pages: Callable[[Optional[dict]], Iterable[T]],
+        contexts: List[Optional[dict]],
+        max_workers: int,
+        max_queued_pages: int = 2,
+        max_queued_bytes: Optional[int] = None,
+        size_of: Callable[[T], int] = lambda page: 0,
+    ) -> None:
+        """Start fetching every window in `contexts`, in order."""
+        self._fetch_pages = fetch_pages
+        self._size_of = size_of
+        self._stopped = threading.Event()
+        self._queues: Dict[tuple, PageQueue] = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="gainsightpx-window"
+        )
+        for context in contexts:
+            pages_queue = PageQueue(max_queued_pages, max_queued_bytes)
+            self._queues[context_key(context)] = pages_queue
+            self._executor.submit(self._fetch, context, pages_queue)
+
+    def __contains__(self, context: Optional[dict]) -> bool:
+        """Return True if the window is fetched by this prefetcher and not consumed."""
+        return context_key(context) in self._queues
+
+    def pages(self, context: Optional[dict]) -> Iterator[T]:
+        """Yield the pages of one window as they arrive."""
+        pages_queue = self._queues[context_key(context)]
+        while True:
+            item: Any = pages_queue.get()
+            if item is _DONE:
+                break
+            if isinstance(item, _Failure):
+                raise item.exception
+            yield item
+
+        del self._queues[context_key(context)]
+        if not self._queues:
+            self.close()
+
+    def close(self) -> None:
+        """Stop all workers, discarding pages and windows that were not fetched."""
+        self._stopped.set()
+        self._executor.shutdown(wait=True)
+
+    def _fetch(self, context: Optional[dict], pages_queue: PageQueue) -> None:
+        # Windows still queued when the prefetcher closes are not requested.
+        if self._stopped.is_set():
+            return
+        try:
+            for page in self._fetch_pages(context):
+                if not pages_queue.put(page, self._size_of(page), self._stopped):
+                    return
+        except Exception as ex:
+            pages_queue.put(_Failure(ex), 0, self._stopped)
+            return
+        pages_queue.put(_DONE, 0, self._stopped)
@@ -0,0 +1,130 @@
+"""Request pacing shared by every stream of the tap."""
+from __future__ import annotations
+
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Mapping, Optional
+
+#: Reset header values above this are epoch seconds rather than a delay.
+EPOCH_THRESHOLD = 10**9
+
+
+def parse_retry_after(value: str) -> Optional[float]:
+    """Return the seconds to wait from a `Retry-After` delay or HTTP date."""
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_reset(value: str) -> Optional[float]:
+    """Return the seconds until a rate limit window resets."""
+    try:
+        reset = float(value)
+    except ValueError:
+        return None
+    if reset > EPOCH_THRESHOLD:
+        reset -= time.time()
+    return max(reset, 0.0)
+
+
+class RateLimiter:
+    """A token bucket pacing requests from all threads of the tap.
+
+    Tokens refill at `rate` per second, up to a burst of one second's worth. The
+    rate is further lowered to spread the requests the API reports as remaining
+    over the time until its window resets, and all requests pause when the API
+    asks for it with `Retry-After` or runs out of remaining requests.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """Create a limiter allowing `rate` requests per second, or any if None."""
+        self.max_rate = rate
+        self._rate = rate
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self._capacity
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> Optional[float]:
+        """Return the current requests per second, or None when unlimited."""
+        return self._rate
+
+    @property
+    def _capacity(self) -> float:
+        return max(self._rate or 1.0, 1.0)
+
+    def acquire(self) -> float:
+        """Wait for a request slot, returning the seconds spent waiting."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                delay = self._take()
+            if not delay:
+                return waited
+            self._sleep(delay)
+            waited += delay
+
+    def update(self, headers: Mapping[str, str]) -> Optional[float]:
+        """Adapt to the rate limit headers of a response.
+
+        Returns the seconds requests are paused for, if the response asks for a
+        pause.
+        """
+        pause = None
+        retry_after = headers.get("Retry-After")
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        reset_seconds = parse_reset(reset) if reset else None
+        if retry_after:
+            pause = parse_retry_after(retry_after)
+        elif remaining and remaining.isdigit() and reset_seconds is not None:
+            if int(remaining) <= 0:
+                pause = reset_seconds
+            elif reset_seconds:
+                self._set_rate(int(remaining) / reset_seconds)
+
+        if pause:
+            with self._lock:
+                self._paused_until = max(self._paused_until, self._clock() + pause)
+        return pause
+
+    def _take(self) -> float:
+        """Take a token, or return how long to wait before trying again."""
+        now = self._refill()
+        if self._paused_until > now:
+            return self._paused_until - now
+        if self._rate is None:
+            return 0.0
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self._rate
+
+    def _set_rate(self, rate: float) -> None:
+        with self._lock:
+            self._refill()
+            self._rate = rate if self.max_rate is None else min(rate, self.max_rate)
+            self._tokens = min(self._tokens, self._capacity)
+
+    def _refill(self) -> float:
+        now = self._clock()
+        if self._rate is not None:
+            self._tokens = min(
+                self._tokens + (now - self._updated) * self._rate, self._capacity
+            )
+        self._updated = now
+        return now
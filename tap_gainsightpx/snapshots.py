@@ -0,0 +1,116 @@
+"""Content hashes of the rows a full table stream last emitted, kept in SQLite."""
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+from typing import Iterable, Iterator, List
+
+#: The rows looked up in the store at once, within SQLite's parameter limit.
+BATCH_SIZE = 500
+
+
+class SnapshotStore:
+    """The content hash of every row of a stream, by primary key.
+
+    Rows are hashed as canonical JSON, so `changed` only passes on the rows that
+    are new or differ from the last sync. Every row returned by a sync is marked
+    with the number of that sync, so the rows not returned since are found by
+    `deleted`. The changes of a sync are written in one transaction, committed
+    once every row was emitted, so an interrupted sync leaves the store as it was
+    and its rows are emitted again by the next one.
+    """
+
+    def __init__(self, path: str, key_properties: List[str]) -> None:
+        """Open or create the store at `path`, for rows keyed by `key_properties`."""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.key_properties = key_properties
+        # Streams may be synced on another thread than the one creating them.
+        self._db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS rows "
+            "(key TEXT PRIMARY KEY, hash BLOB NOT NULL, sync INTEGER NOT NULL)"
+        )
+        self._sync = 0
+        #: The rows of the current sync that did not change.
+        self.unchanged = 0
+        #: The rows of the current sync no longer returned.
+        self.deleted_count = 0
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Start a sync, committing its changes only if it finishes."""
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            (last_sync,) = self._db.execute("PRAGMA user_version").fetchone()
+            self._sync = last_sync + 1
+            yield
+            self._db.execute(f"PRAGMA user_version = {self._sync:d}")
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+
+    def key(self, record: dict) -> str:
+        """Return the primary key of a row, as stored."""
+        return json.dumps([record.get(name) for name in self.key_properties])
+
+    @staticmethod
+    def hash(record: dict) -> bytes:
+        """Return the content hash of a row."""
+        content = json.dumps(
+            record, sort_keys=True, separators=(",", ":"), default=str
+        ).encode()
+        return hashlib.blake2b(content, digest_size=16).digest()
+
+    def changed(self, records: Iterable[dict]) -> Iterator[dict]:
+        """Yield the rows that are new or changed since the last sync."""
+        batch: List[dict] = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= BATCH_SIZE:
+                yield from self._changed_batch(batch)
+                batch = []
+        yield from self._changed_batch(batch)
+
+    def _changed_batch(self, records: List[dict]) -> List[dict]:
+        if not records:
+            return []
+        rows = [(self.key(r), self.hash(r), self._sync) for r in records]
+        keys = [key for key, _, _ in rows]
+        stored = dict(
+            self._db.execute(
+                "SELECT key, hash FROM rows WHERE key IN "
+                f"({','.join('?' * len(keys))})",
+                keys,
+            )
+        )
+        self._db.executemany("INSERT OR REPLACE INTO rows VALUES (?, ?, ?)", rows)
+        changed = [
+            record
+            for record, (key, content_hash, _) in zip(records, rows)
+            if stored.get(key) != content_hash
+        ]
+        self.unchanged += len(records) - len(changed)
+        return changed
+
+    def deleted(self) -> Iterator[dict]:
+        """Yield the primary key of each row this sync did not return, and forget it."""
+        cursor = self._db.execute("SELECT key FROM rows WHERE sync < ?", (self._sync,))
+        while True:
+            keys = cursor.fetchmany(BATCH_SIZE)
+            if not keys:
+                break
+            for (key,) in keys:
+                self.deleted_count += 1
+                yield dict(zip(self.key_properties, json.loads(key)))
+        self._db.execute("DELETE FROM rows WHERE sync < ?", (self._sync,))
+
+    def __len__(self) -> int:
+        """Return the number of rows stored."""
+        (count,) = self._db.execute("SELECT COUNT(*) FROM rows").fetchone()
+        return count
@@ -0,0 +1,274 @@
+"""Per-stream performance statistics, exported as JSON or a Prometheus textfile."""
+from __future__ import annotations
+
+import bisect
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+#: Upper bounds of the request latency histogram, in seconds.
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+#: Upper bounds of the response size histogram, in bytes.
+BYTES_BUCKETS = (1e3, 1e4, 1e5, 1e6, 1e7, 1e8)
+#: Upper bounds of the records per page histogram.
+RECORDS_BUCKETS = (0, 10, 50, 100, 250, 500, 1000, 5000)
+
+#: Formats accepted by the `metrics_format` setting.
+FORMATS = ["json", "prometheus"]
+
+PROMETHEUS_PREFIX = "gainsightpx"
+
+
+class Histogram:
+    """Counts of observed values at or below each bucket bound, with their sum."""
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        """Create an empty histogram with the given upper bounds, ascending."""
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Add a value to its bucket."""
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> Iterator[Tuple[str, int]]:
+        """Yield each bound, ending with `+Inf`, and the count at or below it."""
+        total = 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            total += count
+            yield ("+Inf" if bound == float("inf") else f"{bound:g}"), total
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the cumulative bucket counts, sum and count."""
+        return {
+            "buckets": dict(self.cumulative()),
+            "sum": self.sum,
+            "count": self.count,
+        }
+
+
+class EndpointStats:
+    """Request, page and record statistics of one stream and endpoint."""
+
+    def __init__(self, stream: str, endpoint: str, lock: threading.Lock) -> None:
+        """Create empty statistics, updated under the shared `lock`."""
+        self.stream = stream
+        self.endpoint = endpoint
+        self._lock = lock
+        self.request_seconds = Histogram(LATENCY_BUCKETS)
+        self.response_bytes = Histogram(BYTES_BUCKETS)
+        self.records_per_page = Histogram(RECORDS_BUCKETS)
+        self.status_codes: Dict[int, int] = {}
+        self.retries = 0
+        self.rate_limited = 0
+        #: Seconds spent waiting for pages to be fetched.
+        self.fetch_seconds = 0.0
+        #: Seconds spent emitting the records of fetched pages.
+        self.emit_seconds = 0.0
+
+    @property
+    def records(self) -> int:
+        """Return the number of records emitted."""
+        return int(self.records_per_page.sum)
+
+    @property
+    def pages(self) -> int:
+        """Return the number of pages emitted."""
+        return self.records_per_page.count
+
+    def add_response(self, seconds: float, num_bytes: int, status_code: int) -> None:
+        """Count a response and its latency."""
+        with self._lock:
+            self.request_seconds.observe(seconds)
+            self.response_bytes.observe(num_bytes)
+            self.status_codes[status_code] = self.status_codes.get(status_code, 0) + 1
+
+    def add_retry(self, rate_limited: bool = False) -> None:
+        """Count a retried request."""
+        with self._lock:
+            self.retries += 1
+            self.rate_limited += rate_limited
+
+    def add_fetch_time(self, seconds: float) -> None:
+        """Add time spent waiting for a page to be fetched."""
+        with self._lock:
+            self.fetch_seconds += seconds
+
+    def add_page(self, records: int, emit_seconds: float) -> None:
+        """Count a page and the time spent emitting its records."""
+        with self._lock:
+            self.records_per_page.observe(records)
+            self.emit_seconds += emit_seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the statistics with the derived throughput."""
+        busy_seconds = self.fetch_seconds + self.emit_seconds
+        return {
+            "stream": self.stream,
+            "endpoint": self.endpoint,
+            "requests": self.request_seconds.count,
+            "status_codes": {str(k): v for k, v in sorted(self.status_codes.items())},
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "pages": self.pages,
+            "records": self.records,
+            "response_bytes": int(self.response_bytes.sum),
+            "fetch_seconds": self.fetch_seconds,
+            "emit_seconds": self.emit_seconds,
+            "records_per_second": self.records / busy_seconds if busy_seconds else 0.0,
+            "request_seconds": self.request_seconds.to_dict(),
+            "response_size_bytes": self.response_bytes.to_dict(),
+            "records_per_page": self.records_per_page.to_dict(),
+        }
+
+
+class SyncStats:
+    """The statistics of every stream, written to `path` at the end of the run.
+
+    With an `interval`, the file is also rewritten whenever `maybe_write` is
+    called that long after the last write. Files are replaced atomically, as the
+    Prometheus node exporter's textfile collector expects.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        output_format: str = "json",
+        interval: Optional[float] = None,
+    ) -> None:
+        """Collect statistics, to be written to `path` in `output_format`, if given."""
+        if output_format not in FORMATS:
+            raise ValueError(
+                f"Unknown metrics format '{output_format}'. Expected one of {FORMATS}."
+            )
+        self.path = path
+        self.output_format = output_format
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._endpoints: Dict[Tuple[str, str], EndpointStats] = {}
+        self._next_write = time.monotonic() + (interval or 0)
+
+    def endpoint(self, stream: str, endpoint: str) -> EndpointStats:
+        """Return the statistics of a stream and endpoint."""
+        with self._lock:
+            stats = self._endpoints.get((stream, endpoint))
+            if stats is None:
+                stats = EndpointStats(stream, endpoint, self._lock)
+                self._endpoints[(stream, endpoint)] = stats
+            return stats
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the statistics of every stream and endpoint."""
+        with self._lock:
+            endpoints = [stats.to_dict() for stats in self._endpoints.values()]
+        return {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "endpoints": endpoints,
+        }
+
+    def to_prometheus(self) -> str:
+        """Return the statistics in the Prometheus text exposition format."""
+        with self._lock:
+            return "".join(f"{line}\n" for line in self._prometheus_lines())
+
+    def _prometheus_lines(self) -> Iterator[str]:
+        for name, kind, help_text, value_of in PROMETHEUS_METRICS:
+            metric = f"{PROMETHEUS_PREFIX}_{name}"
+            yield f"# HELP {metric} {help_text}"
+            yield f"# TYPE {metric} {kind}"
+            for stats in self._endpoints.values():
+                labels = f'stream="{stats.stream}",endpoint="{stats.endpoint}"'
+                value = value_of(stats)
+                if isinstance(value, Histogram):
+                    yield from _prometheus_histogram(metric, labels, value)
+                elif isinstance(value, dict):
+                    for code, count in sorted(value.items()):
+                        yield f'{metric}{{{labels},code="{code}"}} {count}'
+                else:
+                    yield f"{metric}{{{labels}}} {value:g}"
+
+    def maybe_write(self) -> None:
+        """Write the statistics if the interval has passed since the last write."""
+        if self.path and self.interval and time.monotonic() >= self._next_write:
+            self.write()
+
+    def write(self) -> None:
+        """Write the statistics to the configured path, if any."""
+        if not self.path:
+            return
+        self._next_write = time.monotonic() + (self.interval or 0)
+        if self.output_format == "prometheus":
+            text = self.to_prometheus()
+        else:
+            text = json.dumps(self.to_dict(), indent=2) + "\n"
+        directory = os.path.dirname(os.path.abspath(self.path))
+        with tempfile.NamedTemporaryFile(
+            "w", dir=directory, suffix=".tmp", delete=False
+        ) as f:
+            f.write(text)
+        os.replace(f.name, self.path)
+
+
+def _prometheus_histogram(metric: str, labels: str, histogram: Histogram) -> List[str]:
+    lines = [
+        f'{metric}_bucket{{{labels},le="{bound}"}} {count}'
+        for bound, count in histogram.cumulative()
+    ]
+    lines.append(f"{metric}_sum{{{labels}}} {histogram.sum:g}")
+    lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+    return lines
+
+
+PROMETHEUS_METRICS: List[Tuple[str, str, str, Any]] = [
+    (
+        "request_duration_seconds",
+        "histogram",
+        "Time until the response headers of each request were received.",
+        lambda s: s.request_seconds,
+    ),
+    (
+        "response_size_bytes",
+        "histogram",
+        "Size of each response body.",
+        lambda s: s.response_bytes,
+    ),
+    (
+        "records_per_page",
+        "histogram",
+        "Records on each page emitted.",
+        lambda s: s.records_per_page,
+    ),
+    (
+        "responses_total",
+        "counter",
+        "Responses received, by HTTP status code.",
+        lambda s: s.status_codes,
+    ),
+    ("retries_total", "counter", "Requests retried.", lambda s: s.retries),
+    (
+        "rate_limited_total",
+        "counter",
+        "Requests retried after a 429 response.",
+        lambda s: s.rate_limited,
+    ),
+    (
+        "fetch_seconds_total",
+        "counter",
+        "Time spent waiting for pages to be fetched.",
+        lambda s: s.fetch_seconds,
+    ),
+    (
+        "emit_seconds_total",
+        "counter",
+        "Time spent emitting the records of fetched pages.",
+        lambda s: s.emit_seconds,
+    ),
+]
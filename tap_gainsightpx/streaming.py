@@ -0,0 +1,193 @@
+"""Incremental decoding of API pages, yielding records while the body is read."""
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from requests import Response
+
+from tap_gainsightpx.pages import GainsightPage, get_records_key
+
+#: Bytes read from the response at a time.
+CHUNK_SIZE = 64 * 1024
+
+#: Event kinds yielded by `JSONObjectStream.events`.
+MEMBER = "member"
+ITEM = "item"
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+def skip_whitespace(text: str, pos: int) -> int:
+    """Return the position of the first non-whitespace character from `pos`."""
+    match = _WHITESPACE.match(text, pos)
+    return match.end() if match else pos
+
+
+class JSONObjectStream:
+    """Decode a top level JSON object from text chunks, one value at a time.
+
+    Members are yielded as `(MEMBER, (key, value))` events once their value is
+    decoded, except for the `streamed_key` array, whose elements are yielded one
+    by one as `(ITEM, element)` events. Only the text of the value being decoded
+    is kept in memory.
+    """
+
+    def __init__(self, chunks: Iterable[str], streamed_key: str) -> None:
+        """Read the object from `chunks`, streaming the `streamed_key` array."""
+        self._chunks = iter(chunks)
+        self._streamed_key = streamed_key
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def events(self) -> Iterator[Tuple[str, Any]]:
+        """Yield the members of the object and the items of the streamed array."""
+        self._expect("{")
+        if self._peek() == "}":
+            return
+        while True:
+            key = self._value()
+            self._expect(":")
+            if key == self._streamed_key and self._peek() == "[":
+                self._pos += 1
+                yield from self._items()
+            else:
+                yield MEMBER, (key, self._value())
+            if self._next_char(",}") == "}":
+                return
+
+    def _items(self) -> Iterator[Tuple[str, Any]]:
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield ITEM, self._value()
+            if self._next_char(",]") == "]":
+                return
+
+    def _value(self) -> Any:
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number at the end of the buffer may continue in the next chunk.
+            if end < len(self._buffer) or not self._fill():
+                self._pos = end
+                return value
+
+    def _expect(self, char: str) -> None:
+        self._next_char(char)
+
+    def _next_char(self, expected: str) -> str:
+        char = self._peek()
+        if not char or char not in expected:
+            raise json.JSONDecodeError(
+                f"Expecting one of {expected!r}", self._buffer, self._pos
+            )
+        self._pos += 1
+        return char
+
+    def _peek(self) -> str:
+        """Return the next non-whitespace character, reading more if needed."""
+        while True:
+            self._pos = skip_whitespace(self._buffer, self._pos)
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer, dropping text already decoded."""
+        if self._eof:
+            return False
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos :] + chunk  # noqa: E203
+        self._pos = 0
+        return True
+
+
+class StreamingGainsightPage(GainsightPage):
+    """A page whose records are decoded while its response body is read.
+
+    The records can be iterated once. The other top level values, such as
+    `scrollId`, `totalHits` and `isLastPage`, are available once the records are
+    consumed; reading them earlier skips the remaining records.
+    """
+
+    def __init__(
+        self,
+        response: Response,
+        records_jsonpath: str,
+        project: Optional[Callable[[dict], dict]] = None,
+    ) -> None:
+        """Wrap a response opened with `stream=True`.
+
+        Each record is passed through `project`, if given, as soon as it is decoded.
+        """
+        super().__init__(response)
+        self._project = project
+        #: Called with each record as it is decoded, if set.
+        self.on_record: Optional[Callable[[dict], None]] = None
+        records_key = get_records_key(records_jsonpath)
+        if records_key is None:
+            raise ValueError(f"Cannot stream records from '{records_jsonpath}'.")
+        chunks = codecs.iterdecode(response.iter_content(CHUNK_SIZE), "utf-8")
+        self._events = JSONObjectStream(chunks, records_key).events()
+        self._metadata: Dict[str, Any] = {}
+        self._record_count = 0
+
+    @classmethod
+    def attach(
+        cls,
+        response: Response,
+        records_jsonpath: str,
+        project: Optional[Callable[[dict], dict]] = None,
+    ) -> None:
+        """Make `GainsightPage.from_response` return a streaming page."""
+        page = cls(response, records_jsonpath, project)
+        setattr(response, "_gainsight_page", page)
+
+    @property
+    def body(self) -> dict:
+        """Return the top level values of the body, without the records."""
+        self._drain()
+        return self._metadata
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a top level value, skipping any records not yet consumed."""
+        return self.body.get(key, default)
+
+    def records(self, records_jsonpath: str) -> Iterator[dict]:
+        """Yield the records not consumed yet, as they are decoded."""
+        for kind, value in self._events:
+            if kind == ITEM:
+                self._record_count += 1
+                if self._project is not None and isinstance(value, dict):
+                    value = self._project(value)
+                if self.on_record is not None:
+                    self.on_record(value)
+                yield value
+            else:
+                key, member = value
+                self._metadata[key] = member
+        self.response.close()
+
+    def record_count(self, records_jsonpath: str) -> int:
+        """Return the number of records on the page."""
+        self._drain()
+        return self._record_count
+
+    def _drain(self) -> None:
+        for _ in self.records(""):
+            pass
@@ -17,6 +17,9 @@ class AccountsStream(GainsightPXStream):
     next_page_token_jsonpath = "$.scrollId"
     primary_keys = ["id"]
     replication_key = "lastModifiedDate"
+    filter_by_date = False
+    filter_by_bookmark = True
+    max_page_size = 100
     schema = th.PropertiesList(
         th.Property("createDate", th.IntegerType),
         th.Property("customAttributes", th.ObjectType()),
@@ -39,17 +42,15 @@ class AccountsStream(GainsightPXStream):
         th.Property("website", th.StringType),
     ).to_dict()
 
-    def get_url_params(
-        self, context: Optional[dict], next_page_token: Optional[Any]
+    def add_more_url_params(
+        self, context: Optional[dict], params: dict, next_page_token: Optional[Any]
     ) -> Dict[str, Any]:
-        """Return a dictionary of values to be used in URL parameterization."""
-        params: dict = {"pageSize": 100}
-
-        if self.replication_key:
-            params["sort"] = self.replication_key
+        """Add more params specific to the stream."""
+        bookmark_filter = self.get_bookmark_filter(context)
+        if bookmark_filter:
+            params["filter"] = bookmark_filter
         if next_page_token:
             params["scrollId"] = next_page_token
-
         return params
 
 
@@ -173,15 +174,10 @@ class EngagementsStream(GainsightPXStream):
     ).to_dict()
 
     def add_more_url_params(
-        self, params: dict, next_page_token: Optional[Any]
+        self, context: Optional[dict], params: dict, next_page_token: Optional[Any]
     ) -> Dict[str, Any]:
         """Add more params specific to the stream."""
-        params["filter"] = ";".join(
-            [
-                f"date>={self.config['start_date']}",
-                f"date<={self.config['end_date']}",
-            ]
-        )
+        params["filter"] = self.get_date_filter(context)
         if next_page_token:
             params["pageNumber"] = next_page_token
         return params
@@ -218,6 +214,8 @@ class FeaturesStream(GainsightPXStream):
     records_jsonpath = "$.features[*]"
     primary_keys = ["id"]
     replication_key = None
+    filter_by_date = False
+    max_page_size = 200
     schema = th.PropertiesList(
         th.Property("id", th.StringType),
         th.Property("name", th.StringType),
@@ -228,11 +226,9 @@ class FeaturesStream(GainsightPXStream):
     ).to_dict()
 
     def add_more_url_params(
-        self, params: dict, next_page_token: Optional[Any]
+        self, context: Optional[dict], params: dict, next_page_token: Optional[Any]
     ) -> Dict[str, Any]:
         """Add more params specific to the stream."""
-        if params["pageSize"] > 200:
-            params["pageSize"] = 200
         if next_page_token:
             params["pageNumber"] = next_page_token
         return params
@@ -383,17 +379,17 @@ class SegmentsStream(GainsightPXStream):
     records_jsonpath = "$.segments[*]"
     primary_keys = ["id"]
     replication_key = None
+    filter_by_date = False
+    max_page_size = 200
     schema = th.PropertiesList(
         th.Property("id", th.StringType),
         th.Property("name", th.StringType),
     ).to_dict()
 
     def add_more_url_params(
-        self, params: dict, next_page_token: Optional[Any]
+        self, context: Optional[dict], params: dict, next_page_token: Optional[Any]
     ) -> Dict[str, Any]:
         """Add more params specific to the stream."""
-        if params["pageSize"] > 200:
-            params["pageSize"] = 200
         if next_page_token:
             params["pageNumber"] = next_page_token
         return params
@@ -432,6 +428,7 @@ class SurveyResponsesStream(GainsightPXStream):
     next_page_token_jsonpath = "$.scrollId"
     primary_keys = ["eventId"]
     replication_key = "date"
+    filter_by_date = False
     schema = th.PropertiesList(
         th.Property("eventId", th.StringType),
         th.Property("identifyId", th.StringType),
@@ -477,7 +474,7 @@ class SurveyResponsesStream(GainsightPXStream):
     ).to_dict()
 
     def add_more_url_params(
-        self, params: dict, next_page_token: Optional[Any]
+        self, context: Optional[dict], params: dict, next_page_token: Optional[Any]
     ) -> Dict[str, Any]:
         """Add more params specific to the stream."""
         if next_page_token:
@@ -493,7 +490,9 @@ class UsersStream(GainsightPXStream):
     records_jsonpath = "$.users[*]"
     next_page_token_jsonpath = "$.scrollId"
     primary_keys = ["aptrinsicId"]
-    replication_key = None
+    replication_key = "lastModifiedDate"
+    filter_by_date = False
+    filter_by_bookmark = True
     schema = th.PropertiesList(
         th.Property("aptrinsicId", th.StringType),
         th.Property("identifyId", th.StringType),
@@ -525,9 +524,12 @@ class UsersStream(GainsightPXStream):
     ).to_dict()
 
     def add_more_url_params(
-        self, params: dict, next_page_token: Optional[Any]
+        self, context: Optional[dict], params: dict, next_page_token: Optional[Any]
     ) -> Dict[str, Any]:
         """Add more params specific to the stream."""
+        bookmark_filter = self.get_bookmark_filter(context)
+        if bookmark_filter:
+            params["filter"] = bookmark_filter
         if next_page_token:
             params["scrollId"] = next_page_token
         return params
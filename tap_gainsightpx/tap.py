@@ -1,10 +1,24 @@
 """GainsightPX tap class."""
+import json
+import threading
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 from datetime import date, timedelta
-from typing import List
+from pathlib import Path, PurePath
+from typing import Any, Callable, Dict, List, Optional, Type, Union, cast
 
+import click
 from singer_sdk import Stream, Tap
 from singer_sdk import typing as th
+from singer_sdk.helpers._classproperty import classproperty
+from singer_sdk.tap_base import CliTestOptionValue
 
+from tap_gainsightpx.aio import AsyncEngine
+from tap_gainsightpx.cache import ResponseCache
+from tap_gainsightpx.client import GainsightPXStream
+from tap_gainsightpx.estimate import estimate_stream, summarize
+from tap_gainsightpx.json_backend import BACKEND_NAMES, get_json_backend
+from tap_gainsightpx.ratelimit import RateLimiter
+from tap_gainsightpx.stats import FORMATS, SyncStats
 from tap_gainsightpx.streams import (
     AccountsStream,
     CustomEventsStream,
@@ -23,6 +37,9 @@ from tap_gainsightpx.streams import (
     SurveyResponsesStream,
     UsersStream,
 )
+from tap_gainsightpx.transport import HTTPTransport
+from tap_gainsightpx.windows import parse_duration
+from tap_gainsightpx.writer import MessageWriter
 
 STREAM_TYPES = [
     AccountsStream,
@@ -72,6 +89,125 @@ class TapGainsightPX(Tap):
             description="The number of records to return from the API in single page."
             "Default and max varies based on the endpoint.",
         ),
+        th.Property(
+            "adaptive_page_size",
+            th.BooleanType,
+            required=False,
+            default=False,  # type: ignore[arg-type]
+            description="Grow or shrink the page size of scroll endpoints within "
+            "their limits based on response time, response size and errors, "
+            "starting from page_size.",
+        ),
+        th.Property(
+            "target_page_millis",
+            th.IntegerType,
+            required=False,
+            default=2000,  # type: ignore[arg-type]
+            description="The response time in milliseconds adaptive page sizing "
+            "aims for. Slower pages shrink the page size, pages under half of it "
+            "grow it.",
+        ),
+        th.Property(
+            "http_pool_size",
+            th.IntegerType,
+            required=False,
+            default=10,  # type: ignore[arg-type]
+            description="The number of HTTP connections kept open to the API and "
+            "shared by all streams.",
+        ),
+        th.Property(
+            "http_keep_alive",
+            th.BooleanType,
+            required=False,
+            default=True,  # type: ignore[arg-type]
+            description="Reuse HTTP connections across requests. Disable to open a "
+            "new connection for every request.",
+        ),
+        th.Property(
+            "max_requests_per_minute",
+            th.IntegerType,
+            required=False,
+            description="The most requests all streams together send per minute. "
+            "Requests are also paced by the rate limit and Retry-After headers "
+            "of the API.",
+        ),
+        th.Property(
+            "request_engine",
+            th.StringType,
+            required=False,
+            default="requests",  # type: ignore[arg-type]
+            allowed_values=["requests", "asyncio"],  # type: ignore[arg-type]
+            description="Send requests with blocking 'requests' calls, or on one "
+            "asyncio event loop shared by all streams. 'asyncio' requires the "
+            "asyncio extra.",
+        ),
+        th.Property(
+            "max_concurrent_pages",
+            th.IntegerType,
+            required=False,
+            default=4,  # type: ignore[arg-type]
+            description="With the asyncio request engine, the number of pages of "
+            "the engagements, features and segments streams requested at once.",
+        ),
+        th.Property(
+            "json_backend",
+            th.StringType,
+            required=False,
+            default="auto",  # type: ignore[arg-type]
+            allowed_values=BACKEND_NAMES,  # type: ignore[arg-type]
+            description="The library used to decode API pages and encode Singer "
+            "messages. 'auto' uses orjson when it is installed with the orjson "
+            "extra, else the standard library json module.",
+        ),
+        th.Property(
+            "metrics_path",
+            th.StringType,
+            required=False,
+            description="A file the request latency, response size, page, record, "
+            "retry and timing statistics of every stream are written to at the "
+            "end of the run.",
+        ),
+        th.Property(
+            "metrics_format",
+            th.StringType,
+            required=False,
+            default="json",  # type: ignore[arg-type]
+            allowed_values=FORMATS,  # type: ignore[arg-type]
+            description="The format of metrics_path: 'json', or 'prometheus' for "
+            "the node exporter's textfile collector.",
+        ),
+        th.Property(
+            "metrics_interval",
+            th.StringType,
+            required=False,
+            description="Also rewrite metrics_path this often during the run, "
+            "e.g. '30s' or '5m'.",
+        ),
+        th.Property(
+            "response_cache_dir",
+            th.StringType,
+            required=False,
+            description="A directory caching the pages of the features, segments "
+            "and engagements endpoints, so runs within response_cache_ttl request "
+            "none of them.",
+        ),
+        th.Property(
+            "response_cache_ttl",
+            th.StringType,
+            required=False,
+            default="1h",  # type: ignore[arg-type]
+            description="How long cached pages are used without asking the API, "
+            "e.g. '15m' or '1d'. Older pages are revalidated with their ETag or "
+            "Last-Modified header if they had one, or requested again.",
+        ),
+        th.Property(
+            "response_cache_max_mb",
+            th.IntegerType,
+            required=False,
+            default=256,  # type: ignore[arg-type]
+            description="The most megabytes of cached pages kept. The least "
+            "recently used are removed first.",
+        ),
         th.Property(
             "start_date",
             th.DateTimeType,
@@ -88,12 +224,345 @@ class TapGainsightPX(Tap):
             ).strftime("%Y-%m-%dT%H:%M:%SZ"),
             description="The latest record date to sync (inclusive '<='). ISO format.",
         ),
+        th.Property(
+            "lookback_window",
+            th.StringType,
+            required=False,
+            description="How far before the stored bookmark an incremental sync "
+            "starts, e.g. '15m' or '1h', to pick up events that arrive late. "
+            "Finished partition windows ending within it of the newest window "
+            "bookmark are synced again.",
+        ),
+        th.Property(
+            "full_snapshot",
+            th.BooleanType,
+            required=False,
+            default=False,  # type: ignore[arg-type]
+            description="Request every account and user on each sync instead of "
+            "only those modified since the stored bookmark.",
+        ),
+        th.Property(
+            "snapshot_dir",
+            th.StringType,
+            required=False,
+            description="A directory keeping a SQLite snapshot of the rows last "
+            "emitted by the features and segments streams, and by accounts and "
+            "users with full_snapshot. Only new or changed rows are emitted. With "
+            "deduplicate_events, it also keeps the event keys of the lookback window.",
+        ),
+        th.Property(
+            "emit_tombstones",
+            th.BooleanType,
+            required=False,
+            default=False,  # type: ignore[arg-type]
+            description="With snapshot_dir, emit the primary key and "
+            "_sdc_deleted_at of each row no longer returned by the API.",
+        ),
+        th.Property(
+            "checkpoint_interval",
+            th.StringType,
+            required=False,
+            description="How often a STATE message is written while records are "
+            "emitted, e.g. '30s' or '5m', so an interrupted sync resumes from the "
+            "last emitted record. By default STATE is only written every 10000 "
+            "records and at the end of each stream.",
+        ),
+        th.Property(
+            "deduplicate_events",
+            th.BooleanType,
+            required=False,
+            default=False,  # type: ignore[arg-type]
+            description="Drop event records whose primary key was already emitted "
+            "by the same sync, such as those returned again by overlapping windows "
+            "or retried pages. With snapshot_dir and lookback_window set, the keys "
+            "of the lookback window are kept for the next sync, so the events it "
+            "requests again are dropped too.",
+        ),
+        th.Property(
+            "dedup_window",
+            th.StringType,
+            required=False,
+            default="1h",  # type: ignore[arg-type]
+            description="How far apart in date, e.g. '15m' or '1d', two events can "
+            "be and still be recognised as duplicates.",
+        ),
+        th.Property(
+            "dedup_max_keys",
+            th.IntegerType,
+            required=False,
+            default=1000000,  # type: ignore[arg-type]
+            description="The most event keys kept for de-duplication per stream, "
+            "about 80 bytes each. The oldest are forgotten first.",
+        ),
+        th.Property(
+            "partition_window",
+            th.StringType,
+            required=False,
+            description="Split the date range of the event streams into windows of "
+            "this size, e.g. '1h', '6h' or '1d'. Each window keeps its own bookmark "
+            "so an interrupted sync only restarts the unfinished windows.",
+        ),
+        th.Property(
+            "max_parallel_scrolls",
+            th.IntegerType,
+            required=False,
+            default=1,  # type: ignore[arg-type]
+            description="The number of date windows of an event stream fetched at the "
+            "same time, each with its own scroll cursor. Without a partition_window "
+            "the date range is split into this many windows.",
+        ),
+        th.Property(
+            "partition_target_records",
+            th.IntegerType,
+            required=False,
+            description="Plan the date windows of the event streams to hold about "
+            "this many records each. Windows are counted with a small page each, "
+            "busy windows split and quiet neighbours merged. Windows of a previous "
+            "run in the state are kept as they are.",
+        ),
+        th.Property(
+            "partition_min_window",
+            th.StringType,
+            required=False,
+            default="1m",  # type: ignore[arg-type]
+            description="The smallest date window partition_target_records splits "
+            "busy windows into, e.g. '1m' or '1h'.",
+        ),
+        th.Property(
+            "streaming_parse",
+            th.BooleanType,
+            required=False,
+            default=False,  # type: ignore[arg-type]
+            description="Decode records while the response body is read, so memory "
+            "use does not grow with the page size. Pages are then fetched one "
+            "after the other, ignoring prefetch_pages and max_parallel_scrolls.",
+        ),
+        th.Property(
+            "prefetch_pages",
+            th.IntegerType,
+            required=False,
+            default=0,  # type: ignore[arg-type]
+            description="The number of pages fetched in the background while the "
+            "records of the current page are emitted. With max_parallel_scrolls, "
+            "the number of pages each window fetches ahead (default 2).",
+        ),
+        th.Property(
+            "prefetch_memory_mb",
+            th.IntegerType,
+            required=False,
+            default=64,  # type: ignore[arg-type]
+            description="The most megabytes of response bodies fetched ahead per "
+            "scroll cursor. A single larger page is still fetched.",
+        ),
+        th.Property(
+            "max_parallel_streams",
+            th.IntegerType,
+            required=False,
+            default=1,  # type: ignore[arg-type]
+            description="The number of selected streams synced at the same time.",
+        ),
     ).to_dict()
 
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the tap and the resources shared by its streams."""
+        super().__init__(*args, **kwargs)
+        #: The JSON backend pages are decoded and messages encoded with.
+        self.json_backend = get_json_backend(self.config.get("json_backend"))
+        #: The writer all streams send their Singer messages through.
+        self.message_writer = MessageWriter(self.json_backend.format_message)
+        #: The pooled HTTP transport all streams send their requests with.
+        self.http_transport = HTTPTransport(
+            pool_size=self.http_pool_size,
+            keep_alive=self.config.get("http_keep_alive", True),
+        )
+        #: The request pacing shared by all streams.
+        self.rate_limiter = RateLimiter(self.max_requests_per_second)
+        metrics_interval = self.config.get("metrics_interval")
+        #: The performance statistics of every stream.
+        self.sync_stats = SyncStats(
+            self.config.get("metrics_path"),
+            self.config.get("metrics_format") or "json",
+            parse_duration(metrics_interval).total_seconds()
+            if metrics_interval
+            else None,
+        )
+        #: The on-disk cache of the page number endpoints, if configured.
+        self.response_cache: Optional[ResponseCache] = None
+        if self.config.get("response_cache_dir"):
+            self.response_cache = ResponseCache(
+                self.config["response_cache_dir"],
+                parse_duration(self.config.get("response_cache_ttl") or "1h"),
+                int(self.config.get("response_cache_max_mb") or 256) * 1024 * 1024,
+            )
+        self._async_engine: Optional[AsyncEngine] = None
+        self._async_engine_lock = threading.Lock()
+
+    @classproperty
+    def cli(cls: Type[Tap]) -> Callable:
+        """Return the command line handler of the SDK, with a `--dry-run` option."""
+        command = Tap.__dict__["cli"].fget(cls)
+        command.params.append(
+            click.Option(
+                ["--dry-run"],
+                is_flag=True,
+                help="Estimate the records, requests and time a sync of the "
+                "selected streams would take, without syncing them.",
+            )
+        )
+        run = command.callback
+
+        def callback(dry_run: bool = False, **options: Any) -> None:
+            if (
+                options["version"]
+                or options["about"]
+                or options["discover"]
+                or options["test"]
+                in (CliTestOptionValue.All.value, CliTestOptionValue.Schema.value)
+            ):
+                run(**options)
+                return
+
+            cls.print_version(print_fn=cls.logger.info)
+            config_files: List[Union[PurePath, str]] = []
+            for config_path in options["config"]:
+                if config_path == "ENV":
+                    continue
+                if not Path(config_path).is_file():
+                    raise FileNotFoundError(
+                        f"Could not locate config file at '{config_path}'."
+                    )
+                config_files.append(Path(config_path))
+            tap = cast(
+                TapGainsightPX,
+                cls(  # type: ignore[abstract]
+                    config=config_files or None,
+                    state=options["state"],
+                    catalog=options["catalog"],
+                    parse_env_config="ENV" in options["config"],
+                ),
+            )
+            if dry_run:
+                click.echo(json.dumps(tap.estimate_all(), indent=2))
+            else:
+                tap.sync_all_streams()
+
+        command.callback = callback
+        return command
+
+    @classmethod
+    def _get_about_info(cls) -> Dict[str, Any]:
+        """Return the tap metadata, including the JSON backend `auto` selects."""
+        info = super()._get_about_info()
+        info["json_backend"] = get_json_backend("auto").name
+        return info
+
+    @classmethod
+    def print_about(cls, format: Optional[str] = None) -> None:
+        """Print the tap metadata, with the JSON backend in every format."""
+        super().print_about(format)
+        if format == "markdown":
+            print(f"## JSON Backend\n\n`{get_json_backend('auto').name}`\n")
+
+    @property
+    def async_engine(self) -> Optional[AsyncEngine]:
+        """Return the asyncio engine all streams share, if it is configured."""
+        if self.config.get("request_engine") != "asyncio":
+            return None
+        with self._async_engine_lock:
+            if self._async_engine is None:
+                self._async_engine = AsyncEngine(self.http_pool_size)
+            return self._async_engine
+
+    def close_async_engine(self) -> None:
+        """Stop the asyncio engine, if it was started."""
+        with self._async_engine_lock:
+            if self._async_engine is not None:
+                self._async_engine.close()
+                self._async_engine = None
+
+    @property
+    def http_pool_size(self) -> int:
+        """Return how many connections to keep open to the API."""
+        return max(int(self.config.get("http_pool_size") or 10), 1)
+
+    @property
+    def max_requests_per_second(self) -> Optional[float]:
+        """Return the configured request rate limit, if any."""
+        per_minute = self.config.get("max_requests_per_minute")
+        return per_minute / 60 if per_minute else None
+
+    @property
+    def max_parallel_streams(self) -> int:
+        """Return how many streams may be synced at the same time."""
+        return max(int(self.config.get("max_parallel_streams") or 1), 1)
+
     def discover_streams(self) -> List[Stream]:
         """Return a list of discovered streams."""
         return [stream_class(tap=self) for stream_class in STREAM_TYPES]
 
+    def sync_all_streams(self) -> None:
+        """Sync all streams, several at a time when `max_parallel_streams` is set."""
+        try:
+            if self.max_parallel_streams < 2:
+                self.sync_all()
+            else:
+                self._sync_all_parallel()
+        finally:
+            self.close_async_engine()
+            self.sync_stats.write()
+            self.logger.info(
+                f"HTTP connection reuse: {self.http_transport.connection_stats()}"
+            )
+
+    def estimate_all(self) -> Dict[str, Any]:
+        """Return the records, requests and time a sync would take, per stream."""
+        estimates = []
+        for stream in self.streams.values():
+            if not stream.selected:
+                continue
+            estimate = estimate_stream(cast(GainsightPXStream, stream))
+            self.logger.info(
+                f"'{stream.name}' would sync about {estimate.records} records in "
+                f"{estimate.requests} requests, taking {estimate.seconds:.0f}s."
+            )
+            estimates.append(estimate)
+        return summarize(
+            estimates, self.max_parallel_streams, self.max_requests_per_second
+        )
+
+    def _sync_all_parallel(self) -> None:
+        self._reset_state_progress_markers()
+        self._set_compatible_replication_methods()
+        streams = []
+        for stream in self.streams.values():
+            if not stream.selected and not stream.has_selected_descendents:
+                self.logger.info(f"Skipping deselected stream '{stream.name}'.")
+            elif not stream.parent_stream_type:
+                # Create every bookmark entry up front so streams running on other
+                # threads only ever change their own part of the state.
+                stream.stream_state
+                streams.append(stream)
+
+        with self.message_writer.isolated_state(self.state):
+            with ThreadPoolExecutor(
+                max_workers=self.max_parallel_streams,
+                thread_name_prefix="gainsightpx-stream",
+            ) as executor:
+                futures = [executor.submit(self._sync_stream, s) for s in streams]
+                done, pending = wait(futures, return_when=FIRST_EXCEPTION)
+                for future in pending:
+                    future.cancel()
+                for future in done:
+                    future.result()
+
+        for stream in self.streams.values():
+            stream.log_sync_costs()
+
+    @staticmethod
+    def _sync_stream(stream: Stream) -> None:
+        stream.sync()
+        stream.finalize_state_progress_markers()
+
 
 if __name__ == "__main__":
     TapGainsightPX.cli()
@@ -0,0 +1,20 @@
+"""Fixtures and helpers shared by the tests."""
+
+import json
+from pathlib import Path
+
+from tap_gainsightpx.tests.test_core import SAMPLE_CONFIG
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+#: The page view events endpoint, and a config whose range holds its fixtures.
+PAGE_VIEWS_URL = "https://api.example.com/v1/events/pageView"
+PAGE_VIEWS_CONFIG = {**SAMPLE_CONFIG, "end_date": "2022-11-01T00:00:00Z"}
+FIRST_PAGE = json.loads((FIXTURES / "page_view_events_page_1.json").read_text())
+SECOND_PAGE = json.loads((FIXTURES / "page_view_events_page_2.json").read_text())
+LAST_DATE = "2022-10-26T00:07:45Z"  # The date of the last record on FIRST_PAGE.
+
+
+def singer_messages(capsys):
+    """Return the Singer messages written to stdout since the last read."""
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
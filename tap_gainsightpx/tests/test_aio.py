@@ -0,0 +1,82 @@
+"""Tests for the asyncio request engine."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import backoff
+import pytest
+
+from tap_gainsightpx.tap import TapGainsightPX
+from tap_gainsightpx.tests.conftest import singer_messages
+from tap_gainsightpx.tests.test_core import SAMPLE_CONFIG
+
+pytest.importorskip("aiohttp")
+
+FEATURES = [{"id": f"feature-{i}", "name": f"Feature {i}"} for i in range(25)]
+
+
+class FeaturesHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    page_numbers = []
+
+    def do_GET(self):  # noqa: N802
+        query = parse_qs(urlparse(self.path).query)
+        page_number = int(query.get("pageNumber", ["0"])[0])
+        page_size = int(query["pageSize"][0])
+        self.page_numbers.append(page_number)
+        if page_number == 1 and self.page_numbers.count(1) == 1:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        start = page_number * page_size
+        body = json.dumps(
+            {
+                "features": FEATURES[start : start + page_size],  # noqa: E203
+                "isLastPage": start + page_size >= len(FEATURES),
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def api_url():
+    FeaturesHandler.page_numbers = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FeaturesHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_asyncio_engine_prefetches_numbered_pages(api_url, capsys):
+    config = {
+        **SAMPLE_CONFIG,
+        "api_url": api_url,
+        "page_size": 10,
+        "request_engine": "asyncio",
+        "max_concurrent_pages": 4,
+    }
+    tap = TapGainsightPX(config=config)
+    stream = tap.streams["features"]
+    stream.backoff_wait_generator = lambda: backoff.constant(0)
+    try:
+        stream.sync()
+    finally:
+        tap.close_async_engine()
+
+    messages = singer_messages(capsys)
+    records = [m["record"] for m in messages if m["type"] == "RECORD"]
+    assert records == FEATURES
+    # At most max_concurrent_pages - 1 pages past the last one are requested.
+    assert max(FeaturesHandler.page_numbers) <= 2 + 3
+    assert FeaturesHandler.page_numbers.count(1) == 2
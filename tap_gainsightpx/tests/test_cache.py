@@ -0,0 +1,83 @@
+"""Tests for the on-disk cache of the page number endpoints."""
+
+import json
+import os
+from datetime import timedelta
+
+from tap_gainsightpx.cache import CacheEntry, ResponseCache
+from tap_gainsightpx.tap import TapGainsightPX
+from tap_gainsightpx.tests.conftest import FIXTURES
+from tap_gainsightpx.tests.test_core import SAMPLE_CONFIG
+
+FEATURES_URL = "https://api.example.com/v1/feature"
+FIRST_PAGE = json.loads((FIXTURES / "features_page_1.json").read_text())
+SECOND_PAGE = json.loads((FIXTURES / "features_page_2.json").read_text())
+
+
+def sync_features(config):
+    tap = TapGainsightPX(config=config)
+    stream = tap.streams["features"]
+    records = list(stream.get_records(None))
+    return stream, records
+
+
+def test_repeat_runs_within_ttl_make_no_requests(requests_mock, tmp_path):
+    requests_mock.get(FEATURES_URL, [{"json": FIRST_PAGE}, {"json": SECOND_PAGE}])
+    config = {**SAMPLE_CONFIG, "response_cache_dir": str(tmp_path)}
+    _, records = sync_features(config)
+    assert requests_mock.call_count == 2
+
+    stream, cached = sync_features(config)
+    assert requests_mock.call_count == 2
+    assert cached == records
+    assert stream.cache_hits == 2
+    assert TapGainsightPX(config=config).streams["users"].response_cache is None
+
+
+def test_cached_pages_do_not_wait_for_the_rate_limit(requests_mock, tmp_path):
+    requests_mock.get(FEATURES_URL, [{"json": FIRST_PAGE}, {"json": SECOND_PAGE}])
+    config = {**SAMPLE_CONFIG, "response_cache_dir": str(tmp_path)}
+    sync_features(config)
+
+    tap = TapGainsightPX(config={**config, "max_requests_per_minute": 60})
+    waits = []
+    tap.rate_limiter._sleep = waits.append
+    tap.rate_limiter._tokens = 0
+    list(tap.streams["features"].get_records(None))
+
+    assert requests_mock.call_count == 2
+    assert waits == []
+
+
+def test_stale_pages_are_revalidated(requests_mock, tmp_path):
+    requests_mock.get(
+        FEATURES_URL,
+        [
+            {"json": FIRST_PAGE, "headers": {"ETag": '"page-1"'}},
+            {"json": SECOND_PAGE, "headers": {"Last-Modified": "Mon, 02 Jan 2023"}},
+            {"status_code": 304},
+            {"status_code": 304},
+        ],
+    )
+    config = {**SAMPLE_CONFIG, "response_cache_dir": str(tmp_path)}
+    _, records = sync_features(config)
+    tap = TapGainsightPX(config=config)
+    tap.response_cache.ttl = timedelta(0)
+    stream = tap.streams["features"]
+
+    assert list(stream.get_records(None)) == records
+    first, second = requests_mock.request_history[2:]
+    assert first.headers["If-None-Match"] == '"page-1"'
+    assert second.headers["If-Modified-Since"] == "Mon, 02 Jan 2023"
+    assert stream.cache_revalidations == 2
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = ResponseCache(str(tmp_path), timedelta(hours=1), max_bytes=3500)
+    for key in ("a", "b", "c"):
+        cache._write(key, CacheEntry(b"x" * 1000, {}, 0))
+        os.utime(cache.path(key), (0, {"a": 1, "b": 2, "c": 3}[key]))
+    cache.get("a")
+    cache._write("d", CacheEntry(b"x" * 1000, {}, 0))
+
+    assert sorted(p.stem for p in tmp_path.iterdir()) == ["a", "c", "d"]
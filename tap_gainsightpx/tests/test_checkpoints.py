@@ -0,0 +1,107 @@
+"""Tests for STATE checkpoints written while a stream syncs."""
+
+import itertools
+import time
+from urllib.parse import parse_qs, urlparse
+
+import backoff
+import pytest
+from singer_sdk.exceptions import FatalAPIError
+
+from tap_gainsightpx.tap import TapGainsightPX
+from tap_gainsightpx.tests.conftest import (
+    FIRST_PAGE,
+    LAST_DATE,
+    PAGE_VIEWS_CONFIG,
+    PAGE_VIEWS_URL,
+    singer_messages,
+)
+
+CHECKPOINT_CONFIG = {**PAGE_VIEWS_CONFIG, "checkpoint_interval": "1m"}
+
+
+def interrupted_sync(requests_mock, monkeypatch, capsys, config):
+    """Sync the first page of page views, then fail on the second."""
+    requests_mock.get(
+        PAGE_VIEWS_URL,
+        [{"json": FIRST_PAGE}, {"status_code": 400, "json": {}}],
+    )
+    # Every clock reading is a minute after the previous one.
+    clock = itertools.count(start=time.monotonic(), step=60)
+    monkeypatch.setattr(time, "monotonic", lambda: next(clock))
+    stream = TapGainsightPX(config=config).streams["page_view_events"]
+    stream.backoff_wait_generator = lambda: backoff.constant(0)
+    with pytest.raises(FatalAPIError):
+        stream.sync()
+    monkeypatch.undo()
+    return singer_messages(capsys)
+
+
+def test_no_checkpoints_by_default(requests_mock, monkeypatch, capsys):
+    messages = interrupted_sync(requests_mock, monkeypatch, capsys, PAGE_VIEWS_CONFIG)
+
+    records = [m["record"] for m in messages if m["type"] == "RECORD"]
+    checkpoint = [m for m in messages if m["type"] == "STATE"][-1]["value"]
+    bookmark = checkpoint["bookmarks"]["page_view_events"]
+    assert bookmark["replication_key_value"] != records[-1]["date"]
+
+
+def test_checkpoints_track_last_emitted_record(requests_mock, monkeypatch, capsys):
+    messages = interrupted_sync(requests_mock, monkeypatch, capsys, CHECKPOINT_CONFIG)
+
+    records = [m["record"] for m in messages if m["type"] == "RECORD"]
+    checkpoint = [m for m in messages if m["type"] == "STATE"][-1]["value"]
+    bookmark = checkpoint["bookmarks"]["page_view_events"]
+    assert len(records) == 100
+    assert bookmark["replication_key"] == "date"
+    assert bookmark["replication_key_value"] == records[-1]["date"]
+    assert bookmark["record_count"] == 100
+
+
+def test_interrupted_sync_resumes_from_checkpoint(requests_mock, monkeypatch, capsys):
+    messages = interrupted_sync(requests_mock, monkeypatch, capsys, CHECKPOINT_CONFIG)
+    checkpoint = [m for m in messages if m["type"] == "STATE"][-1]["value"]
+
+    requests_mock.get(PAGE_VIEWS_URL, json={"results": [], "totalHits": 0})
+    TapGainsightPX(config=PAGE_VIEWS_CONFIG, state=checkpoint).streams[
+        "page_view_events"
+    ].sync()
+    final_state = [m for m in singer_messages(capsys) if m["type"] == "STATE"][-1]
+
+    query = parse_qs(urlparse(requests_mock.last_request.url).query)
+    assert query["filter"][0].startswith(f"date>={LAST_DATE};")
+    assert "record_count" not in final_state["value"]["bookmarks"]["page_view_events"]
+
+
+def test_partition_checkpoints_resume_their_window(requests_mock, monkeypatch, capsys):
+    config = {**CHECKPOINT_CONFIG, "partition_window": "1d"}
+    messages = interrupted_sync(requests_mock, monkeypatch, capsys, config)
+    checkpoint = [m for m in messages if m["type"] == "STATE"][-1]["value"]
+    partitions = checkpoint["bookmarks"]["page_view_events"]["partitions"]
+    assert partitions[0]["context"]["window_start"] == "2022-01-01T00:00:00Z"
+
+    stream = TapGainsightPX(config=config, state=checkpoint).streams["page_view_events"]
+    date_filter = stream.get_date_filter(partitions[0]["context"])
+    assert date_filter.startswith(f"date>={LAST_DATE};")
+
+
+def test_lookback_never_moves_bookmark_back(requests_mock):
+    bookmark = FIRST_PAGE["results"][50]["date"]
+    state = {
+        "bookmarks": {
+            "page_view_events": {
+                "replication_key": "date",
+                "replication_key_value": bookmark,
+            }
+        }
+    }
+    requests_mock.get(PAGE_VIEWS_URL, json=FIRST_PAGE)
+    tap = TapGainsightPX(
+        config={**PAGE_VIEWS_CONFIG, "lookback_window": "1h"}, state=state
+    )
+    stream = tap.streams["page_view_events"]
+    stream.sync()
+
+    assert stream.stream_state["replication_key_value"] == (
+        FIRST_PAGE["results"][-1]["date"]
+    )
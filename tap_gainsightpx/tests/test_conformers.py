@@ -0,0 +1,138 @@
+"""Tests comparing the compiled record conformer with the SDK conformance."""
+
+import copy
+import datetime
+import json
+import logging
+
+import pytest
+from singer_sdk.helpers._catalog import pop_deselected_record_properties
+from singer_sdk.helpers._typing import conform_record_data_types
+
+from tap_gainsightpx.conformers import RecordConformer
+from tap_gainsightpx.pages import get_records_key
+from tap_gainsightpx.tap import TapGainsightPX
+from tap_gainsightpx.tests.conftest import FIXTURES
+from tap_gainsightpx.tests.test_core import SAMPLE_CONFIG
+
+LOGGER = logging.getLogger("test_conformers")
+STREAMS = TapGainsightPX(config=SAMPLE_CONFIG).streams
+
+#: Values tried for every property of every stream.
+VALUES = [
+    None,
+    "text",
+    "",
+    0,
+    1,
+    -3,
+    2.5,
+    True,
+    False,
+    [],
+    ["a"],
+    {},
+    {"nested": {"key": 1}},
+    b"\x00",
+    b"\x01",
+    datetime.datetime(2022, 1, 1, 12, tzinfo=datetime.timezone.utc),
+    datetime.date(2022, 1, 1),
+    datetime.time(12, 30),
+    datetime.timedelta(hours=1),
+]
+
+
+def assert_same(stream, record):
+    expected = conform_record_data_types(
+        stream.name, copy.deepcopy(record), stream.schema, LOGGER
+    )
+    conformer = RecordConformer(stream.name, stream.schema, LOGGER)
+    actual = conformer.conform(copy.deepcopy(record))
+    assert actual == expected
+    assert list(actual) == list(expected)
+    assert [type(v) for v in actual.values()] == [type(v) for v in expected.values()]
+
+
+@pytest.mark.parametrize("stream_name", sorted(STREAMS))
+def test_every_property_matches_sdk(stream_name):
+    stream = STREAMS[stream_name]
+    for value in VALUES:
+        record = {name: value for name in stream.schema["properties"]}
+        record["notInSchema"] = value
+        assert_same(stream, record)
+
+
+@pytest.mark.parametrize(
+    "stream_name", ["page_view_events", "custom_events", "features"]
+)
+def test_fixture_records_match_sdk(stream_name):
+    stream = STREAMS[stream_name]
+    records_key = get_records_key(stream.records_jsonpath)
+    for path in sorted(FIXTURES.glob(f"{stream_name}_page_*.json")):
+        for record in json.loads(path.read_text())[records_key]:
+            assert_same(stream, record)
+
+
+def test_unknown_keys_are_dropped():
+    stream = STREAMS["features"]
+    conformer = RecordConformer(stream.name, stream.schema, LOGGER)
+    assert conformer.conform({"id": "1", "extra": 2}) == {"id": "1"}
+
+
+def test_stream_rebuilds_conformer_for_new_schema():
+    stream = TapGainsightPX(config=SAMPLE_CONFIG).streams["features"]
+    conformer = stream.record_conformer
+    assert stream.record_conformer is conformer
+    stream.schema = copy.deepcopy(stream.schema)
+    assert stream.record_conformer is not conformer
+
+
+HEAVY = ["globalContext", "queryParams", "inferredLocation"]
+
+
+def tap_deselecting(config, stream_name, names):
+    catalog = TapGainsightPX(config=config).catalog_dict
+    for entry in catalog["streams"]:
+        if entry["tap_stream_id"] != stream_name:
+            continue
+        for metadata in entry["metadata"]:
+            if metadata["breadcrumb"][1:] and metadata["breadcrumb"][1] in names:
+                metadata["metadata"]["selected"] = False
+    return TapGainsightPX(config=config, catalog=catalog)
+
+
+def test_deselected_properties_match_sdk():
+    stream = tap_deselecting(SAMPLE_CONFIG, "page_view_events", HEAVY).streams[
+        "page_view_events"
+    ]
+    conformer = stream.record_conformer
+    assert conformer.deselected == set(HEAVY) & set(stream.schema["properties"])
+    assert not conformer.has_nested_deselection
+
+    record = {name: {"a": 1} for name in stream.schema["properties"]}
+    expected = copy.deepcopy(record)
+    pop_deselected_record_properties(expected, stream.schema, stream.mask, LOGGER)
+    expected = conform_record_data_types(stream.name, expected, stream.schema, LOGGER)
+    assert conformer.conform(record) == expected
+    assert conformer.project(record) == expected
+
+
+@pytest.mark.parametrize("streaming_parse", [False, True])
+def test_deselected_properties_dropped_at_extraction(requests_mock, streaming_parse):
+    requests_mock.get(
+        "https://api.example.com/v1/events/pageView",
+        [
+            {"content": (FIXTURES / f"page_view_events_page_{n}.json").read_bytes()}
+            for n in (1, 2)
+        ],
+    )
+    config = {**SAMPLE_CONFIG, "streaming_parse": streaming_parse}
+    stream = tap_deselecting(config, "page_view_events", HEAVY).streams[
+        "page_view_events"
+    ]
+
+    records = list(stream.get_records(None))
+
+    assert len(records) == 200
+    assert all(not set(HEAVY) & set(record) for record in records)
+    assert all("eventId" in record for record in records)
@@ -0,0 +1,121 @@
+"""Tests for de-duplicating event records."""
+
+from datetime import timedelta
+
+from tap_gainsightpx.dedup import RecordDeduplicator
+from tap_gainsightpx.tap import TapGainsightPX
+from tap_gainsightpx.tests.conftest import (
+    FIRST_PAGE,
+    PAGE_VIEWS_CONFIG,
+    PAGE_VIEWS_URL,
+    SECOND_PAGE,
+    singer_messages,
+)
+from tap_gainsightpx.tests.test_core import SAMPLE_CONFIG
+
+MINUTE = 60 * 1000
+
+
+def event(event_id, date):
+    return {"eventId": event_id, "date": date}
+
+
+def test_deduplicator_drops_repeated_keys():
+    dedup = RecordDeduplicator(["eventId"], "date", timedelta(hours=1), 100)
+    records = [event("a", 0), event("b", MINUTE), event("a", 0), event("b", MINUTE)]
+
+    assert list(dedup.filter(records)) == records[:2]
+    assert dedup.suppressed == 2
+
+
+def test_deduplicator_forgets_keys_outside_window():
+    dedup = RecordDeduplicator(["eventId"], "date", timedelta(hours=1), 100)
+
+    assert not dedup.is_duplicate(event("a", 0))
+    assert not dedup.is_duplicate(event("b", 2 * 60 * MINUTE))
+    assert len(dedup) == 1
+    # Too old for the window, so it cannot be recognised.
+    assert not dedup.is_duplicate(event("a", 0))
+
+
+def test_deduplicator_keeps_within_key_budget():
+    dedup = RecordDeduplicator(["eventId"], "date", timedelta(hours=1), 10)
+    for i in range(50):
+        dedup.is_duplicate(event(str(i), i * MINUTE))
+        assert len(dedup) <= 10
+
+    assert dedup.is_duplicate(event("49", 49 * MINUTE))
+
+
+def test_deduplicator_handles_records_out_of_date_order():
+    dedup = RecordDeduplicator(["eventId"], "date", timedelta(hours=1), 100)
+    for minute in (30, 10, 20):
+        dedup.is_duplicate(event(str(minute), minute * MINUTE))
+
+    assert all(dedup.is_duplicate(event(str(m), m * MINUTE)) for m in (10, 20, 30))
+
+
+def test_deduplicator_saves_keys_within_window(tmp_path):
+    path = str(tmp_path / "keys.dedup")
+    dedup = RecordDeduplicator(["eventId"], "date", timedelta(hours=1), 100)
+    for minute in (0, 30, 50, 60):
+        dedup.is_duplicate(event(str(minute), minute * MINUTE))
+    dedup.save(path, timedelta(minutes=15))
+
+    loaded = RecordDeduplicator(["eventId"], "date", timedelta(hours=2), 100)
+    loaded.load(path)
+    assert len(loaded) == 2
+    assert loaded.is_duplicate(event("50", 50 * MINUTE))
+    assert not loaded.is_duplicate(event("30", 30 * MINUTE))
+
+
+def test_sync_suppresses_duplicate_events(requests_mock, capsys):
+    duplicates = FIRST_PAGE["results"][-5:]
+    second_page = {**SECOND_PAGE, "results": duplicates + SECOND_PAGE["results"]}
+    requests_mock.get(PAGE_VIEWS_URL, [{"json": FIRST_PAGE}, {"json": second_page}])
+    config = {**PAGE_VIEWS_CONFIG, "deduplicate_events": True}
+    stream = TapGainsightPX(config=config).streams["page_view_events"]
+
+    ids = [r["eventId"] for r in stream.get_records(None)]
+    stream.log_sync_costs()
+
+    assert len(ids) == len(set(ids)) == 200
+    assert stream.deduplicator.suppressed == 5
+    logs = capsys.readouterr().err
+    assert "Suppressed 5 duplicate records of 'page_view_events'" in logs
+
+
+def test_deduplication_is_off_by_default():
+    streams = TapGainsightPX(config=SAMPLE_CONFIG).streams
+
+    assert all(stream.deduplicator is None for stream in streams.values())
+    config = {**SAMPLE_CONFIG, "deduplicate_events": True}
+    streams = TapGainsightPX(config=config).streams
+    assert streams["page_view_events"].deduplicator is not None
+    assert streams["accounts"].deduplicator is None
+
+
+def test_lookback_overlap_dropped_by_next_sync(requests_mock, capsys, tmp_path):
+    config = {
+        **PAGE_VIEWS_CONFIG,
+        "deduplicate_events": True,
+        "lookback_window": "1h",
+        "snapshot_dir": str(tmp_path),
+    }
+    requests_mock.get(PAGE_VIEWS_URL, [{"json": FIRST_PAGE}, {"json": SECOND_PAGE}])
+    tap = TapGainsightPX(config=config)
+    tap.streams["page_view_events"].sync()
+    messages = singer_messages(capsys)
+    state = [m for m in messages if m["type"] == "STATE"][-1]["value"]
+
+    overlap = SECOND_PAGE["results"][-5:]
+    new_event = {**overlap[-1], "eventId": "late-event"}
+    requests_mock.get(
+        PAGE_VIEWS_URL, json={"results": overlap + [new_event], "totalHits": 6}
+    )
+    stream = TapGainsightPX(config=config, state=state).streams["page_view_events"]
+    stream.sync()
+    records = [m["record"] for m in singer_messages(capsys) if m["type"] == "RECORD"]
+
+    assert [r["eventId"] for r in records] == ["late-event"]
+    assert stream.deduplicator.suppressed == 5
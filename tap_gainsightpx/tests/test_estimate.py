@@ -0,0 +1,65 @@
+"""Tests for estimating a sync without running it."""
+
+import json
+
+import pytest
+
+from tap_gainsightpx.estimate import StreamEstimate
+from tap_gainsightpx.mock_server import MockGainsightPX
+from tap_gainsightpx.tap import TapGainsightPX
+
+START_DATE = "2022-10-26T00:00:00Z"
+END_DATE = "2022-10-27T00:00:00Z"
+
+
+def make_config(server, **config):
+    return {
+        "api_url": server.url,
+        "api_key": "mock",
+        "start_date": START_DATE,
+        "end_date": END_DATE,
+        **config,
+    }
+
+
+def test_stream_estimate_timed_by_probe_latency():
+    estimate = StreamEstimate("users", 100, max_requests_per_second=None)
+    estimate.add_window(250)
+    estimate.add_window(0)
+    estimate.add_probe(0.2)
+    estimate.add_probe(0.4)
+
+    assert estimate.requests == 4
+    assert estimate.seconds == pytest.approx(1.2)
+    estimate.max_requests_per_second = 1
+    assert estimate.seconds == 4
+
+
+@pytest.mark.parametrize("entities", [0, 10, 537])
+def test_estimates_match_endpoint_record_counts(entities):
+    with MockGainsightPX(START_DATE, END_DATE, 1234, entity_count=entities) as server:
+        tap = TapGainsightPX(config=make_config(server, partition_window="6h"))
+        estimates = tap.estimate_all()
+
+    for estimate in estimates["streams"]:
+        stream = tap.streams[estimate["stream"]]
+        assert estimate["records"] == server.endpoints[stream.path].count
+    page_views = next(
+        e for e in estimates["streams"] if e["stream"] == "page_view_events"
+    )
+    assert page_views["windows"] == 4
+    assert page_views["requests"] == 4
+
+
+def test_dry_run_option_prints_estimates_without_records(tmp_path, capsys):
+    with MockGainsightPX(START_DATE, END_DATE, 1234, entity_count=30) as server:
+        config_path = tmp_path / "config.json"
+        config_path.write_text(json.dumps(make_config(server)))
+        TapGainsightPX.cli.main(
+            ["--config", str(config_path), "--dry-run"], standalone_mode=False
+        )
+
+    output = capsys.readouterr().out
+    estimates = json.loads(output)
+    assert estimates["total"]["records"] == 11 * 1234 + 5 * 30
+    assert '"RECORD"' not in output
@@ -0,0 +1,60 @@
+"""Tests for incremental syncs of the accounts and users streams."""
+
+from urllib.parse import parse_qs, urlparse
+
+from tap_gainsightpx.tap import TapGainsightPX
+from tap_gainsightpx.tests.test_core import SAMPLE_CONFIG
+
+BOOKMARK = 1641031200000  # 2022-01-01T10:00:00Z
+
+
+def modified_state(*stream_names):
+    return {
+        "bookmarks": {
+            name: {
+                "replication_key": "lastModifiedDate",
+                "replication_key_value": BOOKMARK,
+            }
+            for name in stream_names
+        }
+    }
+
+
+def sync_query(requests_mock, stream_name, url, **tap_kwargs):
+    requests_mock.get(url, json={stream_name: []})
+    tap = TapGainsightPX(**tap_kwargs)
+    tap.streams[stream_name].sync()
+    return parse_qs(urlparse(requests_mock.last_request.url).query)
+
+
+def test_bookmark_filters_modified_records(requests_mock):
+    state = modified_state("accounts", "users")
+    for stream_name, path in (("accounts", "accounts"), ("users", "users")):
+        query = sync_query(
+            requests_mock,
+            stream_name,
+            f"https://api.example.com/v1/{path}",
+            config=SAMPLE_CONFIG,
+            state=state,
+        )
+        assert query["filter"] == ["lastModifiedDate>=2022-01-01T10:00:00Z"]
+        assert query["sort"] == ["lastModifiedDate"]
+
+
+def test_first_sync_and_full_snapshot_request_everything(requests_mock):
+    query = sync_query(
+        requests_mock,
+        "users",
+        "https://api.example.com/v1/users",
+        config=SAMPLE_CONFIG,
+    )
+    assert "filter" not in query
+
+    query = sync_query(
+        requests_mock,
+        "accounts",
+        "https://api.example.com/v1/accounts",
+        config={**SAMPLE_CONFIG, "full_snapshot": True},
+        state=modified_state("accounts"),
+    )
+    assert "filter" not in query
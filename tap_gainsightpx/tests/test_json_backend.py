@@ -0,0 +1,85 @@
+"""Tests for the pluggable JSON backends."""
+
+import datetime
+import decimal
+import json
+
+import pytest
+from singer_sdk._singerlib import RecordMessage, SchemaMessage, StateMessage
+
+from tap_gainsightpx.json_backend import (
+    BACKENDS,
+    STDLIB,
+    get_json_backend,
+    message_to_dict,
+)
+from tap_gainsightpx.tap import TapGainsightPX
+from tap_gainsightpx.tests.test_core import SAMPLE_CONFIG
+
+INSTALLED = [backend for backend in BACKENDS.values() if backend is not None]
+
+
+def test_auto_prefers_orjson():
+    expected = BACKENDS["orjson"] or STDLIB
+    assert get_json_backend("auto") is expected
+    assert get_json_backend(None) is expected
+    assert get_json_backend("json") is STDLIB
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        get_json_backend("simplejson")
+
+
+@pytest.mark.parametrize("backend", INSTALLED, ids=lambda backend: backend.name)
+def test_messages_match_stdlib(backend):
+    messages = [
+        RecordMessage(
+            stream="features",
+            record={"id": "a", "score": decimal.Decimal("1.5"), "tags": ["x"]},
+            time_extracted=datetime.datetime(2022, 1, 1, tzinfo=datetime.timezone.utc),
+        ),
+        StateMessage(value={"bookmarks": {"features": {"replication_key": "id"}}}),
+    ]
+    for message in messages:
+        assert json.loads(backend.format_message(message)) == json.loads(
+            STDLIB.format_message(message)
+        )
+
+
+def test_message_to_dict_matches_sdk():
+    messages = [
+        RecordMessage(stream="features", record={"id": "a", "name": None}),
+        SchemaMessage(stream="features", schema={"type": "object"}),
+        StateMessage(value={"bookmarks": {}}),
+    ]
+    for message in messages:
+        assert list(message_to_dict(message).items()) == list(message.to_dict().items())
+
+
+@pytest.mark.parametrize("backend", INSTALLED, ids=lambda backend: backend.name)
+def test_loads_bytes(backend):
+    assert backend.loads(b'{"scrollId": "abc", "totalHits": 2}') == {
+        "scrollId": "abc",
+        "totalHits": 2,
+    }
+
+
+def test_tap_uses_configured_backend():
+    tap = TapGainsightPX(config={**SAMPLE_CONFIG, "json_backend": "json"})
+    assert tap.json_backend is STDLIB
+
+
+@pytest.mark.parametrize(
+    "about_format,line",
+    [
+        (None, "Json_Backend: {}"),
+        ("json", '  "json_backend": "{}"'),
+        ("markdown", "`{}`"),
+    ],
+)
+def test_about_reports_backend(capsys, about_format, line):
+    TapGainsightPX.print_about(about_format)
+
+    output = capsys.readouterr().out.splitlines()
+    assert line.format(get_json_backend("auto").name) in output
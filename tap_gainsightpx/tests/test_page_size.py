@@ -0,0 +1,62 @@
+"""Tests for per-endpoint and adaptive page sizes."""
+
+from urllib.parse import parse_qs, urlparse
+
+import backoff
+
+from tap_gainsightpx.page_size import PageSizeController
+from tap_gainsightpx.tap import TapGainsightPX
+from tap_gainsightpx.tests.test_core import SAMPLE_CONFIG
+
+
+def test_controller_grows_and_shrinks_within_limits():
+    controller = PageSizeController(500, 10, 1000, target_seconds=2.0)
+
+    assert controller.record_response(0.1, 1000) == 600
+    assert controller.record_response(1.5, 1000) is None
+    assert controller.record_response(3.0, 1000) == 300
+    assert controller.record_response(0.1, 50 * 1024 * 1024) == 150
+    assert controller.record_error() == 75
+    for _ in range(20):
+        controller.record_response(0.1, 1000)
+    assert controller.size == 1000
+    for _ in range(20):
+        controller.record_error()
+    assert controller.size == 10
+
+
+def test_page_size_is_clamped_to_endpoint_maximum():
+    tap = TapGainsightPX(config={**SAMPLE_CONFIG, "page_size": 500})
+
+    assert tap.streams["accounts"].get_url_params(None, None)["pageSize"] == 100
+    assert tap.streams["features"].get_url_params(None, None)["pageSize"] == 200
+    assert tap.streams["page_view_events"].get_url_params(None, None)["pageSize"] == 500
+
+    config = {**SAMPLE_CONFIG, "page_size": 500, "adaptive_page_size": True}
+    controller = TapGainsightPX(config=config).streams["users"].page_size_controller
+    assert controller.record_response(0.1, 1000) is None
+    assert controller.size == 500
+
+
+def test_adaptive_page_size_grows_and_shrinks_on_retry(requests_mock):
+    def page(scroll_id):
+        records = [{"eventId": scroll_id, "date": 1640995200000}]
+        return {
+            "json": {"identifyEvents": records, "scrollId": scroll_id, "totalHits": 3}
+        }
+
+    requests_mock.get(
+        "https://api.example.com/v1/events/identify",
+        [page("1"), {"status_code": 503}, page("2"), page("3")],
+    )
+    config = {**SAMPLE_CONFIG, "page_size": 100, "adaptive_page_size": True}
+    stream = TapGainsightPX(config=config).streams["identify_events"]
+    stream.backoff_wait_generator = lambda: backoff.constant(0)
+    stream.sync()
+
+    page_sizes = [
+        parse_qs(urlparse(request.url).query)["pageSize"][0]
+        for request in requests_mock.request_history
+    ]
+    assert page_sizes == ["100", "150", "75", "125"]
+    assert stream.page_size_controller.size == 175
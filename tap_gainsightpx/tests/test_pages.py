@@ -0,0 +1,74 @@
+"""Tests for decoded page sharing between paginators and record extraction."""
+
+import json
+
+import requests
+
+from tap_gainsightpx.json_backend import JSONBackend
+from tap_gainsightpx.pages import GainsightPage, get_records_key
+from tap_gainsightpx.paginators import (
+    GainsightBasePageNumberPaginator,
+    GainsightJSONPathPaginator,
+)
+from tap_gainsightpx.tap import TapGainsightPX
+from tap_gainsightpx.tests.conftest import FIXTURES
+from tap_gainsightpx.tests.test_core import SAMPLE_CONFIG
+
+
+def fixture_response(name: str) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response._content = (FIXTURES / name).read_bytes()
+    return response
+
+
+def count_decodes(tap):
+    calls = []
+    backend = tap.json_backend
+
+    def counting_loads(content):
+        calls.append(content)
+        return backend.loads(content)
+
+    tap.json_backend = JSONBackend("counting", counting_loads, backend.format_message)
+    return calls
+
+
+def test_records_key():
+    assert get_records_key("$.results[*]") == "results"
+    assert get_records_key("$.customEvents[*]") == "customEvents"
+    assert get_records_key("$.results[*].id") is None
+
+
+def test_scroll_page_decoded_once():
+    tap = TapGainsightPX(config=SAMPLE_CONFIG)
+    calls = count_decodes(tap)
+    stream = tap.streams["page_view_events"]
+    response = fixture_response("page_view_events_page_1.json")
+
+    records = list(stream.parse_response(response))
+    paginator = stream.get_new_paginator()
+    paginator.advance(response)
+
+    assert len(records) == 100
+    assert isinstance(paginator, GainsightJSONPathPaginator)
+    assert paginator.current_value == json.loads(response.content)["scrollId"]
+    assert not paginator.finished
+    assert len(calls) == 1
+
+
+def test_page_number_page_decoded_once():
+    tap = TapGainsightPX(config=SAMPLE_CONFIG)
+    calls = count_decodes(tap)
+    stream = tap.streams["features"]
+    response = fixture_response("features_page_2.json")
+
+    records = list(stream.parse_response(response))
+    paginator = stream.get_new_paginator()
+    paginator.advance(response)
+
+    assert len(records) == 20
+    assert isinstance(paginator, GainsightBasePageNumberPaginator)
+    assert paginator.finished
+    assert len(calls) == 1
+    assert GainsightPage.from_response(response) is response._gainsight_page
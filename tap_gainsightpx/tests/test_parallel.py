@@ -0,0 +1,175 @@
+"""Tests for background page fetching and concurrent scroll cursors."""
+
+import threading
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from requests_mock import ANY
+from singer_sdk.exceptions import FatalAPIError
+
+from tap_gainsightpx.parallel import PageQueue, WindowPrefetcher
+from tap_gainsightpx.tap import TapGainsightPX
+from tap_gainsightpx.tests.conftest import singer_messages
+from tap_gainsightpx.tests.test_core import SAMPLE_CONFIG, json_resp
+from tap_gainsightpx.windows import parse_datetime
+
+PARALLEL_CONFIG = {
+    **SAMPLE_CONFIG,
+    "end_date": "2022-01-02T00:00:00Z",
+    "page_size": 2,
+}
+DAY_START = 1640995200000  # 2022-01-01T00:00:00Z
+EVENTS = [
+    {"eventId": f"event-{hour}", "date": DAY_START + hour * 3600000}
+    for hour in range(24)
+]
+
+
+def to_millis(value):
+    return int(parse_datetime(value).timestamp() * 1000)
+
+
+def page_view_events(request, context):
+    """Serve the hourly events matching the filter, two per scroll page."""
+    query = parse_qs(urlparse(request.url).query)
+    lower, upper = query["filter"][0].split(";")
+    start = to_millis(lower.split(">=")[1])
+    if "<=" in upper:
+        matches = [e for e in EVENTS if start <= e["date"] <= to_millis(upper[6:])]
+    else:
+        matches = [e for e in EVENTS if start <= e["date"] < to_millis(upper[5:])]
+    offset = int(query.get("scrollId", ["0"])[0])
+    page_end = offset + int(query["pageSize"][0])
+    return {
+        "results": matches[offset:page_end],
+        "scrollId": str(page_end),
+        "totalHits": len(matches),
+    }
+
+
+def sync_messages(config, capsys):
+    tap = TapGainsightPX(config=config)
+    tap.streams["page_view_events"].sync()
+    return singer_messages(capsys)
+
+
+def test_parallel_scrolls_match_serial_sync(requests_mock, capsys):
+    requests_mock.get(
+        "https://api.example.com/v1/events/pageView", json=page_view_events
+    )
+    serial = sync_messages({**PARALLEL_CONFIG, "partition_window": "6h"}, capsys)
+    parallel = sync_messages(
+        {**PARALLEL_CONFIG, "partition_window": "6h", "max_parallel_scrolls": 3},
+        capsys,
+    )
+
+    def records(messages):
+        return [m["record"] for m in messages if m["type"] == "RECORD"]
+
+    def states(messages):
+        return [m["value"] for m in messages if m["type"] == "STATE"]
+
+    assert records(parallel) == records(serial)
+    assert [r["eventId"] for r in records(parallel)] == [e["eventId"] for e in EVENTS]
+    assert states(parallel) == states(serial)
+
+
+def test_parallel_scrolls_split_range_without_partition_window():
+    tap = TapGainsightPX(config={**PARALLEL_CONFIG, "max_parallel_scrolls": 4})
+    partitions = tap.streams["custom_events"].partitions
+
+    assert len(partitions) == 4
+    assert partitions[1] == {
+        "window_start": "2022-01-01T06:00:00Z",
+        "window_end": "2022-01-01T12:00:00Z",
+    }
+
+
+def test_window_failure_stops_workers(requests_mock, capsys):
+    requests_mock.get("https://api.example.com/v1/events/pageView", status_code=403)
+    config = {**PARALLEL_CONFIG, "partition_window": "1h", "max_parallel_scrolls": 4}
+
+    with pytest.raises(FatalAPIError):
+        sync_messages(config, capsys)
+
+    assert not [
+        thread
+        for thread in threading.enumerate()
+        if thread.name.startswith("gainsightpx-window")
+    ]
+
+
+def test_parallel_streams_write_whole_lines(requests_mock, capsys):
+    def any_endpoint(request, context):
+        body = json_resp()
+        records = [{"eventId": f"event-{i}", "date": DAY_START + i} for i in range(50)]
+        if request.path.endswith("/events/pageview"):
+            body.update(results=records, totalHits=len(records))
+        elif request.path.endswith("/events/custom"):
+            body.update(customEvents=records, totalHits=len(records))
+        return body
+
+    requests_mock.get(ANY, json=any_endpoint)
+    tap = TapGainsightPX(config={**SAMPLE_CONFIG, "max_parallel_streams": 4})
+    tap.sync_all_streams()
+
+    messages = singer_messages(capsys)
+    streams = {m["stream"] for m in messages if m["type"] == "SCHEMA"}
+    assert streams == set(tap.streams)
+    for stream_name in ("page_view_events", "custom_events"):
+        assert sum(m.get("stream") == stream_name for m in messages) == 51
+    final_bookmarks = [m for m in messages if m["type"] == "STATE"][-1]["value"][
+        "bookmarks"
+    ]
+    assert set(final_bookmarks) == set(tap.streams)
+    for stream_name in ("page_view_events", "custom_events"):
+        assert final_bookmarks[stream_name]["replication_key_value"] == DAY_START + 49
+
+
+def test_page_queue_bounds_pages_and_bytes():
+    stopped = threading.Event()
+    pages = PageQueue(max_pages=3, max_bytes=100)
+    assert pages.put("large", 150, stopped)
+    stopped.set()
+    assert not pages.put("small", 10, stopped)
+    assert pages.get() == "large"
+
+    stopped.clear()
+    assert pages.put("a", 40, stopped) and pages.put("b", 40, stopped)
+    stopped.set()
+    assert not pages.put("c", 40, stopped)
+
+
+def test_closing_prefetcher_starts_no_new_windows():
+    started = []
+
+    def fetch_pages(context):
+        started.append(context["window"])
+        yield from range(10)
+
+    contexts = [{"window": window} for window in range(20)]
+    prefetcher = WindowPrefetcher(fetch_pages, contexts, max_workers=2)
+    assert next(prefetcher.pages(contexts[0])) == 0
+    prefetcher.close()
+
+    assert len(started) <= 2
+
+
+def test_prefetch_matches_serial_sync(requests_mock, capsys):
+    requests_mock.get(
+        "https://api.example.com/v1/events/pageView", json=page_view_events
+    )
+
+    def records(messages):
+        return [m["record"] for m in messages if m["type"] == "RECORD"]
+
+    serial = sync_messages(PARALLEL_CONFIG, capsys)
+    tap = TapGainsightPX(config={**PARALLEL_CONFIG, "prefetch_pages": 3})
+    tap.streams["page_view_events"].sync()
+    prefetched = singer_messages(capsys)
+    assert records(prefetched) == records(serial)
+
+    # A second sync starts a new prefetcher from the stored bookmark.
+    tap.streams["page_view_events"].sync()
+    resumed = singer_messages(capsys)
+    assert records(resumed) == [EVENTS[-1]]
@@ -0,0 +1,63 @@
+"""Tests for the shared request rate limiter."""
+
+
+import backoff
+
+from tap_gainsightpx.ratelimit import RateLimiter
+from tap_gainsightpx.tap import TapGainsightPX
+from tap_gainsightpx.tests.conftest import singer_messages
+from tap_gainsightpx.tests.test_core import SAMPLE_CONFIG
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_token_bucket_paces_requests():
+    clock = FakeClock()
+    limiter = RateLimiter(2.0, clock=clock, sleep=clock.sleep)
+
+    waits = [limiter.acquire() for _ in range(4)]
+    assert waits == [0.0, 0.0, 0.5, 0.5]
+    assert clock.now == 1.0
+
+
+def test_headers_lower_rate_and_pause():
+    clock = FakeClock()
+    limiter = RateLimiter(clock=clock, sleep=clock.sleep)
+    assert limiter.acquire() == 0.0
+
+    limiter.update({"X-RateLimit-Remaining": "10", "X-RateLimit-Reset": "20"})
+    assert limiter.rate == 0.5
+
+    assert limiter.update({"Retry-After": "3"}) == 3.0
+    assert limiter.acquire() == 3.0
+    assert limiter.update({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "7"})
+    assert limiter.acquire() == 7.0
+
+
+def test_rate_limited_response_is_retried_after_pause(requests_mock, capsys):
+    requests_mock.get(
+        "https://api.example.com/v1/segment",
+        [
+            {"status_code": 429, "headers": {"Retry-After": "0.05"}},
+            {"json": {"segments": [{"id": "1"}], "isLastPage": True}},
+        ],
+    )
+    config = {**SAMPLE_CONFIG, "max_requests_per_minute": 6000}
+    tap = TapGainsightPX(config=config)
+    stream = tap.streams["segments"]
+    stream.backoff_wait_generator = lambda: backoff.constant(0)
+    stream.sync()
+
+    assert requests_mock.call_count == 2
+    assert tap.rate_limiter.rate == 100
+    messages = singer_messages(capsys)
+    assert [m["record"] for m in messages if m["type"] == "RECORD"] == [{"id": "1"}]
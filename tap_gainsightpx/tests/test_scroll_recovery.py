@@ -0,0 +1,107 @@
+"""Tests for reopening scrolls whose cursor expired."""
+
+import copy
+from urllib.parse import parse_qs, urlparse
+
+import backoff
+import pytest
+
+from tap_gainsightpx.paginators import ScrollBoundary, ScrollExpiredError
+from tap_gainsightpx.tap import TapGainsightPX
+from tap_gainsightpx.tests.conftest import (
+    FIRST_PAGE,
+    LAST_DATE,
+    PAGE_VIEWS_CONFIG,
+    PAGE_VIEWS_URL,
+    SECOND_PAGE,
+)
+
+SURVEY_RESPONSES_URL = "https://api.example.com/v1/survey/responses"
+EXPIRED = {"status_code": 404, "json": {"message": "Scroll not found"}}
+
+
+def reopened_page():
+    """Return the page of a reopened scroll, starting in the second it stopped."""
+    last = FIRST_PAGE["results"][-1]
+    same_second = {**copy.deepcopy(last), "eventId": "same-second-event"}
+    same_second["date"] = last["date"] - last["date"] % 1000
+    results = [same_second, last] + SECOND_PAGE["results"]
+    return {"results": results, "scrollId": "reopened", "totalHits": len(results)}
+
+
+def get_stream(config=PAGE_VIEWS_CONFIG):
+    stream = TapGainsightPX(config=config).streams["page_view_events"]
+    stream.backoff_wait_generator = lambda: backoff.constant(0)
+    return stream
+
+
+def test_expired_scroll_reopens_from_last_record(requests_mock):
+    requests_mock.get(
+        PAGE_VIEWS_URL, [{"json": FIRST_PAGE}, EXPIRED, {"json": reopened_page()}]
+    )
+    stream = get_stream()
+
+    records = list(stream.get_records(None))
+
+    ids = [r["eventId"] for r in records]
+    assert len(ids) == len(set(ids)) == 201
+    assert "same-second-event" in ids
+    reopen_request = requests_mock.request_history[2]
+    params = parse_qs(urlparse(reopen_request.url).query)
+    assert "scrollId" not in params
+    assert f"date>={LAST_DATE}" in params["filter"][0]
+    assert stream._reopened_scrolls == {}
+
+
+def test_expired_scroll_reopens_with_streaming_parse(requests_mock):
+    requests_mock.get(
+        PAGE_VIEWS_URL, [{"json": FIRST_PAGE}, EXPIRED, {"json": reopened_page()}]
+    )
+    stream = get_stream({**PAGE_VIEWS_CONFIG, "streaming_parse": True})
+
+    ids = [r["eventId"] for r in stream.get_records(None)]
+
+    assert len(ids) == len(set(ids)) == 201
+
+
+def test_expired_scroll_reopens_a_limited_number_of_times(requests_mock):
+    requests_mock.get(PAGE_VIEWS_URL, [{"json": FIRST_PAGE}, EXPIRED] * 5)
+    stream = get_stream()
+    stream.max_scroll_reopens = 2
+
+    with pytest.raises(ScrollExpiredError):
+        list(stream.get_records(None))
+    assert requests_mock.call_count == 6
+
+
+def test_unfiltered_scroll_is_not_reopened(requests_mock):
+    requests_mock.get(SURVEY_RESPONSES_URL, [{"json": FIRST_PAGE}, EXPIRED])
+    stream = TapGainsightPX(config=PAGE_VIEWS_CONFIG).streams["survey_responses"]
+
+    with pytest.raises(ScrollExpiredError):
+        list(stream.get_records(None))
+    assert requests_mock.call_count == 2
+
+
+def test_failed_first_request_is_not_a_scroll_expiry(requests_mock):
+    requests_mock.get(PAGE_VIEWS_URL, **EXPIRED)
+
+    with pytest.raises(Exception) as error:
+        list(get_stream().get_records(None))
+    assert not isinstance(error.value, ScrollExpiredError)
+
+
+def test_scroll_boundary_tracks_keys_of_last_second():
+    boundary = ScrollBoundary("date", ["eventId"])
+    boundary.update(
+        [
+            {"eventId": "a", "date": 1000},
+            {"eventId": "b", "date": 2100},
+            {"eventId": "c", "date": 2900},
+        ]
+    )
+
+    assert boundary.value == 2900
+    assert boundary.keys == {("b",), ("c",)}
+    records = [{"eventId": "b"}, {"eventId": "d"}]
+    assert list(boundary.drop_returned(records, boundary.keys)) == [{"eventId": "d"}]
@@ -0,0 +1,123 @@
+"""Tests for emitting only the rows of full table streams that changed."""
+
+import copy
+import json
+
+import pytest
+
+from tap_gainsightpx.snapshots import SnapshotStore
+from tap_gainsightpx.tap import TapGainsightPX
+from tap_gainsightpx.tests.conftest import FIXTURES, singer_messages
+from tap_gainsightpx.tests.test_core import SAMPLE_CONFIG
+
+FEATURES_URL = "https://api.example.com/v1/feature"
+FEATURES = json.loads((FIXTURES / "features_page_1.json").read_text())["features"]
+ENGAGEMENTS_URL = "https://api.example.com/v1/engagement"
+ENGAGEMENTS = json.loads((FIXTURES / "engagements_page_1.json").read_text())[
+    "engagements"
+]
+
+
+def test_store_passes_on_new_and_changed_rows(tmp_path):
+    store = SnapshotStore(str(tmp_path / "features.sqlite3"), ["id"])
+    rows = [{"id": str(i), "name": f"feature {i}"} for i in range(1200)]
+    with store.transaction():
+        assert list(store.changed(rows)) == rows
+
+    rows[7] = {"id": "7", "name": "renamed"}
+    with store.transaction():
+        assert list(store.changed(rows[:1000])) == [rows[7]]
+        assert [key["id"] for key in store.deleted()] == [
+            str(i) for i in range(1000, 1200)
+        ]
+    assert len(store) == 1000
+    assert store.unchanged == 999
+
+
+def test_interrupted_sync_leaves_store_unchanged(tmp_path):
+    store = SnapshotStore(str(tmp_path / "features.sqlite3"), ["id"])
+    with store.transaction():
+        list(store.changed([{"id": "a", "name": "A"}]))
+
+    with pytest.raises(KeyError):
+        with store.transaction():
+            list(store.changed([{"id": "a", "name": "B"}, {"id": "b"}]))
+            raise KeyError
+
+    with store.transaction():
+        assert list(store.changed([{"id": "a", "name": "B"}])) == [
+            {"id": "a", "name": "B"}
+        ]
+
+
+def sync_features(requests_mock, capsys, config, features):
+    requests_mock.get(FEATURES_URL, json={"features": features, "isLastPage": True})
+    tap = TapGainsightPX(config=config)
+    tap.streams["features"].sync()
+    messages = singer_messages(capsys)
+    return [m["record"] for m in messages if m["type"] == "RECORD"]
+
+
+def test_sync_emits_changed_rows_and_tombstones(requests_mock, capsys, tmp_path):
+    config = {**SAMPLE_CONFIG, "snapshot_dir": str(tmp_path), "emit_tombstones": True}
+    assert len(sync_features(requests_mock, capsys, config, FEATURES)) == len(FEATURES)
+    assert (tmp_path / "features.sqlite3").exists()
+
+    features = copy.deepcopy(FEATURES[1:])
+    features[0]["name"] = "Renamed"
+    records = sync_features(requests_mock, capsys, config, features)
+
+    assert records[0] == features[0]
+    assert records[1]["id"] == FEATURES[0]["id"]
+    assert records[1]["_sdc_deleted_at"]
+    assert len(records) == 2
+    assert sync_features(requests_mock, capsys, config, features) == []
+
+
+def test_snapshots_only_kept_for_full_table_streams(tmp_path):
+    config = {**SAMPLE_CONFIG, "snapshot_dir": str(tmp_path)}
+    streams = TapGainsightPX(config=config).streams
+    with_snapshots = {n for n, s in streams.items() if s.keeps_snapshot}
+    assert with_snapshots == {"features", "segments"}
+    assert "_sdc_deleted_at" not in streams["features"].schema["properties"]
+
+    config = {**config, "full_snapshot": True}
+    streams = TapGainsightPX(config=config).streams
+    assert streams["users"].keeps_snapshot
+    assert streams["accounts"].keeps_snapshot
+    assert not TapGainsightPX(config=SAMPLE_CONFIG).streams["features"].keeps_snapshot
+
+
+def test_discovery_opens_no_snapshot(tmp_path):
+    snapshot_dir = tmp_path / "snapshots"
+    config = {**SAMPLE_CONFIG, "snapshot_dir": str(snapshot_dir)}
+    tap = TapGainsightPX(config={**config, "emit_tombstones": True})
+
+    schemas = {s["tap_stream_id"]: s["schema"] for s in tap.catalog_dict["streams"]}
+    assert "_sdc_deleted_at" in schemas["features"]["properties"]
+    assert not snapshot_dir.exists()
+
+
+def test_date_filtered_stream_emits_no_tombstones(requests_mock, capsys, tmp_path):
+    config = {
+        **SAMPLE_CONFIG,
+        "snapshot_dir": str(tmp_path),
+        "emit_tombstones": True,
+        "end_date": "2022-01-02T00:00:00Z",
+    }
+    for (start, end), engagements in [
+        (("2022-01-01T00:00:00Z", "2022-01-02T00:00:00Z"), ENGAGEMENTS),
+        (("2022-01-02T00:00:00Z", "2022-01-03T00:00:00Z"), ENGAGEMENTS[1:]),
+    ]:
+        requests_mock.get(
+            ENGAGEMENTS_URL, json={"engagements": engagements, "isLastPage": True}
+        )
+        tap = TapGainsightPX(config={**config, "start_date": start, "end_date": end})
+        tap.streams["engagements"].sync()
+        messages = singer_messages(capsys)
+        records = [m["record"] for m in messages if m["type"] == "RECORD"]
+
+        assert f"date>={start}".lower() in requests_mock.last_request.qs["filter"][0]
+        assert records == engagements
+        assert not any("_sdc_deleted_at" in record for record in records)
+    assert not (tmp_path / "engagements.sqlite3").exists()
@@ -0,0 +1,123 @@
+"""Tests for the per-stream performance statistics."""
+
+import json
+import time
+
+import backoff
+import pytest
+from requests_mock import ANY
+from singer_sdk.exceptions import FatalAPIError
+
+from tap_gainsightpx.stats import Histogram, SyncStats
+from tap_gainsightpx.tap import TapGainsightPX
+from tap_gainsightpx.tests.conftest import (
+    FIRST_PAGE,
+    PAGE_VIEWS_CONFIG,
+    PAGE_VIEWS_URL,
+    SECOND_PAGE,
+)
+
+
+def test_histogram_counts_are_cumulative():
+    histogram = Histogram([1, 10])
+    for value in (0.5, 1, 5, 50):
+        histogram.observe(value)
+
+    assert histogram.to_dict() == {
+        "buckets": {"1": 2, "10": 3, "+Inf": 4},
+        "sum": 56.5,
+        "count": 4,
+    }
+
+
+def sync_page_views(requests_mock, config):
+    requests_mock.get(
+        PAGE_VIEWS_URL,
+        [
+            {"status_code": 429, "headers": {"Retry-After": "0"}},
+            {"json": FIRST_PAGE},
+            {"json": SECOND_PAGE},
+        ],
+    )
+    tap = TapGainsightPX(config=config)
+    stream = tap.streams["page_view_events"]
+    stream.backoff_wait_generator = lambda: backoff.constant(0)
+    list(stream.get_records(None))
+    return tap
+
+
+def test_stream_statistics(requests_mock):
+    tap = sync_page_views(requests_mock, PAGE_VIEWS_CONFIG)
+
+    stats = tap.sync_stats.to_dict()["endpoints"]
+    assert len(stats) == 1
+    stats = stats[0]
+    assert stats["stream"] == "page_view_events"
+    assert stats["endpoint"] == "/events/pageView"
+    assert stats["requests"] == 3
+    assert stats["status_codes"] == {"200": 2, "429": 1}
+    assert stats["retries"] == stats["rate_limited"] == 1
+    assert stats["pages"] == 2
+    assert stats["records"] == 200
+    assert stats["records_per_page"]["buckets"]["100"] == 2
+    assert stats["response_bytes"] > 0
+    assert stats["fetch_seconds"] > 0
+    assert stats["records_per_second"] > 0
+
+
+def test_statistics_written_as_json(requests_mock, tmp_path):
+    path = tmp_path / "metrics.json"
+    tap = sync_page_views(
+        requests_mock, {**PAGE_VIEWS_CONFIG, "metrics_path": str(path)}
+    )
+    tap.sync_stats.write()
+
+    written = json.loads(path.read_text())
+    assert written["endpoints"][0]["records"] == 200
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_statistics_written_as_prometheus_textfile(requests_mock, tmp_path):
+    path = tmp_path / "tap.prom"
+    config = {
+        **PAGE_VIEWS_CONFIG,
+        "metrics_path": str(path),
+        "metrics_format": "prometheus",
+    }
+    tap = sync_page_views(requests_mock, config)
+    tap.sync_stats.write()
+
+    lines = path.read_text().splitlines()
+    labels = 'stream="page_view_events",endpoint="/events/pageView"'
+    assert "# TYPE gainsightpx_request_duration_seconds histogram" in lines
+    assert f'gainsightpx_request_duration_seconds_bucket{{{labels},le="+Inf"}} 3' in (
+        lines
+    )
+    assert f"gainsightpx_records_per_page_sum{{{labels}}} 200" in lines
+    assert f'gainsightpx_responses_total{{{labels},code="429"}} 1' in lines
+    assert f"gainsightpx_rate_limited_total{{{labels}}} 1" in lines
+
+
+def test_statistics_written_when_cli_sync_fails(requests_mock, tmp_path):
+    requests_mock.get(ANY, status_code=404)
+    path = tmp_path / "metrics.json"
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({**PAGE_VIEWS_CONFIG, "metrics_path": str(path)}))
+
+    with pytest.raises(FatalAPIError):
+        TapGainsightPX.cli.main(["--config", str(config_path)], standalone_mode=False)
+
+    assert json.loads(path.read_text())["endpoints"][0]["status_codes"] == {"404": 1}
+
+
+def test_statistics_written_at_intervals(tmp_path):
+    path = tmp_path / "metrics.json"
+    stats = SyncStats(str(path), interval=0.0001)
+    stats.endpoint("users", "/users").add_page(10, 0.1)
+    time.sleep(0.001)
+
+    stats.maybe_write()
+    assert json.loads(path.read_text())["endpoints"][0]["records"] == 10
+
+    SyncStats(str(tmp_path / "never.json")).maybe_write()
+    assert not (tmp_path / "never.json").exists()
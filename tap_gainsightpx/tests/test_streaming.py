@@ -0,0 +1,58 @@
+"""Tests for decoding records while the response body is read."""
+
+import json
+
+import pytest
+
+from tap_gainsightpx.streaming import ITEM, MEMBER, JSONObjectStream
+from tap_gainsightpx.tap import TapGainsightPX
+from tap_gainsightpx.tests.conftest import FIXTURES, singer_messages
+from tap_gainsightpx.tests.test_core import SAMPLE_CONFIG
+
+
+def chunked(text, size):
+    return [text[i : i + size] for i in range(0, len(text), size)]  # noqa: E203
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_object_stream_yields_items_and_members(chunk_size):
+    body = json.loads((FIXTURES / "page_view_events_page_1.json").read_text())
+    text = json.dumps({"totalHits": 200, **body, "isLastPage": False}, indent=1)
+
+    events = list(JSONObjectStream(chunked(text, chunk_size), "results").events())
+
+    assert [value for kind, value in events if kind == ITEM] == body["results"]
+    members = dict(value for kind, value in events if kind == MEMBER)
+    assert members == {
+        "totalHits": 200,
+        "scrollId": body["scrollId"],
+        "isLastPage": False,
+    }
+
+
+def test_object_stream_rejects_truncated_body():
+    with pytest.raises(json.JSONDecodeError):
+        list(JSONObjectStream(['{"results": [{"a": 1}, {"b"'], "results").events())
+
+
+def test_streaming_sync_matches_buffered_sync(requests_mock, capsys):
+    requests_mock.get(
+        "https://api.example.com/v1/events/pageView",
+        [
+            {"content": (FIXTURES / f"page_view_events_page_{n}.json").read_bytes()}
+            for n in (1, 2)
+        ]
+        * 2,
+    )
+
+    def sync_records(config):
+        TapGainsightPX(config=config).streams["page_view_events"].sync()
+        messages = singer_messages(capsys)
+        return [m["record"] for m in messages if m["type"] == "RECORD"]
+
+    buffered = sync_records(SAMPLE_CONFIG)
+    streamed = sync_records({**SAMPLE_CONFIG, "streaming_parse": True})
+
+    assert len(streamed) == 200
+    assert streamed == buffered
+    assert requests_mock.call_count == 4
@@ -0,0 +1,60 @@
+"""Tests for the pooled HTTP transport shared by all streams."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from tap_gainsightpx.tap import TapGainsightPX
+from tap_gainsightpx.tests.test_core import SAMPLE_CONFIG
+
+
+class SegmentsHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # noqa: N802
+        body = json.dumps({"segments": [{"id": "1"}], "isLastPage": True}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def api_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SegmentsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_streams_share_session_and_reuse_connections(api_url, capsys):
+    tap = TapGainsightPX(config={**SAMPLE_CONFIG, "api_url": api_url})
+    segments, features = tap.streams["segments"], tap.streams["features"]
+
+    assert segments.requests_session is features.requests_session
+    assert segments.authenticator is segments.authenticator
+    assert segments.requests_session.headers["Accept-Encoding"] == "gzip"
+
+    for _ in range(3):
+        segments.sync()
+    assert tap.http_transport.connection_stats() == {
+        "requests": 3,
+        "new_connections": 1,
+        "reused_connections": 2,
+    }
+
+
+def test_keep_alive_can_be_disabled(api_url, capsys):
+    config = {**SAMPLE_CONFIG, "api_url": api_url, "http_keep_alive": False}
+    tap = TapGainsightPX(config=config)
+    for _ in range(2):
+        tap.streams["segments"].sync()
+
+    assert tap.http_transport.connection_stats()["new_connections"] == 2
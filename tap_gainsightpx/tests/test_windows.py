@@ -0,0 +1,292 @@
+"""Tests for date window partitioning of the event streams."""
+
+import bisect
+from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from tap_gainsightpx.tap import TapGainsightPX
+from tap_gainsightpx.tests.conftest import singer_messages
+from tap_gainsightpx.tests.test_core import SAMPLE_CONFIG
+from tap_gainsightpx.windows import (
+    WindowPlanner,
+    parse_datetime,
+    parse_duration,
+    split_date_range,
+)
+
+WINDOW_CONFIG = {
+    **SAMPLE_CONFIG,
+    "end_date": "2022-01-02T00:00:00Z",
+    "partition_window": "12h",
+}
+
+
+def test_parse_duration():
+    assert parse_duration("30m") == timedelta(minutes=30)
+    assert parse_duration("6h") == timedelta(hours=6)
+    assert parse_duration("1d") == timedelta(days=1)
+    with pytest.raises(ValueError):
+        parse_duration("1w")
+    with pytest.raises(ValueError):
+        parse_duration("0h")
+
+
+def test_split_date_range_clamps_last_window():
+    start = datetime(2022, 1, 1, tzinfo=timezone.utc)
+    windows = split_date_range(start, start + timedelta(hours=5), timedelta(hours=2))
+    assert [end - begin for begin, end in windows] == [
+        timedelta(hours=2),
+        timedelta(hours=2),
+        timedelta(hours=1),
+    ]
+
+
+def test_partitions_and_filters():
+    tap = TapGainsightPX(config=WINDOW_CONFIG)
+    stream = tap.streams["page_view_events"]
+    first, last = stream.partitions
+
+    assert first == {
+        "window_start": "2022-01-01T00:00:00Z",
+        "window_end": "2022-01-01T12:00:00Z",
+    }
+    assert stream.get_date_filter(first) == (
+        "date>=2022-01-01T00:00:00Z;date<2022-01-01T12:00:00Z"
+    )
+    assert stream.get_date_filter(last) == (
+        "date>=2022-01-01T12:00:00Z;date<=2022-01-02T00:00:00Z"
+    )
+    assert tap.streams["users"].partitions is None
+    assert tap.streams["survey_responses"].partitions is None
+
+
+def test_completed_windows_are_skipped(requests_mock, capsys):
+    state = {
+        "bookmarks": {
+            "page_view_events": {
+                "partitions": [
+                    {
+                        "context": {
+                            "window_start": "2022-01-01T00:00:00Z",
+                            "window_end": "2022-01-01T12:00:00Z",
+                        },
+                        "replication_key": "date",
+                        "replication_key_value": 1641038400000,
+                        "window_complete": True,
+                    },
+                    {
+                        "context": {
+                            "window_start": "2021-12-31T00:00:00Z",
+                            "window_end": "2021-12-31T12:00:00Z",
+                        },
+                        "window_complete": True,
+                    },
+                ]
+            }
+        }
+    }
+    requests_mock.get(
+        "https://api.example.com/v1/events/pageView",
+        json={"results": [{"eventId": "a", "date": 1641040000000}], "totalHits": 1},
+    )
+    tap = TapGainsightPX(config=WINDOW_CONFIG, state=state)
+    tap.streams["page_view_events"].sync()
+
+    assert requests_mock.call_count == 1
+    assert "date%3E%3D2022-01-01T12%3A00%3A00Z" in requests_mock.last_request.url
+
+    messages = singer_messages(capsys)
+    final_state = [m for m in messages if m["type"] == "STATE"][-1]["value"]
+    partitions = final_state["bookmarks"]["page_view_events"]["partitions"]
+    assert len(partitions) == 2
+    assert all(partition["window_complete"] for partition in partitions)
+
+
+def test_completed_windows_within_lookback_are_synced_again(requests_mock):
+    windows = [
+        ("2022-01-01T00:00:00Z", "2022-01-01T12:00:00Z", 1641036600000),  # 11:30
+        ("2022-01-01T12:00:00Z", "2022-01-02T00:00:00Z", 1641078000000),  # 23:00
+    ]
+    state = {
+        "bookmarks": {
+            "page_view_events": {
+                "partitions": [
+                    {
+                        "context": {"window_start": start, "window_end": end},
+                        "replication_key": "date",
+                        "replication_key_value": value,
+                        "window_complete": True,
+                    }
+                    for start, end, value in windows
+                ]
+            }
+        }
+    }
+    requests_mock.get(
+        "https://api.example.com/v1/events/pageView",
+        json={"results": [{"eventId": "a", "date": 1641077000000}], "totalHits": 1},
+    )
+    config = {**WINDOW_CONFIG, "lookback_window": "2h"}
+    tap = TapGainsightPX(config=config, state=state)
+    tap.streams["page_view_events"].sync()
+
+    assert requests_mock.call_count == 1
+    assert "date%3E%3D2022-01-01T21%3A00%3A00Z" in requests_mock.last_request.url
+
+
+def bookmark_state(value, **partition):
+    bookmark = {"replication_key": "date", "replication_key_value": value}
+    if partition:
+        bookmark = {"partitions": [{"context": partition, **bookmark}]}
+    return {"bookmarks": {"page_view_events": bookmark}}
+
+
+def test_bookmark_drives_lower_bound():
+    config = {
+        **SAMPLE_CONFIG,
+        "end_date": "2022-01-02T00:00:00Z",
+        "lookback_window": "1h",
+    }
+    ten_am = 1641031200000  # 2022-01-01T10:00:00Z
+    tap = TapGainsightPX(config=config, state=bookmark_state(ten_am))
+    assert tap.streams["page_view_events"].get_date_filter(None) == (
+        "date>=2022-01-01T09:00:00Z;date<=2022-01-02T00:00:00Z"
+    )
+
+    early = 1640908800000  # 2021-12-31T00:00:00Z
+    tap = TapGainsightPX(config=config, state=bookmark_state(early))
+    assert tap.streams["page_view_events"].get_date_filter(None) == (
+        "date>=2022-01-01T00:00:00Z;date<=2022-01-02T00:00:00Z"
+    )
+
+
+def test_bookmark_drives_partition_window_lower_bound():
+    window = {
+        "window_start": "2022-01-01T00:00:00Z",
+        "window_end": "2022-01-01T12:00:00Z",
+    }
+    state = bookmark_state(1641031200123, **window)
+    tap = TapGainsightPX(config=WINDOW_CONFIG, state=state)
+    stream = tap.streams["page_view_events"]
+    first, last = stream.partitions
+
+    assert stream.get_date_filter(first) == (
+        "date>=2022-01-01T10:00:00Z;date<2022-01-01T12:00:00Z"
+    )
+    assert stream.get_date_filter(last) == (
+        "date>=2022-01-01T12:00:00Z;date<=2022-01-02T00:00:00Z"
+    )
+
+
+def test_bookmark_after_end_date_skips_request(requests_mock, capsys):
+    state = bookmark_state(1641168000000)  # 2022-01-03T00:00:00Z
+    requests_mock.get("https://api.example.com/v1/events/pageView", json={})
+    tap = TapGainsightPX(config=SAMPLE_CONFIG, state=state)
+    tap.streams["page_view_events"].sync()
+
+    assert requests_mock.call_count == 0
+
+
+DAY = datetime(2022, 1, 1, tzinfo=timezone.utc)
+# 100 events an hour, except for a launch at noon with 50 times as many.
+SKEWED_EVENTS = sorted(
+    DAY + timedelta(hours=hour, seconds=i * 3600 / (5000 if hour == 12 else 100))
+    for hour in range(24)
+    for i in range(5000 if hour == 12 else 100)
+)
+
+
+def count_skewed_events(start, end):
+    return bisect.bisect_left(SKEWED_EVENTS, end) - bisect.bisect_left(
+        SKEWED_EVENTS, start
+    )
+
+
+def test_planner_splits_busy_and_merges_quiet_windows():
+    planner = WindowPlanner(count_skewed_events, 1000, timedelta(minutes=1))
+    windows = planner.plan(
+        split_date_range(DAY, DAY + timedelta(days=1), timedelta(hours=6))
+    )
+
+    assert windows[0][0] == DAY
+    assert windows[-1][1] == DAY + timedelta(days=1)
+    assert all(left[1] == right[0] for left, right in zip(windows, windows[1:]))
+    assert sum(count for _, _, count in windows) == len(SKEWED_EVENTS)
+    assert all(count <= 1000 for _, _, count in windows)
+    noon = [
+        w
+        for w in windows
+        if DAY + timedelta(hours=12) <= w[0] < w[1] <= (DAY + timedelta(hours=13))
+    ]
+    assert len(noon) >= 5
+    assert max(end - start for start, end, _ in windows) >= timedelta(hours=5)
+
+
+def test_planner_stops_at_min_window():
+    planner = WindowPlanner(count_skewed_events, 10, timedelta(hours=1))
+    windows = planner.plan([(DAY, DAY + timedelta(days=1))])
+
+    assert all(end - start >= timedelta(hours=1) for start, end, _ in windows)
+    assert len(windows) == 24
+
+
+def test_planner_balances_windows_for_parallel_scrolls():
+    planner = WindowPlanner(count_skewed_events, 100_000, timedelta(minutes=1))
+    windows = planner.plan([(DAY, DAY + timedelta(days=1))], parallelism=4)
+
+    assert len(windows) >= 4
+    assert all(count <= len(SKEWED_EVENTS) / 4 for _, _, count in windows)
+
+
+def count_page_views(request, context):
+    """Serve an empty page reporting the skewed events matching the filter."""
+    lower, upper = parse_qs(urlparse(request.url).query)["filter"][0].split(";")
+    start = parse_datetime(lower.split(">=")[1])
+    end = parse_datetime(upper.split("<")[1].lstrip("="))
+    return {
+        "results": [],
+        "scrollId": "end",
+        "totalHits": count_skewed_events(
+            start, end + timedelta(seconds=1) if "<=" in upper else end
+        ),
+    }
+
+
+def test_partitions_planned_from_record_counts(requests_mock):
+    requests_mock.get(
+        "https://api.example.com/v1/events/pageView", json=count_page_views
+    )
+    kept = {
+        "window_start": "2022-01-01T00:00:00Z",
+        "window_end": "2022-01-01T03:00:00Z",
+    }
+    state = bookmark_state(1640998800000, **kept)
+    config = {
+        **SAMPLE_CONFIG,
+        "end_date": "2022-01-02T00:00:00Z",
+        "partition_target_records": 2000,
+    }
+    stream = TapGainsightPX(config=config, state=state).streams["page_view_events"]
+    partitions = stream.partitions
+
+    assert partitions[0] == kept
+    assert partitions[-1]["window_end"] == "2022-01-02T00:00:00Z"
+    assert all(
+        previous["window_end"] == partition["window_start"]
+        for previous, partition in zip(partitions, partitions[1:])
+    )
+    assert 4 <= len(partitions) <= 8
+    query = parse_qs(urlparse(requests_mock.request_history[0].url).query)
+    assert query["pageSize"] == ["10"]
+    assert query["filter"][0].startswith("date>=2022-01-01T03:00:00Z;")
+
+    # Planned once per sync.
+    probes = requests_mock.call_count
+    assert stream.partitions == partitions
+    assert requests_mock.call_count == probes
+    assert (
+        TapGainsightPX(config=SAMPLE_CONFIG).streams["page_view_events"].partitions
+        is None
+    )
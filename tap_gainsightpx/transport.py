@@ -0,0 +1,97 @@
+"""A pooled HTTP session with connection reuse statistics."""
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, Type
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+
+class ConnectionCounter:
+    """Thread-safe counts of requests sent and connections opened."""
+
+    def __init__(self) -> None:
+        """Start both counts at zero."""
+        self.requests = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+
+    def add_request(self) -> None:
+        """Count a request sent through the transport."""
+        with self._lock:
+            self.requests += 1
+
+    def add_connection(self) -> None:
+        """Count a newly opened connection."""
+        with self._lock:
+            self.connections += 1
+
+
+def counting_pool_class(
+    pool_class: Type[HTTPConnectionPool], counter: ConnectionCounter
+) -> Type[HTTPConnectionPool]:
+    """Return a subclass of `pool_class` counting every connection it opens."""
+
+    class CountingConnection(pool_class.ConnectionCls):  # type: ignore[name-defined]
+        def connect(self) -> None:
+            counter.add_connection()
+            super().connect()
+
+    return type(
+        pool_class.__name__, (pool_class,), {"ConnectionCls": CountingConnection}
+    )
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """An `HTTPAdapter` counting requests and newly opened connections."""
+
+    def __init__(self, counter: ConnectionCounter, **kwargs: Any) -> None:
+        """Create the adapter, reporting to `counter`."""
+        self.counter = counter
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        """Create the pool manager with connection counting pools."""
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": counting_pool_class(HTTPConnectionPool, self.counter),
+            "https": counting_pool_class(HTTPSConnectionPool, self.counter),
+        }
+
+    def send(self, *args: Any, **kwargs: Any) -> requests.Response:
+        """Send a request, counting it."""
+        self.counter.add_request()
+        return super().send(*args, **kwargs)
+
+
+class HTTPTransport:
+    """One `requests` session whose connection pool all streams reuse.
+
+    Streams on the same host share kept-alive connections, so the TLS handshake
+    is paid once per pooled connection instead of once per stream and partition.
+    """
+
+    def __init__(self, pool_size: int = 10, keep_alive: bool = True) -> None:
+        """Create the session with a pool of up to `pool_size` connections per host."""
+        self.counter = ConnectionCounter()
+        self.adapter = PooledHTTPAdapter(
+            self.counter, pool_connections=pool_size, pool_maxsize=pool_size
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+        self.session.headers["Accept-Encoding"] = "gzip"
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+
+    def connection_stats(self) -> Dict[str, int]:
+        """Return how many requests reused a pooled connection or opened a new one."""
+        return {
+            "requests": self.counter.requests,
+            "new_connections": self.counter.connections,
+            "reused_connections": max(
+                self.counter.requests - self.counter.connections, 0
+            ),
+        }
@@ -0,0 +1,130 @@
+"""Date window helpers for splitting the configured sync range."""
+from __future__ import annotations
+
+import math
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Sequence, Tuple
+
+DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+DURATION_PATTERN = re.compile(r"^\s*(\d+)\s*([smhd])\s*$")
+DURATION_UNITS = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days"}
+
+
+def parse_duration(value: str) -> timedelta:
+    """Parse a duration such as `30m`, `6h` or `1d`."""
+    match = DURATION_PATTERN.match(value)
+    if not match:
+        raise ValueError(
+            f"Invalid duration '{value}'. Expected a number followed by "
+            "one of s, m, h or d, e.g. '6h'."
+        )
+    amount, unit = match.groups()
+    duration = timedelta(**{DURATION_UNITS[unit]: int(amount)})
+    if not duration:
+        raise ValueError(f"Invalid duration '{value}'. Must be greater than zero.")
+    return duration
+
+
+def parse_datetime(value: str) -> datetime:
+    """Parse an ISO formatted date or datetime, assuming UTC when naive."""
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def format_datetime(value: datetime) -> str:
+    """Format a datetime the way the GainsightPX date filter expects it."""
+    return value.astimezone(timezone.utc).strftime(DATETIME_FORMAT)
+
+
+def split_date_range(
+    start: datetime, end: datetime, window: timedelta
+) -> List[Tuple[datetime, datetime]]:
+    """Split `start`..`end` into consecutive windows of at most `window`."""
+    windows = []
+    window_start = start
+    while window_start < end:
+        window_end = min(window_start + window, end)
+        windows.append((window_start, window_end))
+        window_start = window_end
+    return windows
+
+
+class WindowPlanner:
+    """Plan date windows holding about `target` records each, from record counts.
+
+    Each window is counted by `count`, usually a request for a small page of it.
+    Windows with more than `target` records are split into as many equal parts as
+    they need, down to `min_window`, and counted again, so the busiest days end up
+    in the smallest windows. Neighbouring windows that fit in `target` records
+    together are then merged.
+    """
+
+    def __init__(
+        self,
+        count: Callable[[datetime, datetime], int],
+        target: int,
+        min_window: timedelta,
+    ) -> None:
+        """Create a planner counting the records of a window with `count`."""
+        self.count = count
+        self.target = max(target, 1)
+        self.min_window = max(min_window, timedelta(seconds=1))
+        #: The number of windows counted so far.
+        self.probes = 0
+
+    def plan(
+        self,
+        windows: Sequence[Tuple[datetime, datetime]],
+        parallelism: int = 1,
+    ) -> List[Tuple[datetime, datetime, int]]:
+        """Return the planned windows covering `windows`, with their counts.
+
+        With a `parallelism` above one, the target shrinks so there are at least
+        that many windows to fetch at the same time, when there are enough records.
+        """
+        counted = [(start, end, self._count(start, end)) for start, end in windows]
+        total = sum(count for _, _, count in counted)
+        target = min(self.target, max(math.ceil(total / parallelism), 1))
+        split = [
+            part
+            for start, end, count in counted
+            for part in self._split(start, end, count, target)
+        ]
+        return self._merge(split, target)
+
+    def _count(self, start: datetime, end: datetime) -> int:
+        self.probes += 1
+        return self.count(start, end)
+
+    def _split(
+        self, start: datetime, end: datetime, count: int, target: int
+    ) -> List[Tuple[datetime, datetime, int]]:
+        """Split a window until every part holds at most `target` records."""
+        parts = min(math.ceil(count / target), int((end - start) / self.min_window))
+        if parts < 2:
+            return [(start, end, count)]
+        # The date filter has a resolution of one second.
+        size = timedelta(seconds=math.ceil((end - start).total_seconds() / parts))
+        return [
+            part
+            for part_start, part_end in split_date_range(start, end, size)
+            for part in self._split(
+                part_start, part_end, self._count(part_start, part_end), target
+            )
+        ]
+
+    @staticmethod
+    def _merge(
+        windows: List[Tuple[datetime, datetime, int]], target: int
+    ) -> List[Tuple[datetime, datetime, int]]:
+        """Merge neighbouring windows while they hold at most `target` records."""
+        merged: List[Tuple[datetime, datetime, int]] = []
+        for start, end, count in windows:
+            if merged and merged[-1][1] == start and merged[-1][2] + count <= target:
+                merged[-1] = (merged[-1][0], end, merged[-1][2] + count)
+            else:
+                merged.append((start, end, count))
+        return merged
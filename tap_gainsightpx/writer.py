@@ -0,0 +1,64 @@
+"""Singer message output serialized across the threads syncing streams."""
+from __future__ import annotations
+
+import copy
+import sys
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator, Optional
+
+from singer_sdk._singerlib import Message, StateMessage
+from singer_sdk._singerlib.messages import format_message
+
+
+class MessageWriter:
+    """Write Singer messages to stdout, one whole line at a time.
+
+    Streams synced on different threads share one writer, so messages never
+    interleave mid-line. While `isolated_state` is active, STATE messages are
+    built from a private copy of the tap state in which each stream only replaces
+    its own bookmarks, so a stream never serializes state another thread is
+    still changing.
+    """
+
+    def __init__(
+        self, format_message: Callable[[Message], str] = format_message
+    ) -> None:
+        """Create a writer encoding each message with `format_message`."""
+        self._format_message = format_message
+        self._lock = threading.Lock()
+        self._state: Optional[dict] = None
+
+    def write_messages(self, messages: Iterable[Message]) -> None:
+        """Write messages as one block of lines."""
+        lines = "".join(self._format_message(m) + "\n" for m in messages)
+        if lines:
+            with self._lock:
+                self._write(lines)
+
+    def write_state(self, tap_state: dict, stream_name: str) -> None:
+        """Write a STATE message including the latest bookmarks of a stream."""
+        with self._lock:
+            state = tap_state
+            if self._state is not None:
+                bookmarks = tap_state.get("bookmarks", {}).get(stream_name, {})
+                self._state["bookmarks"][stream_name] = copy.deepcopy(bookmarks)
+                state = self._state
+            self._write(self._format_message(StateMessage(value=state)) + "\n")
+
+    @contextmanager
+    def isolated_state(self, tap_state: dict) -> Iterator[None]:
+        """Build STATE messages from a private copy of the tap state."""
+        with self._lock:
+            self._state = copy.deepcopy(tap_state)
+            self._state.setdefault("bookmarks", {})
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._state = None
+
+    @staticmethod
+    def _write(lines: str) -> None:
+        sys.stdout.write(lines)
+        sys.stdout.flush()